@@ -3,20 +3,18 @@ import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
 import textwrap
-import io
-import requests
 import streamlit.components.v1 as components
 
 from ui.common import safe_pct
 
-# ✅ services
-from services.market_data import get_ccl_ypf_df_fast
-
-# yfinance opcional (solo para ^MERV)
-try:
-    import yfinance as yf
-except Exception:
-    yf = None
+# ✅ services (Yahoo: todo pasa por el hub de services.market_data)
+from services.market_data import (
+    EMBI_DEFAULT_SERIE,
+    get_ccl_ypf,
+    get_embi_spread_long,
+    get_tape_snapshot,
+    hub_df,
+)
 
 
 # ============================================================
@@ -28,196 +26,13 @@ def _arrow_cls(v):
     return ("▲", "fx-up") if v >= 0 else ("▼", "fx-down")
 
 
-# ============================================================
-# EMBI (BCRA XLSX) — loader robusto
-# ============================================================
-EMBI_XLSX_URL = (
-    "https://bcrdgdcprod.blob.core.windows.net/documents/entorno-internacional/documents/"
-    "Serie_Historica_Spread_del_EMBI.xlsx"
-)
-
-EMBI_LAST_COL = "Venezuela"      # hasta esta columna inclusive
-EMBI_DEFAULT_SERIE = "Argentina" # default
-
-
-@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
-def _load_embi_wide_from_bcra() -> pd.DataFrame:
-    """
-    Devuelve DF wide: Date + columnas países/regiones (B..T, hasta Venezuela)
-    """
-    try:
-        r = requests.get(EMBI_XLSX_URL, timeout=30, headers={"User-Agent": "Mozilla/5.0"})
-        r.raise_for_status()
-        raw = r.content
-    except Exception:
-        return pd.DataFrame()
-
-    try:
-        df = pd.read_excel(io.BytesIO(raw), header=1)  # header=1 => fila 2
-    except Exception:
-        return pd.DataFrame()
-
-    if df is None or df.empty:
-        return pd.DataFrame()
-
-    df = df.copy()
-    df.columns = [str(c).strip() for c in df.columns]
-
-    # detectar columna fecha
-    date_col = None
-    for c in df.columns:
-        if str(c).strip().lower() in ["fecha", "date"]:
-            date_col = c
-            break
-    if date_col is None:
-        date_col = df.columns[0]
-
-    df = df.rename(columns={date_col: "Date"})
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.normalize()
-    df = df.dropna(subset=["Date"]).sort_values("Date")
-
-    # cortar hasta Venezuela (inclusive)
-    cols = list(df.columns)
-    if EMBI_LAST_COL in cols:
-        last_idx = cols.index(EMBI_LAST_COL)
-        keep = ["Date"] + cols[1:last_idx + 1]
-        df = df[keep].copy()
-    else:
-        keep = ["Date"] + [c for c in cols[1:] if not str(c).lower().startswith("unnamed")]
-        df = df[keep].copy()
-
-    # pasar valores a numérico (acepta coma/punto)
-    for c in df.columns:
-        if c == "Date":
-            continue
-        s = df[c].astype(str).str.strip()
-        s = s.replace({"N/A": np.nan, "NA": np.nan, "": np.nan, "nan": np.nan})
-
-        has_comma = s.str.contains(",", na=False)
-        s.loc[has_comma] = s.loc[has_comma].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
-        df[c] = pd.to_numeric(s, errors="coerce")
-
-    return df.reset_index(drop=True)
-
-
-@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
-def _load_embi_long_from_bcra() -> pd.DataFrame:
-    """
-    Devuelve long: Date, Serie, Value (EN PUNTOS => x100)
-    """
-    wide = _load_embi_wide_from_bcra()
-    if wide is None or wide.empty:
-        return pd.DataFrame(columns=["Date", "Serie", "Value"])
-
-    value_cols = [c for c in wide.columns if c != "Date"]
-    long = wide.melt(id_vars=["Date"], value_vars=value_cols, var_name="Serie", value_name="Value")
-    long["Serie"] = long["Serie"].astype(str).str.strip()
-    long["Value"] = pd.to_numeric(long["Value"], errors="coerce")
-    long = long.dropna(subset=["Date", "Serie", "Value"]).sort_values("Date")
-
-    # ✅ pasar a puntos
-    long["Value"] = long["Value"] * 100.0
-    return long.reset_index(drop=True)
-
-
-@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
-def _load_riesgo_pais() -> pd.DataFrame:
-    """
-    DataFrame: Date, value (puntos EMBI Argentina)
-    """
-    long = _load_embi_long_from_bcra()
-    if long is None or long.empty:
-        return pd.DataFrame(columns=["Date", "value"])
-
-    if EMBI_DEFAULT_SERIE in long["Serie"].unique():
-        s = long[long["Serie"] == EMBI_DEFAULT_SERIE][["Date", "Value"]].copy()
-    else:
-        first = long["Serie"].dropna().unique().tolist()
-        if not first:
-            return pd.DataFrame(columns=["Date", "value"])
-        s = long[long["Serie"] == first[0]][["Date", "Value"]].copy()
-
-    s = s.rename(columns={"Value": "value"})
-    s["Date"] = pd.to_datetime(s["Date"], errors="coerce").dt.normalize()
-    s["value"] = pd.to_numeric(s["value"], errors="coerce")
-    s = s.dropna(subset=["Date", "value"]).sort_values("Date").reset_index(drop=True)
-    return s
-
-
 # ============================================================
 # MERVAL ARS (^MERV) desde Yahoo
 # ============================================================
-@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
 def _load_merval_ars(start: str = "1990-01-01") -> pd.DataFrame:
-    if yf is None:
-        return pd.DataFrame(columns=["Date", "merval_ars"])
-
-    try:
-        dl = yf.download(
-            "^MERV",
-            start=start,
-            progress=False,
-            auto_adjust=False,
-            interval="1d",
-            group_by="column",
-            threads=True,
-        )
-    except Exception:
-        dl = None
-
-    if dl is None or getattr(dl, "empty", True):
-        try:
-            dl = yf.download(
-                "^MERV",
-                period="max",
-                progress=False,
-                auto_adjust=False,
-                interval="1d",
-                group_by="column",
-                threads=True,
-            )
-        except Exception:
-            dl = None
-
-    if dl is None or getattr(dl, "empty", True):
-        return pd.DataFrame(columns=["Date", "merval_ars"])
-
-    s = None
-    if isinstance(dl, pd.DataFrame):
-        if isinstance(dl.columns, pd.MultiIndex):
-            if ("Close", "^MERV") in dl.columns:
-                s = dl[("Close", "^MERV")]
-            else:
-                if "Close" in dl.columns.get_level_values(0):
-                    tmp = dl.xs("Close", axis=1, level=0)
-                    if tmp.shape[1] == 1:
-                        s = tmp.iloc[:, 0]
-                    elif "^MERV" in tmp.columns:
-                        s = tmp["^MERV"]
-        else:
-            if "Close" in dl.columns:
-                s = dl["Close"]
-
-    if s is None:
-        return pd.DataFrame(columns=["Date", "merval_ars"])
-
-    s = pd.to_numeric(s, errors="coerce")
-    idx = pd.to_datetime(s.index, errors="coerce")
-    try:
-        idx = idx.tz_localize(None)
-    except Exception:
-        pass
-
-    out = pd.DataFrame({"Date": idx, "merval_ars": s.values})
-    out["Date"] = pd.to_datetime(out["Date"], errors="coerce").dt.normalize()
-    out["merval_ars"] = pd.to_numeric(out["merval_ars"], errors="coerce")
-    out = (
-        out.dropna(subset=["Date", "merval_ars"])
-        .drop_duplicates(subset=["Date"])
-        .sort_values("Date")
-        .reset_index(drop=True)
-    )
-    return out
+    # ^MERV sale del panel batcheado del hub (services.market_data)
+    out = hub_df("^MERV", start=start)
+    return out.rename(columns={"value": "merval_ars"})
 
 
 # ============================================================
@@ -229,18 +44,13 @@ def _load_merval_usd() -> pd.DataFrame:
     if merv is None or merv.empty:
         return pd.DataFrame(columns=["Date", "value", "merval_ars", "ccl"])
 
-    ccl = get_ccl_ypf_df_fast(period="max", prefer_adj=False)  # Date, value
-    if ccl is None or ccl.empty:
+    # CCL canónico (historia máxima, ya normalizado y ordenado por Date)
+    ccl = get_ccl_ypf()
+    if ccl.empty:
         return pd.DataFrame(columns=["Date", "value", "merval_ars", "ccl"])
 
-    ccl = ccl.copy()
-    ccl["Date"] = pd.to_datetime(ccl["Date"], errors="coerce").dt.normalize()
-    ccl["value"] = pd.to_numeric(ccl["value"], errors="coerce")
-    ccl = ccl.dropna(subset=["Date", "value"]).sort_values("Date").reset_index(drop=True)
-    ccl = ccl.rename(columns={"value": "ccl"})
-
     left = merv.sort_values("Date").reset_index(drop=True)
-    right = ccl.sort_values("Date").reset_index(drop=True)
+    right = pd.DataFrame({"Date": ccl.index, "ccl": ccl.to_numpy()})
 
     merged = pd.merge_asof(
         left,
@@ -414,61 +224,6 @@ def render_finanzas(go_to=None):
             return "—"
         return _fmt_es_num(x, dec) + "%"
 
-    def _get_last_prev_close(df: pd.DataFrame) -> tuple[float | None, float | None]:
-        if df is None or df.empty:
-            return (None, None)
-
-        col = "Adj Close" if "Adj Close" in df.columns else ("Close" if "Close" in df.columns else None)
-        if col is None:
-            return (None, None)
-
-        s = pd.to_numeric(df[col], errors="coerce").dropna()
-        if s.empty:
-            return (None, None)
-        last = float(s.iloc[-1])
-        prev = float(s.iloc[-2]) if len(s) >= 2 else None
-        return (last, prev)
-
-    def _download_many(tickers: list[str]) -> dict[str, pd.DataFrame]:
-        if yf is None:
-            return {}
-        try:
-            dl = yf.download(
-                tickers=" ".join(tickers),
-                period="10d",
-                interval="1d",
-                auto_adjust=False,
-                progress=False,
-                group_by="ticker",
-                threads=True,
-            )
-        except Exception:
-            return {}
-
-        out: dict[str, pd.DataFrame] = {}
-        if dl is None or getattr(dl, "empty", True):
-            return out
-
-        # 1 ticker
-        if isinstance(dl, pd.DataFrame) and not isinstance(dl.columns, pd.MultiIndex):
-            out[tickers[0]] = dl.copy()
-            return out
-
-        # multi tickers
-        if isinstance(dl.columns, pd.MultiIndex):
-            levels0 = list(map(str, dl.columns.get_level_values(0).unique()))
-            if any(t in levels0 for t in tickers):
-                # (ticker, field)
-                for t in tickers:
-                    if t in dl.columns.get_level_values(0):
-                        out[t] = dl[t].copy()
-            else:
-                # (field, ticker)
-                for t in tickers:
-                    if t in dl.columns.get_level_values(1):
-                        out[t] = dl.xs(t, axis=1, level=1).copy()
-        return out
-
     def _build_items_html_from_yahoo() -> str:
         """
         Devuelve HTML con spans por item:
@@ -492,13 +247,13 @@ def render_finanzas(go_to=None):
             ("Trigo", "ZW=F", "cmd"),
         ]
 
-        tickers = [t for _, t, _ in cfg]
-        data = _download_many(tickers)
+        # snapshot en memoria (services.market_data): lo refresca un hilo cada
+        # pocos minutos, así los reruns de la página no esperan a Yahoo
+        data = get_tape_snapshot(tuple(t for _, t, _ in cfg))
 
         parts: list[str] = []
         for label, tkr, kind in cfg:
-            df = data.get(tkr)
-            last, prev = _get_last_prev_close(df)
+            last, prev = data.get(tkr, (None, None))
 
             safe_label = _html.escape(label)
 
@@ -661,7 +416,7 @@ def render_finanzas(go_to=None):
     # ============================================================
 
     with st.spinner("Cargando Riesgo País (EMBI)..."):
-        embi_long = _load_embi_long_from_bcra()
+        embi_long = get_embi_spread_long()
 
     if embi_long is None or embi_long.empty:
         st.warning("Sin datos de Riesgo País (EMBI).")
@@ -968,96 +723,9 @@ def render_finanzas(go_to=None):
         # MervalUSD suele quedar "entero", ADRs con 2 dec
         return _fmt_es_num(x, 0) if tkr == "__MERVUSD__" else _fmt_es_num(x, 2)
 
-    # loader Yahoo 1-col (Close/Adj Close)
-    @st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
+    # loader Yahoo 1-col (Adj Close si está, si no Close) — vista del hub
     def _load_yahoo_series_1col(ticker: str, start: str = "2000-01-01") -> pd.DataFrame:
-        if yf is None:
-            return pd.DataFrame(columns=["Date", "value"])
-
-        try:
-            dl = yf.download(
-                ticker,
-                start=start,
-                progress=False,
-                auto_adjust=False,
-                interval="1d",
-                group_by="column",
-                threads=True,
-            )
-        except Exception:
-            dl = None
-
-        if dl is None or getattr(dl, "empty", True):
-            try:
-                dl = yf.download(
-                    ticker,
-                    period="max",
-                    progress=False,
-                    auto_adjust=False,
-                    interval="1d",
-                    group_by="column",
-                    threads=True,
-                )
-            except Exception:
-                dl = None
-
-        if dl is None or getattr(dl, "empty", True):
-            return pd.DataFrame(columns=["Date", "value"])
-
-        s = None
-
-        if isinstance(dl, pd.DataFrame) and not isinstance(dl.columns, pd.MultiIndex):
-            col = "Adj Close" if "Adj Close" in dl.columns else ("Close" if "Close" in dl.columns else None)
-            if col is None:
-                return pd.DataFrame(columns=["Date", "value"])
-            s = dl[col]
-        else:
-            # (field, ticker)
-            for field in ["Adj Close", "Close"]:
-                if field in dl.columns.get_level_values(0):
-                    tmp = dl.xs(field, axis=1, level=0)
-                    if isinstance(tmp, pd.DataFrame):
-                        if tmp.shape[1] == 1:
-                            s = tmp.iloc[:, 0]
-                        elif ticker in tmp.columns:
-                            s = tmp[ticker]
-                    else:
-                        s = tmp
-                    if s is not None:
-                        break
-            # (ticker, field)
-            if s is None:
-                for field in ["Adj Close", "Close"]:
-                    if ticker in dl.columns.get_level_values(0) and field in dl.columns.get_level_values(1):
-                        s = dl[(ticker, field)]
-                        break
-
-        if s is None:
-            return pd.DataFrame(columns=["Date", "value"])
-
-        if isinstance(s, pd.DataFrame):
-            if s.shape[1] == 1:
-                s = s.iloc[:, 0]
-            else:
-                return pd.DataFrame(columns=["Date", "value"])
-
-        s = pd.to_numeric(s, errors="coerce")
-        idx = pd.to_datetime(s.index, errors="coerce")
-        try:
-            idx = idx.tz_localize(None)
-        except Exception:
-            pass
-
-        out = pd.DataFrame({"Date": idx, "value": s.values})
-        out["Date"] = pd.to_datetime(out["Date"], errors="coerce").dt.normalize()
-        out["value"] = pd.to_numeric(out["value"], errors="coerce")
-        out = (
-            out.dropna(subset=["Date", "value"])
-            .drop_duplicates(subset=["Date"])
-            .sort_values("Date")
-            .reset_index(drop=True)
-        )
-        return out
+        return hub_df(ticker, adjusted=True, start=start)
 
     def _asof_val_1col(df_: pd.DataFrame, target: pd.Timestamp):
         t = df_.dropna(subset=["Date", "value"]).sort_values("Date")
@@ -1310,105 +978,9 @@ def render_finanzas(go_to=None):
                 return _fmt_es_num(x, 0)
             return _fmt_es_num(x, 2)
 
-        @st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
         def _load_yahoo_series(ticker: str, start: str = "2000-01-01") -> pd.DataFrame:
-            if yf is None:
-                return pd.DataFrame(columns=["Date", "value"])
-
-            try:
-                dl = yf.download(
-                    ticker,
-                    start=start,
-                    progress=False,
-                    auto_adjust=False,
-                    interval="1d",
-                    group_by="column",
-                    threads=True,
-                )
-            except Exception:
-                dl = None
-
-            if dl is None or getattr(dl, "empty", True):
-                try:
-                    dl = yf.download(
-                        ticker,
-                        period="max",
-                        progress=False,
-                        auto_adjust=False,
-                        interval="1d",
-                        group_by="column",
-                        threads=True,
-                    )
-                except Exception:
-                    dl = None
-
-            if dl is None or getattr(dl, "empty", True):
-                return pd.DataFrame(columns=["Date", "value"])
-
-            # --- EXTRAER SERIE (Close / Adj Close) ROBUSTO ---
-            s = None
-
-            # Caso columnas simples
-            if isinstance(dl, pd.DataFrame) and not isinstance(dl.columns, pd.MultiIndex):
-                col = "Adj Close" if "Adj Close" in dl.columns else ("Close" if "Close" in dl.columns else None)
-                if col is None:
-                    return pd.DataFrame(columns=["Date", "value"])
-                s = dl[col]
-
-            # Caso columnas MultiIndex
-            else:
-                # (field, ticker)
-                for field in ["Adj Close", "Close"]:
-                    if field in dl.columns.get_level_values(0):
-                        tmp = dl.xs(field, axis=1, level=0)
-                        if isinstance(tmp, pd.DataFrame):
-                            if tmp.shape[1] == 1:
-                                s = tmp.iloc[:, 0]
-                            elif ticker in tmp.columns:
-                                s = tmp[ticker]
-                        else:
-                            s = tmp
-                        if s is not None:
-                            break
-
-                # (ticker, field)
-                if s is None:
-                    for field in ["Adj Close", "Close"]:
-                        if (
-                            ticker in dl.columns.get_level_values(0)
-                            and field in dl.columns.get_level_values(1)
-                        ):
-                            s = dl[(ticker, field)]
-                            break
-
-            if s is None:
-                return pd.DataFrame(columns=["Date", "value"])
-
-            # Asegurar 1D
-            if isinstance(s, pd.DataFrame):
-                if s.shape[1] == 1:
-                    s = s.iloc[:, 0]
-                else:
-                    return pd.DataFrame(columns=["Date", "value"])
-
-            s = pd.to_numeric(s, errors="coerce")
-
-            idx = pd.to_datetime(s.index, errors="coerce")
-            try:
-                idx = idx.tz_localize(None)
-            except Exception:
-                pass
-
-            out = pd.DataFrame({"Date": idx, "value": s.values})
-            out["Date"] = pd.to_datetime(out["Date"], errors="coerce").dt.normalize()
-            out["value"] = pd.to_numeric(out["value"], errors="coerce")
-            out = (
-                out.dropna(subset=["Date", "value"])
-                .drop_duplicates(subset=["Date"])
-                .sort_values("Date")
-                .reset_index(drop=True)
-            )
-            return out
+            # Adj Close si está, si no Close — vista del hub
+            return hub_df(ticker, adjusted=True, start=start)
 
         def _asof_val_1col(df_: pd.DataFrame, target: pd.Timestamp):
             t = df_.dropna(subset=["Date", "value"]).sort_values("Date")
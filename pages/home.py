@@ -1,11 +1,12 @@
 import base64
 import streamlit as st
 import pandas as pd
-import requests
 import xml.etree.ElementTree as ET
 from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 
+from services import http_client
+
 
 # ============================================================
 # Logo helper
@@ -159,9 +160,8 @@ def _load_news_scored():
     items = []
     for url in NEWS_FEEDS:
         try:
-            r = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-            r.raise_for_status()
-            items.extend(_parse_rss(r.content, url))
+            raw = http_client.get_bytes(url, profile="rss", headers={"User-Agent": "Mozilla/5.0"})
+            items.extend(_parse_rss(raw, url))
         except Exception:
             continue
 
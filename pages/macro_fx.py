@@ -9,12 +9,10 @@ import textwrap
 import streamlit.components.v1 as components
 
 from services.macro_data import (
-    build_bands_2025,
-    build_bands_2026,
     get_a3500,
-    get_ipc_bcra,
-    get_rem_last,
-    get_itcrm_excel_long,
+    get_fx_bands,
+    get_itcrm_wide,
+    itcrm_views,
 )
 
 # ✅ CCL desde services (NO yfinance acá)
@@ -249,23 +247,13 @@ def render_macro_fx(go_to):
         .reset_index(drop=True)
     )
 
-    rem = get_rem_last()
-    ipc = get_ipc_bcra()
-
-    bands_2025 = build_bands_2025("2025-04-14", "2025-12-31", 1000.0, 1400.0)
-    bands_2026 = build_bands_2026(bands_2025, rem, ipc)
-
-    bands = (
-        pd.concat([bands_2025, bands_2026], ignore_index=True)
-        .dropna(subset=["Date", "lower", "upper"])
-        .sort_values("Date")
-        .reset_index(drop=True)
-    )
+    # bandas 2025 + 2026 (última edición REM), memoizadas en services por (REM, IPC)
+    bands = get_fx_bands()
     bands["Date"] = _fix_date(bands["Date"])
     bands = bands.dropna(subset=["Date", "lower", "upper"])
 
     # -------------------------
-    # CCL proxy (FAST) desde services — igual que Home
+    # CCL proxy desde services: recorte de la serie canónica (igual que Home)
     # -------------------------
     ccl_df = get_ccl_ypf_df_fast(period="5y", prefer_adj=True)
 
@@ -603,19 +591,16 @@ def render_macro_fx(go_to):
     st.divider()
 
 
-    tcr_long = get_itcrm_excel_long()
+    # matriz ancha (Date x serie): cada rerun toma vistas de las columnas elegidas
+    tcr = get_itcrm_wide()
 
-    if tcr_long is None or tcr_long.empty:
+    if tcr is None or tcr.empty:
         st.warning("Sin datos de ITCRM.")
     else:
-        tcr_long = tcr_long.copy()
-        tcr_long["Date"] = _fix_date(tcr_long["Date"])
-        tcr_long["Value"] = pd.to_numeric(tcr_long["Value"], errors="coerce")
-        tcr_long["Serie"] = tcr_long["Serie"].astype(str)
-        tcr_long = tcr_long.dropna(subset=["Date", "Serie", "Value"]).sort_values("Date")
+        tcr_last = tcr.attrs.get("last", {})
 
         preferred = ["ITCRM ", "ITCRB Brasil", "ITCRB Estados Unidos", "ITCRB China"]
-        series_all = tcr_long["Serie"].dropna().unique().tolist()
+        series_all = [str(c) for c in tcr.columns]
 
         options = [s for s in preferred if s in series_all]
         options += [s for s in sorted(series_all) if s not in options]
@@ -704,12 +689,12 @@ def render_macro_fx(go_to):
             if st.session_state.get("tcr_medida") not in ["Nivel", "Variación acumulada"]:
                 st.session_state["tcr_medida"] = "Nivel"
 
-            def _asof_tcr(df_: pd.DataFrame, target: pd.Timestamp):
-                tt = df_.dropna(subset=["Date", "Value"]).sort_values("Date")
-                tt = tt[tt["Date"] <= target]
-                if tt.empty:
+            def _asof_tcr(s_: pd.Series, target: pd.Timestamp):
+                # s_ sin NaN e indexada por Date ordenada
+                pos = s_.index.searchsorted(target, side="right")
+                if pos == 0:
                     return None
-                return float(tt["Value"].iloc[-1])
+                return float(s_.iloc[pos - 1])
 
             # para el header: si seleccionan ITCRM (CCL), el header sigue mostrando ITCRM base (más estable)
             tcr_vars_now = st.session_state.get("tcr_vars", [default_main])
@@ -719,9 +704,9 @@ def render_macro_fx(go_to):
             if main_series == "ITCRM (CCL)":
                 main_series = "ITCRM " if "ITCRM " in options else default_main
 
-            tcr_main = tcr_long[tcr_long["Serie"] == main_series].sort_values("Date")
-            last_tcr_date = pd.to_datetime(tcr_main["Date"].iloc[-1]) if not tcr_main.empty else pd.NaT
-            last_tcr_val = float(tcr_main["Value"].iloc[-1]) if not tcr_main.empty else np.nan
+            tcr_main = itcrm_views(tcr, [main_series]).get(main_series, pd.Series(dtype=float)).dropna()
+            last_tcr_date = pd.to_datetime(tcr_main.index[-1]) if not tcr_main.empty else pd.NaT
+            last_tcr_val = float(tcr_main.iloc[-1]) if not tcr_main.empty else np.nan
 
             vm_tcr = None
             va_tcr = None
@@ -793,26 +778,22 @@ def render_macro_fx(go_to):
                 tcr_vars = [default_main]
                 st.session_state["tcr_vars"] = tcr_vars
 
-            tcr_min = pd.to_datetime(tcr_long["Date"].min())
-            tcr_max = pd.to_datetime(tcr_long["Date"].max())
-
-            cal2 = pd.DataFrame({"Date": pd.date_range(tcr_min, tcr_max, freq="D")})
+            tcr_min = pd.to_datetime(tcr.index.min())
+            tcr_max = pd.to_datetime(tcr.index.max())
 
-            wide = (
-                tcr_long.pivot_table(index="Date", columns="Serie", values="Value", aggfunc="last")
-                .sort_index()
-                .reset_index()
-            )
+            cal2 = pd.date_range(tcr_min, tcr_max, freq="D", name="Date")
+            df2 = pd.DataFrame({"Date": cal2})
 
-            df2 = cal2.merge(wide, on="Date", how="left").sort_values("Date").reset_index(drop=True)
-            df2["Date"] = _fix_date(df2["Date"])
+            # solo las series elegidas (+ ITCRM base si piden la sintética)
+            need = [s for s in tcr_vars if s in series_all]
+            if "ITCRM (CCL)" in tcr_vars and "ITCRM " in series_all and "ITCRM " not in need:
+                need.append("ITCRM ")
 
             # ffill respetando último dato por serie
-            for s in series_all:
-                if s in df2.columns:
-                    last_s_date = tcr_long.loc[tcr_long["Serie"] == s, "Date"].max()
-                    df2[s] = pd.to_numeric(df2[s], errors="coerce").ffill()
-                    df2.loc[df2["Date"] > pd.to_datetime(last_s_date), s] = np.nan
+            for s, col in itcrm_views(tcr, need).items():
+                daily = col.reindex(cal2).ffill()
+                daily[cal2 > tcr_last.get(s, tcr_max)] = np.nan
+                df2[s] = daily.to_numpy()
 
             # ---- brecha asof sobre fechas TCRM (último inmediato)
             if brecha_daily is not None and not brecha_daily.empty:
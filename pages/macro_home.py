@@ -2,23 +2,17 @@ import streamlit as st
 import pandas as pd
 import random
 import numpy as np
-import io
-import requests
 import xml.etree.ElementTree as ET
 from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# yfinance opcional
-try:
-    import yfinance as yf
-except Exception:
-    yf = None
-
+from services import http_client
 from services.macro_data import (
     get_a3500,
-    get_monetaria_serie,
+    get_monetaria_many,
     get_ipc_bcra,
+    get_ipim,
 )
 
 # ============================================================
@@ -75,11 +69,17 @@ def _fmt_mes_anio_es(dt: pd.Timestamp) -> str:
 # ============================================================
 # Cache wrappers (para no repetir descargas/procesos)
 # ============================================================
+def _require_data(df: pd.DataFrame | None, what: str) -> None:
+    # sin datos (BCRA caído, sin copia local): excepción => st.cache_data no guarda
+    # el vacío 12 h; la carga de KPIs la captura y muestra "—"
+    if df is None or df.empty:
+        raise RuntimeError(f"{what}: sin datos")
+
+
 @st.cache_data(ttl=12 * 60 * 60, show_spinner=False)
 def _a3500_cached() -> pd.DataFrame:
     df = get_a3500()
-    if df is None or df.empty:
-        return pd.DataFrame()
+    _require_data(df, "A3500")
     df = df.copy()
     if "Date" in df.columns:
         df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.normalize()
@@ -89,11 +89,15 @@ def _a3500_cached() -> pd.DataFrame:
     return df
 
 
+# Series Monetarias de la fila de KPIs (tasa adelantos + reservas): un solo fetch en bloque
+KPI_MONETARIA_IDS = (13, 1)
+
+
 @st.cache_data(ttl=12 * 60 * 60, show_spinner=False)
 def _monetaria_cached(serie_id: int) -> pd.DataFrame:
-    df = get_monetaria_serie(serie_id)
-    if df is None or df.empty:
-        return pd.DataFrame()
+    ids = KPI_MONETARIA_IDS if serie_id in KPI_MONETARIA_IDS else (*KPI_MONETARIA_IDS, serie_id)
+    df = get_monetaria_many(ids).get(serie_id)
+    _require_data(df, f"Monetarias/{serie_id}")
     df = df.copy()
     if "Date" in df.columns:
         df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.normalize()
@@ -149,46 +153,18 @@ def _last_reservas():
 @st.cache_data(ttl=12 * 60 * 60, show_spinner=False)
 def _last_riesgo_pais():
     """
-    Riesgo País (puntos básicos).
-    Import lazy desde pages/finanzas, pero cacheado por TTL.
+    Riesgo País (puntos básicos), desde el loader EMBI de services.market_data
+    (el mismo parseo que usa finanzas).
     """
     try:
-        from pages.finanzas import _load_riesgo_pais
-    except Exception:
-        return None, None
-
-    try:
-        df = _load_riesgo_pais()
+        from services.market_data import get_riesgo_pais
+        df = get_riesgo_pais()
     except Exception:
         return None, None
 
     if df is None or df.empty:
         return None, None
 
-    df = df.copy()
-
-    if "Date" not in df.columns:
-        for c in ["date", "fecha", "Fecha"]:
-            if c in df.columns:
-                df = df.rename(columns={c: "Date"})
-                break
-
-    if "value" not in df.columns:
-        for c in ["Value", "valor", "riesgo_pais", "Riesgo País", "Riesgo Pais"]:
-            if c in df.columns:
-                df = df.rename(columns={c: "value"})
-                break
-
-    if "Date" not in df.columns or "value" not in df.columns:
-        return None, None
-
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce").dt.normalize()
-    df["value"] = pd.to_numeric(df["value"], errors="coerce")
-    df = df.dropna(subset=["Date", "value"]).sort_values("Date")
-
-    if df.empty:
-        return None, None
-
     r = df.iloc[-1]
     return float(r["value"]), pd.to_datetime(r["Date"])
 
@@ -292,69 +268,17 @@ def _last_brecha_from_macro_fx():
 def _last_merval_usd():
     """
     MERVAL en USD = ^MERV / (YPFD.BA / YPF)
-    Estable: alinea por última fecha común normalizando índice a fecha.
+    Estable: alinea por última fecha común (panel del hub, una sola descarga).
     """
-    if yf is None:
-        return None, None
-
-    def _close_series(dl):
-        if dl is None:
-            return None
-        if isinstance(dl, pd.Series):
-            return dl
-        if isinstance(dl, pd.DataFrame):
-            if "Close" in dl.columns:
-                s = dl["Close"]
-                if isinstance(s, pd.DataFrame):
-                    s = s.iloc[:, 0]
-                return s
-            if isinstance(dl.columns, pd.MultiIndex):
-                cols = list(dl.columns)
-                c1 = [c for c in cols if len(c) >= 2 and c[0] == "Close"]
-                if c1:
-                    s = dl[c1[0]]
-                    if isinstance(s, pd.DataFrame):
-                        s = s.iloc[:, 0]
-                    return s
-                c2 = [c for c in cols if len(c) >= 2 and c[1] == "Close"]
-                if c2:
-                    s = dl[c2[0]]
-                    if isinstance(s, pd.DataFrame):
-                        s = s.iloc[:, 0]
-                    return s
-        return None
-
     try:
-        merv_dl = yf.download("^MERV", period="1y", progress=False, auto_adjust=False, group_by="column", threads=False)
-        ypf_ars_dl = yf.download("YPFD.BA", period="1y", progress=False, auto_adjust=False, group_by="column", threads=False)
-        ypf_usd_dl = yf.download("YPF", period="1y", progress=False, auto_adjust=False, group_by="column", threads=False)
-
-        merv = _close_series(merv_dl)
-        ypf_ars = _close_series(ypf_ars_dl)
-        ypf_usd = _close_series(ypf_usd_dl)
+        from services.market_data import hub_series
     except Exception:
         return None, None
 
-    if merv is None or ypf_ars is None or ypf_usd is None:
-        return None, None
-    if merv.empty or ypf_ars.empty or ypf_usd.empty:
-        return None, None
-
-    def _norm_index(s: pd.Series) -> pd.Series:
-        s2 = s.copy()
-        s2.index = pd.to_datetime(s2.index, errors="coerce")
-        try:
-            s2.index = s2.index.tz_localize(None)
-        except Exception:
-            pass
-        s2.index = s2.index.normalize()
-        return s2
-
-    merv = _norm_index(merv).rename("^MERV")
-    ypf_ars = _norm_index(ypf_ars).rename("YPFD.BA")
-    ypf_usd = _norm_index(ypf_usd).rename("YPF")
-
-    df = pd.concat([merv, ypf_ars, ypf_usd], axis=1).dropna()
+    df = pd.concat(
+        [hub_series("^MERV"), hub_series("YPFD.BA"), hub_series("YPF")],
+        axis=1,
+    ).dropna()
     if df.empty:
         return None, None
 
@@ -372,7 +296,6 @@ def _last_merval_usd():
 # ============================================================
 # IPIM (INDEC) — último dato Manufacturas v/m
 # ============================================================
-IPIM_URL = "https://www.indec.gob.ar/ftp/cuadros/economia/indice_ipim.csv"
 IPIM_HEADER_CODE = "d_productos_manufacturados"
 
 @st.cache_data(ttl=12 * 60 * 60, show_spinner=False)
@@ -381,67 +304,11 @@ def _last_ipim_ng_vm():
     Devuelve (ultimo_vm_en_% , periodo_as_timestamp) para IPIM Manufacturas.
     (El nombre histórico de la función se mantiene para no romper imports.)
     """
-    try:
-        r = requests.get(IPIM_URL, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
-        r.raise_for_status()
-        raw = r.content
-    except Exception:
+    ipim = get_ipim()
+    if ipim is None or ipim.empty:
         return None, None
 
-    df = None
-    for sep in [";", ",", "\t"]:
-        try:
-            tmp = pd.read_csv(io.BytesIO(raw), sep=sep, engine="python")
-            if tmp is None or tmp.empty:
-                continue
-            cols = [c.strip().lower() for c in tmp.columns]
-            if "periodo" in cols and "nivel_general_aperturas" in cols and "indice_ipim" in cols:
-                df = tmp
-                break
-        except Exception:
-            continue
-
-    if df is None or df.empty:
-        return None, None
-
-    out = df[["periodo", "nivel_general_aperturas", "indice_ipim"]].copy()
-    out = out.rename(
-        columns={
-            "periodo": "Periodo_raw",
-            "nivel_general_aperturas": "Apertura_raw",
-            "indice_ipim": "Indice_raw",
-        }
-    )
-
-    out["Apertura"] = (
-        out["Apertura_raw"].astype(str).str.strip().str.lower()
-        .str.replace("\u00a0", " ", regex=False)
-        .str.replace(".", "", regex=False)
-        .str.replace(" ", "_", regex=False)
-        .str.replace("__", "_", regex=False)
-    )
-
-    s_per = out["Periodo_raw"].astype(str).str.strip()
-    per = pd.to_datetime(s_per, format="%Y-%m-%d", errors="coerce")
-    out["Periodo"] = per.dt.to_period("M").dt.to_timestamp(how="start")
-
-    s = out["Indice_raw"].astype(str).str.strip()
-    s = s.str.replace("\u00a0", " ", regex=False).str.replace(" ", "", regex=False)
-    has_comma = s.str.contains(",", na=False)
-    s.loc[has_comma] = s.loc[has_comma].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
-    out["Indice"] = pd.to_numeric(s, errors="coerce")
-
-    out = (
-        out.dropna(subset=["Periodo", "Apertura", "Indice"])
-        .sort_values(["Apertura", "Periodo"])
-        .reset_index(drop=True)
-    )
-    if out.empty:
-        return None, None
-
-    out["v_m"] = out.groupby("Apertura")["Indice"].pct_change(1) * 100
-
-    hdr = out[out["Apertura"] == IPIM_HEADER_CODE].dropna(subset=["v_m"]).sort_values("Periodo")
+    hdr = ipim[ipim["Apertura"] == IPIM_HEADER_CODE].dropna(subset=["v_m"]).sort_values("Periodo")
     if hdr.empty:
         return None, None
 
@@ -623,9 +490,8 @@ def _load_news_scored(feeds: list[str] | None = None, max_items_total: int = 50)
     items: list[dict] = []
     for url in feeds:
         try:
-            r = requests.get(url, timeout=10, headers={"User-Agent": "Mozilla/5.0"})
-            r.raise_for_status()
-            items.extend(_parse_rss(r.content, url))
+            raw = http_client.get_bytes(url, profile="rss", headers={"User-Agent": "Mozilla/5.0"})
+            items.extend(_parse_rss(raw, url))
         except Exception:
             continue
 
@@ -3,12 +3,11 @@ import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
 import textwrap
-import io
 import re
-import requests
 import streamlit.components.v1 as components
 
-from services.macro_data import get_ipc_indec_full
+from services import http_cache
+from services.macro_data import IPC_INDEC_CSV_URL, get_ipc_indec_full, get_ipim, ipc_select
 
 
 # ============================================================
@@ -44,6 +43,21 @@ def _clean_code(x) -> str:
     return s
 
 
+def _ipc_source_note() -> str:
+    """Pie de los gráficos de IPC: fuente + hora de la copia servida (swr_cache)."""
+    note = "Fuente: INDEC."
+    ts = get_ipc_indec_full.fetched_at()
+    if ts is not None:
+        local = ts.tz_localize("UTC").tz_convert("America/Argentina/Buenos_Aires")
+        note += f" Datos al {local:%d/%m/%Y %H:%M}."
+    if get_ipc_indec_full.last_error() is not None or http_cache.stale_error(IPC_INDEC_CSV_URL):
+        note += " No se pudo actualizar: se muestra la última copia disponible."
+    return (
+        "<div style='color:rgba(20,50,79,0.70); font-size:12px; margin-top:6px;'>"
+        f"{note}</div>"
+    )
+
+
 def _arrow_cls(v):
     if v is None or (isinstance(v, float) and np.isnan(v)):
         return ("", "")
@@ -103,7 +117,7 @@ def _range_accum_from_index(df: pd.DataFrame, date_col: str, group_col: str, idx
     d[date_col] = pd.to_datetime(d[date_col], errors="coerce")
     d = d.dropna(subset=[date_col, group_col, idx_col]).sort_values([group_col, date_col])
 
-    for g, gg in d.groupby(group_col, sort=False):
+    for g, gg in d.groupby(group_col, sort=False, observed=True):
         gg = gg.sort_values(date_col)
         base_row = gg[gg[date_col] == start_date]
         if base_row.empty:
@@ -490,6 +504,10 @@ def render_macro_precios(go_to):
     ipc["Periodo"] = pd.to_datetime(ipc["Periodo"], errors="coerce").dt.normalize()
     ipc = ipc.dropna(subset=["Periodo"]).sort_values("Periodo")
 
+    def _ipc_code(code: str) -> pd.DataFrame:
+        # slice directo por el índice (Codigo, Region) que arma el service
+        return ipc_select(ipc_raw, code, "Nacional").assign(Codigo_str=code)
+
 
     # =========================
     # IPCA (ENGHo 2017/18) base 100=2025
@@ -539,62 +557,11 @@ def render_macro_precios(go_to):
     # =========================
     # Datos: IPIM (INDEC)
     # =========================
-    IPIM_URL = "https://www.indec.gob.ar/ftp/cuadros/economia/indice_ipim.csv"
-
-    @st.cache_data(ttl=12 * 60 * 60)
-    def _load_ipim_simple() -> pd.DataFrame:
-        r = requests.get(IPIM_URL, timeout=60)
-        r.raise_for_status()
-        raw = r.content
-
-        df = None
-        for sep in [";", ",", "\t"]:
-            try:
-                tmp = pd.read_csv(io.BytesIO(raw), sep=sep, engine="python")
-                if tmp is None or tmp.empty:
-                    continue
-                cols = [c.strip().lower() for c in tmp.columns]
-                if ("periodo" in cols) and ("nivel_general_aperturas" in cols) and ("indice_ipim" in cols):
-                    df = tmp
-                    break
-            except Exception:
-                continue
-
-        if df is None or df.empty:
-            return pd.DataFrame()
-
-        out = df[["periodo", "nivel_general_aperturas", "indice_ipim"]].copy()
-        out = out.rename(columns={"periodo": "Periodo_raw", "nivel_general_aperturas": "Apertura_raw", "indice_ipim": "Indice_raw"})
-
-        out["Apertura"] = (
-            out["Apertura_raw"].astype(str).str.strip().str.lower()
-            .str.replace("\u00a0", " ", regex=False)
-            .str.replace(".", "", regex=False)
-            .str.replace(" ", "_", regex=False)
-            .str.replace("__", "_", regex=False)
-        )
-
-        per = pd.to_datetime(out["Periodo_raw"].astype(str).str.strip(), format="%Y-%m-%d", errors="coerce")
-        out["Periodo"] = per.dt.to_period("M").dt.to_timestamp(how="start")
-
-        s = out["Indice_raw"].astype(str).str.strip()
-        s = s.str.replace("\u00a0", " ", regex=False).str.replace(" ", "", regex=False)
-        has_comma = s.str.contains(",", na=False)
-        s.loc[has_comma] = s.loc[has_comma].str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
-        out["Indice"] = pd.to_numeric(s, errors="coerce")
-
-        out = out.dropna(subset=["Periodo", "Apertura", "Indice"]).sort_values(["Apertura", "Periodo"]).reset_index(drop=True)
-        return out
-
-    ipim = _load_ipim_simple()
+    ipim = get_ipim()  # Periodo, Apertura, Indice, v_m, v_i_a (compartido con macro_home)
     if ipim.empty:
         st.warning("No se pudo cargar IPIM (INDEC).")
         return
 
-    ipim = ipim.sort_values(["Apertura", "Periodo"]).copy()
-    ipim["v_m"] = ipim.groupby("Apertura")["Indice"].pct_change(1) * 100
-    ipim["v_i_a"] = ipim.groupby("Apertura")["Indice"].pct_change(12) * 100
-
     # ============================================================
     # 0) PANEL NUEVO ARRIBA: PRECIOS (IPC + IPIM Manufacturados + IPCA)
     # ============================================================
@@ -704,7 +671,7 @@ def render_macro_precios(go_to):
             continue
 
         if which == "ipc":
-            d = ipc[ipc["Codigo_str"] == code][["Periodo"]].dropna()
+            d = _ipc_code(code)[["Periodo"]].dropna()
         elif which == "ipim":
             d = ipim[ipim["Apertura"] == code][["Periodo"]].dropna()
         else:  # ipca
@@ -754,7 +721,7 @@ def render_macro_precios(go_to):
             continue
 
         if which == "ipc":
-            d = ipc[ipc["Codigo_str"] == code].copy()
+            d = _ipc_code(code)
             d = d[(d["Periodo"] >= start_m_p) & (d["Periodo"] < end_exclusive_p)].sort_values("Periodo")
             if d.empty:
                 continue
@@ -869,10 +836,7 @@ def render_macro_precios(go_to):
         key="precios_chart",
     )
 
-    st.markdown(
-        "<div style='color:rgba(20,50,79,0.70); font-size:12px; margin-top:6px;'>Fuente: INDEC.</div>",
-        unsafe_allow_html=True,
-    )
+    st.markdown(_ipc_source_note(), unsafe_allow_html=True)
 
     # ============================================================
     # DESDE ACÁ (st.divider() de IPC en adelante) ES IGUAL A TU ARCHIVO
@@ -941,7 +905,8 @@ def render_macro_precios(go_to):
         y_col_hdr = "v_m_IPC"
         medida_txt_hdr = "Variación acumulada"
 
-    hdr_series = ipc[ipc["Codigo_str"] == header_code].dropna(subset=[y_col_hdr]).sort_values("Periodo")
+    hdr_all = _ipc_code(header_code)
+    hdr_series = hdr_all.dropna(subset=[y_col_hdr])
     if hdr_series.empty:
         st.warning("Sin datos para armar el header IPC.")
         return
@@ -949,7 +914,6 @@ def render_macro_precios(go_to):
     last_period = pd.to_datetime(hdr_series["Periodo"].iloc[-1])
     last_val = float(hdr_series[y_col_hdr].iloc[-1])
 
-    hdr_all = ipc[ipc["Codigo_str"] == header_code].sort_values("Periodo")
     m_val = hdr_all["v_m_IPC"].dropna().iloc[-1] if hdr_all["v_m_IPC"].dropna().shape[0] else np.nan
     a_val = hdr_all["v_i_a_IPC"].dropna().iloc[-1] if hdr_all["v_i_a_IPC"].dropna().shape[0] else np.nan
     a_m, cls_m = _arrow_cls(m_val if pd.notna(m_val) else np.nan)
@@ -1125,10 +1089,7 @@ def render_macro_precios(go_to):
         key="ipc_chart",
     )
 
-    st.markdown(
-        "<div style='color:rgba(20,50,79,0.70); font-size:12px; margin-top:6px;'>Fuente: INDEC.</div>",
-        unsafe_allow_html=True,
-    )
+    st.markdown(_ipc_source_note(), unsafe_allow_html=True)
 
     # =========================================================
     # 2) IPIM (INDEC) — PANEL (abajo) + Acumulado por rango
@@ -5,7 +5,7 @@ import numpy as np
 import random
 import textwrap
 import streamlit.components.v1 as components
-from services.macro_data import get_monetaria_serie
+from services.macro_data import get_monetaria_many
 from ui.common import safe_pct   # 👈 ESTA LÍNEA
 
 
@@ -314,11 +314,14 @@ def render_macro_tasa(go_to):
     # =========================
     # Load data
     # =========================
-    rem29 = _rem29_to_daily(get_monetaria_serie(ID_REM))
+    ID_RESERVAS = 1
+    monetarias = get_monetaria_many((*SERIES_TASAS, ID_REM, ID_RESERVAS))
+
+    rem29 = _rem29_to_daily(monetarias.get(ID_REM))
 
     series_data = {}
     for sid in SERIES_TASAS:
-        df = get_monetaria_serie(sid)
+        df = monetarias.get(sid)
         if df is None or df.empty:
             continue
         df = df.copy()
@@ -626,8 +629,7 @@ def render_macro_tasa(go_to):
     # ============================================================
     st.divider()
 
-    with st.spinner("Cargando reservas internacionales..."):
-        reservas = get_monetaria_serie(1)
+    reservas = monetarias.get(ID_RESERVAS)
 
     if reservas is None or reservas.empty:
         st.warning("Sin datos de Reservas Internacionales Brutas.")
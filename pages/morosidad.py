@@ -4,6 +4,8 @@ import plotly.graph_objects as go
 import numpy as np
 import streamlit.components.v1 as components
 
+from services import excel_io
+
 # ============================================================
 # Config
 # ============================================================
@@ -29,7 +31,7 @@ COL_Y_SERIE = "valor_serie"
 # ============================================================
 @st.cache_data(show_spinner=False)
 def load_mora():
-    df = pd.read_excel(MORA_PATH, sheet_name="Monitor", engine="openpyxl")
+    df = excel_io.read_excel(MORA_PATH, sheet_name="Monitor")
     df.columns = [str(c).strip() for c in df.columns]
     df[COL_ID] = pd.to_numeric(df[COL_ID], errors="coerce")
     df = df[df[COL_ID].fillna(-1) != 0].copy()
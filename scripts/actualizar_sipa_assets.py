@@ -1,5 +1,5 @@
 import re
-from io import BytesIO
+import sys
 from pathlib import Path
 from datetime import date
 
@@ -8,6 +8,13 @@ import requests
 
 
 ROOT = Path(__file__).resolve().parents[1]
+
+# permite `python scripts/actualizar_sipa_assets.py` desde cualquier carpeta
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services import excel_io  # noqa: E402
+
 SIPA_DIR = ROOT / "assets" / "sipa"
 SIPA_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -201,16 +208,21 @@ def main():
     r = requests.get(url, timeout=90)
     r.raise_for_status()
 
-    xls = pd.ExcelFile(BytesIO(r.content), engine="openpyxl")
-
-    t21 = pd.read_excel(xls, sheet_name="T.2.1", header=None, usecols=[0, 1])
-    t22 = pd.read_excel(xls, sheet_name="T.2.2", header=None, usecols=[0, 1])
-
-    a21 = pd.read_excel(xls, sheet_name="A.2.1", header=None, usecols=list(range(17)))
-    a22 = pd.read_excel(xls, sheet_name="A.2.2", header=None, usecols=list(range(17)))
-
-    a61 = pd.read_excel(xls, sheet_name="A.6.1", header=None, usecols=[0, 3, 4, 5, 6, 7, 8, 9])
-    a62 = pd.read_excel(xls, sheet_name="A.6.2", header=None, usecols=[0, 3, 4, 5, 6, 7, 8, 9])
+    # las seis hojas en paralelo (un proceso por hoja)
+    hojas = excel_io.parse_sheets(
+        r.content,
+        {
+            "T.2.1": {"header": None, "usecols": [0, 1]},
+            "T.2.2": {"header": None, "usecols": [0, 1]},
+            "A.2.1": {"header": None, "usecols": list(range(17))},
+            "A.2.2": {"header": None, "usecols": list(range(17))},
+            "A.6.1": {"header": None, "usecols": [0, 3, 4, 5, 6, 7, 8, 9]},
+            "A.6.2": {"header": None, "usecols": [0, 3, 4, 5, 6, 7, 8, 9]},
+        },
+    )
+    t21, t22 = hojas["T.2.1"], hojas["T.2.2"]
+    a21, a22 = hojas["A.2.1"], hojas["A.2.2"]
+    a61, a62 = hojas["A.6.1"], hojas["A.6.2"]
 
     s_orig = extraer_serie_colB(t21).rename(columns={"valor": "orig"})
     s_sa = extraer_serie_colB(t22).rename(columns={"valor": "sa"})
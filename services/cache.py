@@ -0,0 +1,176 @@
+# ============================================================
+# Cache stale-while-revalidate para loaders de services
+#   - dentro del TTL: devuelve lo cacheado
+#   - vencido: devuelve el último valor bueno YA y refresca en un hilo
+#   - si el refresh falla (excepción o DataFrame vacío) se conserva el último bueno
+#   - sin copia buena previa la excepción se propaga (como sin cache)
+#   - fetched_at()/last_error() por clave para mostrar antigüedad en la UI
+#
+# + singleflight: llamadas concurrentes con los mismos argumentos comparten
+#   una sola ejecución (el resto espera el resultado del primero)
+# ============================================================
+import functools
+import threading
+import time
+
+import pandas as pd
+
+
+NEGATIVE_TTL = 60  # seg que se recuerda un resultado malo sin copia buena previa
+
+
+def _is_good(value) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return not value.empty
+    if isinstance(value, tuple):
+        return all(_is_good(v) for v in value)
+    return True
+
+
+def _copy(value):
+    # mismo contrato que st.cache_data: el llamador puede mutar lo que recibe
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(v) for v in value)
+    return value
+
+
+def _make_key(args, kwargs):
+    key = (args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+        return key
+    except TypeError:
+        return repr(key)
+
+
+class _Flight:
+    __slots__ = ("done", "value", "exc")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.exc = None
+
+
+def singleflight(fn):
+    """
+    Coalesce de llamadas concurrentes por (función, argumentos): el primero
+    ejecuta, los demás esperan y reciben el mismo resultado (o la misma excepción).
+    No cachea nada: terminada la ejecución, la próxima llamada vuelve a correr.
+    """
+    flights: dict = {}
+    lock = threading.Lock()
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = _make_key(args, kwargs)
+        with lock:
+            flight = flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.exc is not None:
+                raise flight.exc
+            return _copy(flight.value)
+
+        try:
+            flight.value = fn(*args, **kwargs)
+            return flight.value
+        except BaseException as e:
+            flight.exc = e
+            raise
+        finally:
+            with lock:
+                flights.pop(key, None)
+            flight.done.set()
+
+    return wrapper
+
+
+def swr_cache(ttl: float, is_good=_is_good):
+    """
+    Decorador stale-while-revalidate.
+
+      @swr_cache(ttl=12 * 60 * 60)
+      def get_algo(...) -> pd.DataFrame: ...
+
+      get_algo.fetched_at(...)  -> pd.Timestamp | None (hora del valor servido)
+      get_algo.last_error(...)  -> str | None (último refresh fallido)
+      get_algo.clear()
+    """
+
+    def deco(fn):
+        entries: dict = {}  # key -> {"value", "ts", "good", "error", "exc"}
+        run = singleflight(fn)  # arranque en frío con varias sesiones: una sola descarga
+        refreshing: set = set()
+        lock = threading.Lock()
+
+        def _compute(key, args, kwargs):
+            exc = None
+            try:
+                value = run(*args, **kwargs)
+                error = None if is_good(value) else "resultado vacío"
+            except Exception as e:
+                value, exc, error = None, e, f"{type(e).__name__}: {e}"
+
+            with lock:
+                prev = entries.get(key)
+                if error is None:
+                    entries[key] = {"value": value, "ts": time.time(), "good": True, "error": None, "exc": None}
+                elif prev is not None and prev["good"]:
+                    # nos quedamos con el último bueno; solo anotamos el error
+                    prev["error"] = error
+                else:
+                    entries[key] = {"value": value, "ts": time.time(), "good": False, "error": error, "exc": exc}
+                refreshing.discard(key)
+                return entries[key]
+
+        def _refresh_bg(key, args, kwargs):
+            with lock:
+                if key in refreshing:
+                    return
+                refreshing.add(key)
+            threading.Thread(target=_compute, args=(key, args, kwargs), daemon=True).start()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            entry = entries.get(key)
+            now = time.time()
+
+            if entry is None or (not entry["good"] and now - entry["ts"] >= NEGATIVE_TTL):
+                entry = _compute(key, args, kwargs)
+            elif entry["good"] and now - entry["ts"] >= ttl:
+                _refresh_bg(key, args, kwargs)
+
+            if entry["exc"] is not None:
+                raise entry["exc"]
+            return _copy(entry["value"])
+
+        def fetched_at(*args, **kwargs):
+            entry = entries.get(_make_key(args, kwargs))
+            if entry is None or not entry["good"]:
+                return None
+            return pd.Timestamp(entry["ts"], unit="s")
+
+        def last_error(*args, **kwargs):
+            entry = entries.get(_make_key(args, kwargs))
+            return None if entry is None else entry["error"]
+
+        def clear():
+            with lock:
+                entries.clear()
+
+        wrapper.fetched_at = fetched_at
+        wrapper.last_error = last_error
+        wrapper.clear = clear
+        return wrapper
+
+    return deco
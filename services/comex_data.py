@@ -1,13 +1,13 @@
 import io
 import pandas as pd
-import requests
 import streamlit as st
 
+from services import http_cache
+
 # ✅ Este es el CSV FINAL (el que subiste)
 URL_ICA = "https://infra.datos.gob.ar/catalog/sspm/dataset/74/distribution/74.3/download/intercambio-comercial-argentino-mensual.csv"
 
 HEADERS = {
-    "User-Agent": "monitor-ceu-uia/1.0 (+streamlit; requests)",
     "Accept": "text/csv,application/octet-stream,*/*;q=0.8",
 }
 
@@ -41,11 +41,13 @@ RENAME = {
 
 @st.cache_data(ttl=60 * 60 * 6, show_spinner=False)
 def fetch_ica() -> pd.DataFrame:
-    r = requests.get(URL_ICA, headers=HEADERS, timeout=60)
-    r.raise_for_status()
+    # 304 / sin cambios => reutiliza el DataFrame ya parseado
+    return http_cache.load_static(URL_ICA, _parse_ica_csv, profile="datos_gob_files", headers=HEADERS)
+
 
+def _parse_ica_csv(raw: bytes) -> pd.DataFrame:
     # bytes -> pandas (más robusto)
-    df = pd.read_csv(io.BytesIO(r.content))
+    df = pd.read_csv(io.BytesIO(raw))
 
     # fecha
     df = df.rename(columns={"indice_tiempo": "fecha"})
@@ -0,0 +1,264 @@
+# ============================================================
+# Lectura de Excel con motor intercambiable (un solo lugar para cambiarlo)
+#   - calamine (python-calamine, lector nativo) si está instalado y
+#     pandas lo soporta (>= 2.2)
+#   - si no: openpyxl para .xlsx/.xlsm, xlrd para .xls (OLE2)
+#   - CEU_EXCEL_ENGINE=calamine|openpyxl|xlrd fuerza el motor
+#   - si calamine no puede con un archivo se reintenta con el motor clásico
+#   - parse_sheets: hojas independientes de un mismo workbook en un pool de
+#     procesos, apagado por defecto (CEU_EXCEL_WORKERS=N lo prende); cada hoja
+#     vuelve como una matriz float64 + las pocas celdas de texto, no como
+#     DataFrame de objetos
+# Benchmark sobre los workbooks reales: scripts/bench_excel.py (--pool compara
+# parse_sheets secuencial vs pool; con 2 hojas chicas como el IPI el arranque
+# de los procesos no se recupera)
+# ============================================================
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import numpy as np
+import openpyxl
+import pandas as pd
+
+try:
+    import python_calamine
+
+    _HAS_CALAMINE = True
+except Exception:
+    python_calamine = None
+    _HAS_CALAMINE = False
+
+
+_PANDAS_CALAMINE = tuple(int(x) for x in pd.__version__.split(".")[:2]) >= (2, 2)
+FORCED_ENGINE = os.environ.get("CEU_EXCEL_ENGINE") or None
+EXCEL_WORKERS = int(os.environ.get("CEU_EXCEL_WORKERS", "0"))  # <=1: sin pool
+EXCEL_POOL_TIMEOUT = float(os.environ.get("CEU_EXCEL_POOL_TIMEOUT", "60"))  # seg por hoja
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0"  # .xls (BIFF); .xlsx es un zip (PK..)
+
+
+def _head(src) -> bytes:
+    if isinstance(src, (bytes, bytearray)):
+        return bytes(src[:8])
+    with open(src, "rb") as f:
+        return f.read(8)
+
+
+def _source(src):
+    # bytes -> BytesIO nuevo en cada lectura (pandas/openpyxl mueven el cursor)
+    if isinstance(src, (bytes, bytearray)):
+        return BytesIO(src)
+    return src
+
+
+def available_engines() -> list[str]:
+    out = ["openpyxl", "xlrd"]
+    if _HAS_CALAMINE and _PANDAS_CALAMINE:
+        out.insert(0, "calamine")
+    return out
+
+
+def classic_engine(src) -> str:
+    """openpyxl / xlrd según el formato real (no la extensión)."""
+    return "xlrd" if _head(src).startswith(OLE2_MAGIC) else "openpyxl"
+
+
+def engine_for(src) -> str:
+    if FORCED_ENGINE:
+        return FORCED_ENGINE
+    if _HAS_CALAMINE and _PANDAS_CALAMINE:
+        return "calamine"
+    return classic_engine(src)
+
+
+def read_excel(src, sheet_name=0, engine: str | None = None, **kwargs):
+    """
+    pd.read_excel(src, ...) con el motor de engine_for. src: bytes o ruta.
+    Mismo contrato que pandas (sheet_name lista/None => dict de DataFrames).
+    """
+    eng = engine or engine_for(src)
+    try:
+        return pd.read_excel(_source(src), sheet_name=sheet_name, engine=eng, **kwargs)
+    except Exception:
+        fallback = classic_engine(src)
+        if engine is not None or eng == fallback:
+            raise
+        return pd.read_excel(_source(src), sheet_name=sheet_name, engine=fallback, **kwargs)
+
+
+def open_workbook(src, engine: str | None = None) -> pd.ExcelFile:
+    """
+    pd.ExcelFile abierto una vez para leer varias hojas con .parse(...)
+    sin volver a descomprimir/indexar el archivo por hoja.
+    """
+    eng = engine or engine_for(src)
+    try:
+        return pd.ExcelFile(_source(src), engine=eng)
+    except Exception:
+        fallback = classic_engine(src)
+        if engine is not None or eng == fallback:
+            raise
+        return pd.ExcelFile(_source(src), engine=fallback)
+
+
+def iter_rows(src, sheet: str, engine: str | None = None):
+    """
+    Filas de una hoja como tuplas de valores (celda vacía => None), en streaming:
+    calamine.iter_rows o openpyxl read_only. Calamine puede recortar filas/columnas
+    vacías del borde: ubicar el header por contenido, no por número de fila.
+    """
+    eng = engine or engine_for(src)
+
+    if eng == "calamine" and _HAS_CALAMINE:
+        if isinstance(src, (bytes, bytearray)):
+            wb = python_calamine.CalamineWorkbook.from_filelike(BytesIO(src))
+        else:
+            wb = python_calamine.CalamineWorkbook.from_path(str(src))
+        for row in wb.get_sheet_by_name(sheet).iter_rows():
+            yield tuple(None if v == "" else v for v in row)
+        return
+
+    if eng == "xlrd":
+        df = pd.read_excel(_source(src), sheet_name=sheet, header=None, engine="xlrd")
+        for row in df.itertuples(index=False, name=None):
+            yield tuple(None if pd.isna(v) else v for v in row)
+        return
+
+    wb = openpyxl.load_workbook(_source(src), read_only=True, data_only=True)
+    try:
+        yield from wb[sheet].iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+# ============================================================
+# Varias hojas en paralelo (procesos)
+# ============================================================
+def _is_number(v) -> bool:
+    return isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, (bool, np.bool_))
+
+
+def _pack_sheet(df: pd.DataFrame) -> dict:
+    """
+    DataFrame -> matriz float64 (Fortran) con los números + lista (fila, col, valor)
+    con el resto (texto, fechas sueltas). Columnas datetime64 viajan como int64
+    (ns) + su dtype original (pandas >= 3 lee Excel en datetime64[us]).
+    """
+    n, m = df.shape
+    values = np.full((n, m), np.nan, order="F")
+    text, obj_cols, int_cols, dt_cols = [], [], [], {}
+
+    for j in range(m):
+        col = df.iloc[:, j]
+        if pd.api.types.is_datetime64_any_dtype(col.dtype):
+            dt_cols[j] = (col.to_numpy(dtype="datetime64[ns]").view("int64"), col.dtype)
+            continue
+        if pd.api.types.is_numeric_dtype(col.dtype) and not pd.api.types.is_bool_dtype(col.dtype):
+            values[:, j] = col.to_numpy(dtype="float64", na_value=np.nan)
+            if pd.api.types.is_integer_dtype(col.dtype):
+                int_cols.append(j)
+            continue
+
+        obj_cols.append(j)
+        for i, v in enumerate(col.to_numpy(dtype=object)):
+            if v is None or v is pd.NaT or (isinstance(v, float) and v != v):
+                continue
+            if _is_number(v):
+                values[i, j] = v
+            else:
+                text.append((i, j, v))
+
+    return {
+        "values": values,
+        "text": text,
+        "columns": list(df.columns),
+        "index": df.index,
+        "obj_cols": obj_cols,
+        "int_cols": int_cols,
+        "dt_cols": dt_cols,
+    }
+
+
+def _unpack_sheet(p: dict) -> pd.DataFrame:
+    values = p["values"]
+    df = pd.DataFrame(values, index=p["index"], columns=p["columns"])
+
+    for j in p["int_cols"]:
+        df.isetitem(j, values[:, j].astype("int64"))
+
+    for j, (ns, dtype) in p["dt_cols"].items():
+        dt = pd.Series(ns.view("datetime64[ns]"), index=df.index)
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            dt = dt.dt.tz_localize("UTC")
+        df.isetitem(j, dt.astype(dtype))
+
+    by_col: dict[int, list] = {}
+    for i, j, v in p["text"]:
+        by_col.setdefault(j, []).append((i, v))
+
+    for j in p["obj_cols"]:
+        # mismo criterio que los lectores de pandas: enteros exactos => int
+        col = values[:, j].astype(object)
+        finite = np.isfinite(values[:, j])
+        whole = finite & (np.mod(values[:, j], 1.0, where=finite, out=np.ones(len(col))) == 0)
+        col[whole] = values[whole, j].astype("int64").astype(object)
+        for i, v in by_col.get(j, ()):
+            col[i] = v
+        df.isetitem(j, col)
+
+    return df
+
+
+def _parse_sheet_packed(raw: bytes, sheet, kwargs: dict, engine: str | None) -> dict:
+    # corre en el worker: parsea y devuelve solo arrays compactos
+    return _pack_sheet(read_excel(raw, sheet_name=sheet, engine=engine, **kwargs))
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # forkserver: los workers no heredan los hilos del server de Streamlit
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            ctx = multiprocessing.get_context(method)
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+        return _POOL
+
+
+def _reset_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_sheets(raw: bytes, sheets: dict, engine: str | None = None) -> dict[str, pd.DataFrame]:
+    """
+    {hoja: kwargs de read_excel} -> {hoja: DataFrame}, una hoja por proceso
+    (a lo sumo min(hojas, CEU_EXCEL_WORKERS) procesos).
+    Con una sola hoja, CEU_EXCEL_WORKERS<=1 (default), si el pool falla o si
+    una hoja tarda más de EXCEL_POOL_TIMEOUT, lee en este proceso con
+    open_workbook (mismo resultado).
+    """
+    if len(sheets) > 1 and EXCEL_WORKERS > 1:
+        try:
+            pool = _get_pool(min(len(sheets), EXCEL_WORKERS))
+            futs = {
+                name: pool.submit(_parse_sheet_packed, raw, name, kw, engine)
+                for name, kw in sheets.items()
+            }
+            return {name: _unpack_sheet(f.result(timeout=EXCEL_POOL_TIMEOUT)) for name, f in futs.items()}
+        except (TimeoutError, OSError, RuntimeError, multiprocessing.ProcessError):
+            # BrokenProcessPool es RuntimeError; sin procesos (sandbox) o worker
+            # colgado => pool nuevo la próxima vez y secuencial ahora
+            _reset_pool()
+
+    xls = open_workbook(raw, engine=engine)
+    return {name: xls.parse(name, **kw) for name, kw in sheets.items()}
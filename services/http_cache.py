@@ -0,0 +1,198 @@
+# ============================================================
+# Cache en disco con GET condicional para archivos estáticos
+# (xlsx/csv/xls que cambian ~1 vez por mes)
+#   - guarda bytes + ETag/Last-Modified (+ sha1 del body) en CACHE_DIR/http
+#   - revalida con If-None-Match / If-Modified-Since
+#   - 304 (o mismos bytes) => reutiliza el DataFrame ya parseado
+#   - con CEU_SHARED_CACHE las réplicas comparten los bytes (services.shared_cache)
+#   - si la red falla y hay copia se sirve la copia y queda anotado (stale_error)
+# ============================================================
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from services import http_client, shared_cache
+from services.cache import singleflight
+from services.series_store import CACHE_DIR
+
+
+HTTP_CACHE_DIR = CACHE_DIR / "http"
+SHARED_STATIC_TTL = 60 * 60  # seg que una réplica reutiliza lo que bajó otra
+PARSED_MAX_ENTRIES = 16  # parseos recordados (LRU); los loaders ya cachean arriba
+
+# (url, parser) -> (validator, parsed), el más reciente al final
+_PARSED: OrderedDict[tuple[str, str], tuple[str, object]] = OrderedDict()
+# url -> error de red con el que se sirvió la copia en disco
+_STALE: dict[str, str] = {}
+_LOCK = threading.Lock()
+
+
+def _paths(url: str):
+    h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return HTTP_CACHE_DIR / f"{h}.bin", HTTP_CACHE_DIR / f"{h}.json"
+
+
+def _read_meta(meta_path) -> dict:
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _read_cached(url: str) -> tuple[bytes | None, dict]:
+    """
+    (bytes, meta) de la copia en disco, o (None, {}) si falta o no es un par
+    consistente: body y meta se reemplazan por separado y otro proceso pudo
+    dejar un body nuevo con el meta viejo (meta["sha1"] no coincide).
+    """
+    body_path, meta_path = _paths(url)
+    meta = _read_meta(meta_path)
+    if not meta.get("sha1"):
+        return None, {}
+    try:
+        body = body_path.read_bytes()
+    except OSError:
+        return None, {}
+    if hashlib.sha1(body).hexdigest() != meta["sha1"]:
+        return None, {}
+    return body, meta
+
+
+def _write_atomic(path, data: bytes) -> None:
+    # tmp único por escritor: réplicas con el mismo HTTP_CACHE_DIR no se pisan
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
+        raise
+
+
+class _StaleCopy(Exception):
+    """La red falló y se sirve la copia en disco: no se guarda en el cache compartido."""
+
+    def __init__(self, value, error: str):
+        super().__init__(error)
+        self.value = value
+        self.error = error
+
+
+@singleflight
+def fetch_static(url: str, profile: str = "default", headers: dict | None = None) -> tuple[bytes, str]:
+    """
+    Devuelve (bytes, validator). validator identifica la versión del archivo
+    (ETag, Last-Modified o sha1 del contenido) y sirve como clave del parseo.
+
+    Si hay copia en disco manda los headers condicionales; con 304 devuelve
+    la copia. Si la red falla y hay copia, también la devuelve (stale).
+    Con cache compartido activo, una sola réplica revalida por SHARED_STATIC_TTL;
+    una copia stale no se comparte (cada réplica reintenta y anota su stale_error).
+    """
+    try:
+        value = shared_cache.get_or_compute(
+            f"static:{url}",
+            SHARED_STATIC_TTL,
+            lambda: _fetch_static_http(url, profile=profile, headers=headers),
+        )
+    except _StaleCopy as e:
+        _STALE[url] = e.error
+        return e.value
+
+    _STALE.pop(url, None)
+    return value
+
+
+def _fetch_static_http(url: str, profile: str = "default", headers: dict | None = None) -> tuple[bytes, str]:
+    body_path, meta_path = _paths(url)
+    body, meta = _read_cached(url)
+
+    req_headers = dict(headers or {})
+    if meta.get("etag"):
+        req_headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        req_headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        r = http_client.get(url, profile=profile, headers=req_headers)
+        if r.status_code == 304 and meta:
+            return body, meta["validator"]
+        r.raise_for_status()
+    except Exception as e:
+        if meta:
+            raise _StaleCopy((body, meta["validator"]), f"{type(e).__name__}: {e}") from e
+        raise
+
+    content = r.content
+    etag = r.headers.get("ETag")
+    last_modified = r.headers.get("Last-Modified")
+    validator = etag or last_modified or hashlib.sha1(content).hexdigest()
+
+    try:
+        HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # body primero: un lector que vea el meta nuevo ya tiene su body; el
+        # caso inverso lo descarta _read_cached por sha1
+        _write_atomic(body_path, content)
+        new_meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "validator": validator,
+            "sha1": hashlib.sha1(content).hexdigest(),
+        }
+        _write_atomic(meta_path, json.dumps(new_meta).encode("utf-8"))
+    except OSError:
+        # disco de solo lectura: seguimos sin cache persistente
+        pass
+
+    return content, validator
+
+
+def stale_error(url: str) -> str | None:
+    """Error de red si la última lectura de url salió de la copia en disco; si no, None."""
+    return _STALE.get(url)
+
+
+def _copy_parsed(value):
+    # mismo contrato que st.cache_data: el llamador puede mutar lo que recibe
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy_parsed(v) for v in value)
+    if isinstance(value, dict):
+        return {k: _copy_parsed(v) for k, v in value.items()}
+    return value
+
+
+def load_static(url: str, parse, profile: str = "default", headers: dict | None = None):
+    """
+    fetch_static + parse(bytes). Si el archivo no cambió (304 o mismo validator)
+    reutiliza el parseo sin volver a leer el Excel/CSV (LRU de PARSED_MAX_ENTRIES).
+    Devuelve una copia: el parseo guardado no se comparte con el llamador.
+    """
+    content, validator = fetch_static(url, profile=profile, headers=headers)
+
+    key = (url, f"{parse.__module__}.{parse.__qualname__}")
+    with _LOCK:
+        hit = _PARSED.get(key)
+        if hit is not None and hit[0] == validator:
+            _PARSED.move_to_end(key)
+    if hit is not None and hit[0] == validator:
+        return _copy_parsed(hit[1])
+
+    parsed = parse(content)
+    with _LOCK:
+        _PARSED[key] = (validator, parsed)
+        _PARSED.move_to_end(key)
+        while len(_PARSED) > PARSED_MAX_ENTRIES:
+            _PARSED.popitem(last=False)
+    return _copy_parsed(parsed)
@@ -0,0 +1,167 @@
+# ============================================================
+# Cliente HTTP compartido por todos los services
+#   - una requests.Session por perfil (keep-alive + pool por host)
+#   - gzip/deflate negociado siempre
+#   - reintentos con backoff en 429/5xx (respeta Retry-After)
+#   - timeouts (connect, read) por fuente en PROFILES
+#   - circuit breaker por host: tras BREAKER_FAILURES fallas seguidas el host
+#     queda "no disponible" BREAKER_COOLDOWN seg y se falla al instante
+# ============================================================
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": "monitor-ceu-uia/1.0 (streamlit)",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# timeout=(connect, read) en segundos; retries = reintentos del adapter
+PROFILES = {
+    "default": {"timeout": (5, 30), "retries": 2},
+    # la API de Monetarias ya reintenta por página (macro_data)
+    "bcra_api": {"timeout": (5, 20), "retries": 0},
+    "bcra_files": {"timeout": (5, 60), "retries": 2},
+    "indec": {"timeout": (5, 60), "retries": 2},
+    "datos_gob": {"timeout": (5, 30), "retries": 2},
+    # CSV completos de infra.datos.gob.ar (ICA): lectura más larga que la API
+    "datos_gob_files": {"timeout": (5, 60), "retries": 2},
+    "rss": {"timeout": (3, 10), "retries": 1},
+}
+
+POOL_CONNECTIONS = 8  # hosts con pool propio por sesión
+POOL_MAXSIZE = 16  # conexiones vivas por host
+
+BREAKER_FAILURES = 3  # fallas seguidas (timeout / conexión / 5xx / 429) para abrir
+BREAKER_COOLDOWN = 60  # seg que el host queda cortado antes de volver a probar
+
+_SESSIONS: dict[str, requests.Session] = {}
+_LOCK = threading.Lock()
+
+# host -> {"failures": int, "open_until": float, "probing": bool}
+_BREAKERS: dict[str, dict] = {}
+_BREAKER_LOCK = threading.Lock()
+
+
+class SourceUnavailable(requests.exceptions.ConnectionError):
+    """El host tiene el circuito abierto: no se hizo el request."""
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def _breaker_before(host: str) -> None:
+    with _BREAKER_LOCK:
+        b = _BREAKERS.get(host)
+        if b is None or b["failures"] < BREAKER_FAILURES:
+            return
+
+        now = time.monotonic()
+        if now < b["open_until"] or b["probing"]:
+            raise SourceUnavailable(f"{host} no disponible (circuito abierto)")
+
+        # half-open: dejamos pasar un solo request de prueba
+        b["probing"] = True
+
+
+def _breaker_after(host: str, ok: bool) -> None:
+    with _BREAKER_LOCK:
+        if ok:
+            _BREAKERS.pop(host, None)
+            return
+
+        b = _BREAKERS.setdefault(host, {"failures": 0, "open_until": 0.0, "probing": False})
+        b["failures"] += 1
+        b["probing"] = False
+        if b["failures"] >= BREAKER_FAILURES:
+            b["open_until"] = time.monotonic() + BREAKER_COOLDOWN
+
+
+def _breaker_release(host: str) -> None:
+    with _BREAKER_LOCK:
+        b = _BREAKERS.get(host)
+        if b is not None:
+            b["probing"] = False
+
+
+def is_available(url_or_host: str) -> bool:
+    """False si el host tiene el circuito abierto (para elegir fallback sin esperar)."""
+    host = _host(url_or_host) if "://" in url_or_host else url_or_host.lower()
+    with _BREAKER_LOCK:
+        b = _BREAKERS.get(host)
+        return b is None or b["failures"] < BREAKER_FAILURES or time.monotonic() >= b["open_until"]
+
+
+def _build_session(retries: int) -> requests.Session:
+    s = requests.Session()
+    s.headers.update(DEFAULT_HEADERS)
+
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def get_session(profile: str = "default") -> requests.Session:
+    sess = _SESSIONS.get(profile)
+    if sess is not None:
+        return sess
+
+    with _LOCK:
+        sess = _SESSIONS.get(profile)
+        if sess is None:
+            cfg = PROFILES.get(profile, PROFILES["default"])
+            sess = _build_session(cfg["retries"])
+            _SESSIONS[profile] = sess
+        return sess
+
+
+def get(url: str, profile: str = "default", timeout=None, **kwargs) -> requests.Response:
+    """
+    GET con la sesión del perfil. No llama raise_for_status (cada service
+    decide cómo tratar status != 200).
+    Con el circuito del host abierto lanza SourceUnavailable sin tocar la red.
+    """
+    cfg = PROFILES.get(profile, PROFILES["default"])
+    host = _host(url)
+    _breaker_before(host)
+
+    try:
+        r = get_session(profile).get(url, timeout=timeout or cfg["timeout"], **kwargs)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        _breaker_after(host, ok=False)
+        raise
+    except Exception:
+        # error nuestro (URL inválida, etc.): no dice nada del host, el conteo
+        # de fallas queda como estaba (solo se libera la prueba half-open)
+        _breaker_release(host)
+        raise
+
+    _breaker_after(host, ok=r.status_code not in RETRY_STATUS)
+    return r
+
+
+def get_bytes(url: str, profile: str = "default", **kwargs) -> bytes:
+    """GET + raise_for_status; devuelve el cuerpo ya descomprimido."""
+    r = get(url, profile=profile, **kwargs)
+    r.raise_for_status()
+    return r.content
@@ -1,43 +1,45 @@
-from io import BytesIO
-
 import pandas as pd
-import requests
 import streamlit as st
 
+from services import excel_io, http_cache
+
+
+IPI_XLS_URL = "https://www.indec.gob.ar/ftp/cuadros/economia/sh_ipi_manufacturero_2026.xls"
+
+IPI_HEADERS = {
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "application/vnd.ms-excel,application/octet-stream,*/*",
+    "Referer": "https://www.indec.gob.ar/",
+}
+
+
+class IpiHtmlError(ValueError):
+    """INDEC devolvió HTML (bloqueo/proxy) en lugar del .xls."""
+
+
+def _parse_ipi_xls(raw: bytes):
+    # Si por algún motivo te devuelven HTML (bloqueo/proxy), no es un Excel
+    head = raw[:200].lstrip().lower()
+    if head.startswith(b"<!doctype html") or head.startswith(b"<html"):
+        raise IpiHtmlError("IPI: INDEC devolvió HTML en lugar de un .xls.")
+
+    # .xls -> calamine si está, si no xlrd (asegurate de tener xlrd>=2.0 en requirements)
+    # las dos hojas en paralelo (procesos) con excel_io.parse_sheets
+    frames = excel_io.parse_sheets(raw, {"Cuadro 2": {"header": None}, "Cuadro 5": {"header": None}})
+
+    return frames["Cuadro 2"], frames["Cuadro 5"]
+
 
 @st.cache_data(ttl=3600)
 def cargar_ipi_excel():
     """Descarga y lee el Excel del IPI Manufacturero (INDEC) .xls"""
-    url = "https://www.indec.gob.ar/ftp/cuadros/economia/sh_ipi_manufacturero_2026.xls"
-
-    headers = {
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "application/vnd.ms-excel,application/octet-stream,*/*",
-        "Referer": "https://www.indec.gob.ar/",
-    }
-
     try:
-        r = requests.get(url, timeout=60, headers=headers)
-        # Si INDEC responde 403/404/etc
-        r.raise_for_status()
-
-        # Si por algún motivo te devuelven HTML (bloqueo/proxy), no es un Excel
-        head = r.content[:200].lstrip().lower()
-        if head.startswith(b"<!doctype html") or head.startswith(b"<html"):
-            st.error(
-                "IPI: INDEC devolvió HTML en lugar de un .xls. "
-                f"Status={r.status_code} Content-Type={r.headers.get('Content-Type')}"
-            )
-            return None, None
-
-        xls = BytesIO(r.content)
-
-        # .xls -> xlrd (asegurate de tener xlrd>=2.0 en requirements)
-        df_c2 = pd.read_excel(xls, sheet_name="Cuadro 2", header=None, engine="xlrd")
-        xls.seek(0)
-        df_c5 = pd.read_excel(xls, sheet_name="Cuadro 5", header=None, engine="xlrd")
-
-        return df_c2, df_c5
+        # GET condicional: si el .xls no cambió no se vuelve a parsear
+        return http_cache.load_static(IPI_XLS_URL, _parse_ipi_xls, profile="indec", headers=IPI_HEADERS)
+
+    except IpiHtmlError as e:
+        st.error(str(e))
+        return None, None
 
     except Exception as e:
         st.error(f"IPI: error descargando/leyendo Excel ({type(e).__name__}): {e}")
@@ -1,71 +1,194 @@
+import threading
+import time
+
 import numpy as np
 import pandas as pd
 import requests
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from io import StringIO
 
+from services import excel_io, http_cache, http_client
+from services.cache import swr_cache
+from services.shared_cache import shared_cached
+from services.series_store import (
+    batches_by_last_date,
+    last_date,
+    load_series,
+    merge_series,
+    save_series,
+    series_changed,
+)
+
 
 # ============================================================
 # Helper genérico (BCRA Monetarias) — PAGINADO ROBUSTO
 # ============================================================
-@st.cache_data(ttl=60 * 60)
-def get_monetaria_serie(id_variable: int) -> pd.DataFrame:
+BCRA_MONETARIAS_URL = "https://api.bcra.gob.ar/estadisticas/v4.0/Monetarias/{id_variable}"
+BCRA_PAGE_LIMIT = 1000
+BCRA_MAX_WORKERS = 4
+BCRA_PAGE_RETRIES = 3  # intentos por página
+BCRA_MAX_ATTEMPTS = 12  # tope de requests fallidos por serie (todas las páginas)
+BCRA_RETRY_BACKOFF = 0.5  # seg; se duplica en cada reintento de la misma página
+BCRA_SYNC_OVERLAP_DAYS = 10  # ventana que se vuelve a pedir para captar revisiones
+BCRA_STORE_NS = "bcra_monetarias"
+BCRA_DEGRADED_TTL = 2 * 60  # seg que se recuerda un resultado degradado ("stale"/"error"/"partial")
+BCRA_DEGRADED_STATUS = ("stale", "error", "partial")
+
+
+class _AttemptBudget:
+    """Contador thread-safe de intentos fallidos compartido entre páginas."""
+
+    def __init__(self, max_failures: int):
+        self.left = max_failures
+        self._lock = threading.Lock()
+
+    def spend(self) -> bool:
+        with self._lock:
+            self.left -= 1
+            return self.left > 0
+
+
+def _get_monetaria_page(url: str, offset: int, desde: str | None = None) -> tuple[list, int | None]:
     """
-    Descarga series del endpoint Monetarias/{id_variable}.
-    Devuelve columnas: Date, value
-    Paginación robusta:
-      - Si metadata.count existe: usa count.
-      - Si no existe: corta cuando la página viene “corta” (< Limit).
+    Baja una página de Monetarias/{id} (opcionalmente solo fechas >= desde).
+    Devuelve (detalle, count) — count es None si el BCRA no lo informa.
     """
-    url = f"https://api.bcra.gob.ar/estadisticas/v4.0/Monetarias/{id_variable}"
-    params = {"Limit": 1000, "Offset": 0}
-    data = []
-    last_err = None
+    params = {"Limit": BCRA_PAGE_LIMIT, "Offset": offset}
+    if desde:
+        params["Desde"] = desde
 
-    for _ in range(3):
-        try:
-            params["Offset"] = 0
-            data = []
+    r = http_client.get(url, profile="bcra_api", params=params, verify=False)
+    r.raise_for_status()
+    payload = r.json()
 
-            while True:
-                r = requests.get(url, params=params, timeout=20, verify=False)
-                r.raise_for_status()
-                payload = r.json()
+    results = payload.get("results", [])
+    detalle = (results[0].get("detalle", []) if results else []) or []
 
-                results = payload.get("results", [])
-                if not results:
-                    break
+    meta = payload.get("metadata", {}).get("resultset", {}) or {}
+    return detalle, meta.get("count")
 
-                detalle = results[0].get("detalle", [])
-                if not detalle:
-                    break
 
-                data.extend(detalle)
+def _get_monetaria_page_retry(
+    url: str, offset: int, budget: _AttemptBudget, desde: str | None = None
+) -> tuple[list, int | None]:
+    """
+    Igual que _get_monetaria_page pero reintenta ESA página con backoff.
+    Si se agotan los intentos (de la página o del presupuesto total) re-lanza el error.
+    """
+    wait = BCRA_RETRY_BACKOFF
+    for attempt in range(BCRA_PAGE_RETRIES):
+        try:
+            return _get_monetaria_page(url, offset, desde=desde)
+        except http_client.SourceUnavailable:
+            # circuito abierto: no tiene sentido esperar
+            raise
+        except requests.exceptions.RequestException:
+            if attempt == BCRA_PAGE_RETRIES - 1 or not budget.spend():
+                raise
+            time.sleep(wait)
+            wait *= 2
+
+
+def _get_monetaria_detalle(
+    url: str, parallel: bool, desde: str | None = None
+) -> tuple[list, list[int], str | None]:
+    """
+    Primera página secuencial; si viene count y parallel=True, el resto de los
+    offsets se piden en paralelo (pool acotado) y se reensamblan en orden.
+    Sin count: corta cuando la página viene “corta” (< Limit).
 
-                meta = payload.get("metadata", {}).get("resultset", {}) or {}
-                count = meta.get("count")
+    Cada página se reintenta por separado: las que ya bajaron se conservan.
+    Devuelve (data, offsets_faltantes, ultimo_error).
+    """
+    budget = _AttemptBudget(BCRA_MAX_ATTEMPTS)
 
-                params["Offset"] += params["Limit"]
+    try:
+        detalle, count = _get_monetaria_page_retry(url, 0, budget, desde=desde)
+    except requests.exceptions.RequestException as e:
+        return [], [0], str(e)
+
+    if not detalle:
+        return [], [], None
 
-                if count is not None:
-                    # corte con count
-                    if params["Offset"] >= count:
-                        break
-                else:
-                    # corte por página corta
-                    if len(detalle) < params["Limit"]:
-                        break
+    data = list(detalle)
+    missing: list[int] = []
+    last_err = None
 
-            break  # ok
+    if count is not None:
+        offsets = list(range(BCRA_PAGE_LIMIT, int(count), BCRA_PAGE_LIMIT))
+        if not offsets:
+            return data, missing, last_err
+
+        def _page_or_error(off: int):
+            try:
+                return _get_monetaria_page_retry(url, off, budget, desde=desde)[0], None
+            except requests.exceptions.RequestException as e:
+                return None, str(e)
+
+        if parallel and len(offsets) > 1:
+            workers = min(BCRA_MAX_WORKERS, len(offsets))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                # map respeta el orden de offsets
+                pages = list(ex.map(_page_or_error, offsets))
+        else:
+            pages = [_page_or_error(off) for off in offsets]
+
+        for off, (page, err) in zip(offsets, pages):
+            if page is None:
+                missing.append(off)
+                last_err = err
+            else:
+                data.extend(page)
+        return data, missing, last_err
+
+    # corte por página corta
+    offset = 0
+    while len(detalle) >= BCRA_PAGE_LIMIT:
+        offset += BCRA_PAGE_LIMIT
+        try:
+            detalle, _ = _get_monetaria_page_retry(url, offset, budget, desde=desde)
         except requests.exceptions.RequestException as e:
+            # sin count no sabemos cuántas faltan: marcamos desde acá
+            missing.append(offset)
             last_err = str(e)
+            break
+        if not detalle:
+            break
+        data.extend(detalle)
+
+    return data, missing, last_err
+
+
+class _PartialDetalle(Exception):
+    """Descarga incompleta/fallida: se devuelve al llamador pero no se comparte entre réplicas."""
+
+    def __init__(self, value):
+        super().__init__("BCRA Monetarias: descarga incompleta")
+        self.value = value
+
+
+@shared_cached("bcra_serie", ttl=30 * 60)  # no-op salvo CEU_SHARED_CACHE
+def _get_monetaria_detalle_shared(url: str, parallel: bool, desde: str | None = None):
+    # se comparte la serie armada, no las páginas: page 0 (con su count) y el
+    # resto salen siempre de la misma descarga
+    out = _get_monetaria_detalle(url, parallel=parallel, desde=desde)
+    data, missing, last_err = out
+    if missing or last_err or not data:
+        raise _PartialDetalle(out)
+    return out
 
+
+def _monetaria_detalle(url: str, parallel: bool, desde: str | None = None) -> tuple[list, list[int], str | None]:
+    try:
+        return _get_monetaria_detalle_shared(url, parallel, desde=desde)
+    except _PartialDetalle as e:
+        return e.value
+
+
+def _monetaria_detalle_to_df(data: list) -> pd.DataFrame:
     if not data:
-        # No rompemos: devolvemos vacío (las páginas lo manejan),
-        # pero dejamos el error visible en la app (no en consola).
-        if last_err:
-            st.error(f"Error BCRA Monetarias/{id_variable}: {last_err}")
         return pd.DataFrame(columns=["Date", "value"])
 
     df = pd.DataFrame(data)
@@ -81,100 +204,414 @@ def get_monetaria_serie(id_variable: int) -> pd.DataFrame:
     )
 
 
+def sync_monetaria_serie(id_variable: int, parallel: bool = True, notify: bool = True) -> pd.DataFrame:
+    """
+    Sincroniza Monetarias/{id_variable} contra el store local (services.series_store).
+
+      - Sin store: descarga completa (paginada) y guarda.
+      - Con store: pide solo Desde = última fecha guardada - BCRA_SYNC_OVERLAP_DAYS
+        (normalmente 1 página) y lo mergea; en el solapamiento gana lo nuevo.
+      - Si el BCRA falla y hay store: devuelve lo guardado (status "stale").
+
+    Solo se persiste cuando la descarga vino completa.
+    Mismo contrato de salida y df.attrs["status"] que get_monetaria_serie.
+    Con notify=False no escribe en la app; el aviso queda en df.attrs["message"]
+    (para llamadas desde hilos, ver get_monetaria_many).
+    """
+    url = BCRA_MONETARIAS_URL.format(id_variable=id_variable)
+
+    stored = load_series(BCRA_STORE_NS, id_variable)
+    last = last_date(stored)
+    desde = None
+    if last is not None:
+        desde = (last - pd.Timedelta(days=BCRA_SYNC_OVERLAP_DAYS)).strftime("%Y-%m-%d")
+
+    data, missing, last_err = _monetaria_detalle(url, parallel=parallel, desde=desde)
+
+    if not data and last_err:
+        if stored is not None and not stored.empty:
+            out = stored[["Date", "value"]].copy()
+            out.attrs["status"] = "stale"
+            out.attrs["message"] = f"BCRA Monetarias/{id_variable}: uso copia local ({last_err})"
+        else:
+            # No rompemos: devolvemos vacío (las páginas lo manejan),
+            # pero dejamos el error visible en la app (no en consola).
+            out = pd.DataFrame(columns=["Date", "value"])
+            out.attrs["status"] = "error"
+            out.attrs["message"] = f"Error BCRA Monetarias/{id_variable}: {last_err}"
+        if notify:
+            _notify_monetaria(out)
+        return out
+
+    out = merge_series(stored, _monetaria_detalle_to_df(data))[["Date", "value"]]
+
+    if not missing and not out.empty:
+        save_series(BCRA_STORE_NS, id_variable, out)
+
+    out.attrs["status"] = "partial" if missing else "ok"
+    if missing:
+        out.attrs["missing_offsets"] = missing
+        out.attrs["message"] = (
+            f"BCRA Monetarias/{id_variable}: serie incompleta "
+            f"({len(missing)} página/s sin bajar). Último error: {last_err}"
+        )
+        if notify:
+            _notify_monetaria(out)
+    return out
+
+
+def _notify_monetaria(df: pd.DataFrame) -> None:
+    msg = df.attrs.get("message")
+    if not msg:
+        return
+    if df.attrs.get("status") == "error":
+        st.error(msg)
+    else:
+        st.warning(msg)
+
+
+class _SourceDown(Exception):
+    """
+    Resultado degradado (BCRA o datos.gob.ar caídos o a medias: status
+    "stale"/"error"/"partial").
+    Se lanza dentro de los loaders cacheados para que st.cache_data NO lo guarde
+    el TTL entero; afuera se devuelve el valor y se recuerda solo BCRA_DEGRADED_TTL.
+    """
+
+    def __init__(self, value):
+        super().__init__("fuente no disponible")
+        self.value = value
+
+
+_degraded: dict = {}  # clave -> (monotonic, valor)
+_degraded_lock = threading.Lock()
+
+
+def _copy_frames(value):
+    if isinstance(value, dict):
+        return {k: v.copy() for k, v in value.items()}
+    return value.copy()
+
+
+def _with_short_degraded(key, cached_fn, *args):
+    """cached_fn(*args) o, si la fuente está caída, el último resultado degradado por BCRA_DEGRADED_TTL."""
+    hit = _degraded.get(key)
+    if hit is not None and time.monotonic() - hit[0] < BCRA_DEGRADED_TTL:
+        return _copy_frames(hit[1])
+
+    try:
+        value = cached_fn(*args)
+    except _SourceDown as e:
+        with _degraded_lock:
+            _degraded[key] = (time.monotonic(), e.value)
+        return _copy_frames(e.value)
+
+    with _degraded_lock:
+        _degraded.pop(key, None)
+    return value
+
+
+@st.cache_data(ttl=60 * 60)
+def _monetaria_serie_cached(id_variable: int, parallel: bool) -> pd.DataFrame:
+    df = sync_monetaria_serie(id_variable, parallel=parallel, notify=False)
+    if df.attrs.get("status") in BCRA_DEGRADED_STATUS:
+        raise _SourceDown(df)
+    return df
+
+
+def get_monetaria_serie(id_variable: int, parallel: bool = True) -> pd.DataFrame:
+    """
+    Descarga series del endpoint Monetarias/{id_variable}.
+    Devuelve columnas: Date, value
+    Paginación robusta:
+      - Si metadata.count existe: usa count (y con parallel=True baja el resto
+        de las páginas en paralelo con BCRA_MAX_WORKERS hilos).
+      - Si no existe: corta cuando la página viene “corta” (< Limit).
+    Reintentos por página (BCRA_PAGE_RETRIES, con backoff) y tope total
+    BCRA_MAX_ATTEMPTS: un error no descarta lo que ya se bajó.
+    Incremental: ver sync_monetaria_serie (al expirar el TTL solo baja lo nuevo).
+    Cache: 1 h para "ok"; "partial"/"stale"/"error" solo BCRA_DEGRADED_TTL
+    (una serie incompleta se vuelve a pedir enseguida, no dentro de una hora).
+
+    df.attrs["status"] queda en:
+      - "ok": serie completa (o el BCRA devolvió vacío sin error)
+      - "partial": faltan páginas (df.attrs["missing_offsets"])
+      - "stale": el BCRA falló y se devolvió la copia local
+      - "error": no se pudo bajar nada
+    """
+    df = _with_short_degraded(("serie", id_variable, parallel), _monetaria_serie_cached, id_variable, parallel)
+    _notify_monetaria(df)
+    return df
+
+
+@st.cache_data(ttl=60 * 60)
+def _monetaria_many_cached(ids: tuple[int, ...]) -> dict[int, pd.DataFrame]:
+    with ThreadPoolExecutor(max_workers=min(BCRA_MAX_WORKERS, len(ids))) as ex:
+        frames = dict(zip(ids, ex.map(lambda i: sync_monetaria_serie(i, notify=False), ids)))
+    if any(df.attrs.get("status") in BCRA_DEGRADED_STATUS for df in frames.values()):
+        raise _SourceDown(frames)
+    return frames
+
+
+def get_monetaria_many(ids: tuple[int, ...] | list[int]) -> dict[int, pd.DataFrame]:
+    """
+    Baja varias series Monetarias en paralelo (una por hilo, misma sesión de
+    services.http_client) y las cachea como una sola unidad.
+    Devuelve {id_variable: DataFrame(Date, value)} con el mismo contrato
+    (incluido df.attrs["status"] y el TTL corto sin fuente) que get_monetaria_serie.
+    La latencia queda en la serie más lenta, no en la suma.
+    """
+    ids = tuple(dict.fromkeys(int(i) for i in ids))
+    if not ids:
+        return {}
+
+    frames = _with_short_degraded(("many", ids), _monetaria_many_cached, ids)
+
+    # avisos desde el hilo principal (los hilos del pool no tienen contexto de Streamlit)
+    for df in frames.values():
+        _notify_monetaria(df)
+
+    return frames
+
+
 # ============================================================
 # TC mayorista (A3500)
 # ============================================================
-@st.cache_data(ttl=60 * 60)
 def get_a3500() -> pd.DataFrame:
     """
     A3500: intentamos id=5 (como venías usando).
     Si no trae nada (por cambios del BCRA / entorno), fallback a 84.
-    Devuelve columnas: Date, FX
+    Devuelve columnas: Date, FX (vacío sin cachear si el BCRA no trajo nada)
     """
+    try:
+        return _a3500_cached()
+    except _SourceDown as e:
+        return e.value
+
+
+@st.cache_data(ttl=60 * 60)
+def _a3500_cached() -> pd.DataFrame:
     df = get_monetaria_serie(5)
 
     # fallback típico que suele ser A3500 en muchos códigos
+    # (con el BCRA caído el circuito ya está abierto: falla al instante)
     if df.empty:
         df = get_monetaria_serie(84)
 
     if df.empty:
-        return pd.DataFrame(columns=["Date", "FX"])
+        raise _SourceDown(pd.DataFrame(columns=["Date", "FX"]))
 
     out = df.rename(columns={"value": "FX"}).copy()
     out["Date"] = pd.to_datetime(out["Date"], errors="coerce")
     out["FX"] = pd.to_numeric(out["FX"], errors="coerce")
 
-    return (
+    out = (
         out[["Date", "FX"]]
         .dropna()
         .drop_duplicates(subset=["Date"])
         .sort_values("Date")
         .reset_index(drop=True)
     )
+    out.attrs["status"] = df.attrs.get("status", "ok")
+    if out.attrs["status"] in BCRA_DEGRADED_STATUS:
+        raise _SourceDown(out)  # copia local: se sirve, pero no se cachea la hora
+    return out
 
 
 # ============================================================
 # REM
 # ============================================================
-@st.cache_data(ttl=60 * 60)
-def get_rem_last() -> pd.DataFrame:
-    url = (
-        "https://www.bcra.gob.ar/archivos/Pdfs/PublicacionesEstadisticas/"
-        "historico-relevamiento-expectativas-mercado.xlsx"
+REM_XLSX_URL = (
+    "https://www.bcra.gob.ar/archivos/Pdfs/PublicacionesEstadisticas/"
+    "historico-relevamiento-expectativas-mercado.xlsx"
+)
+REM_SHEET = "Base de Datos Completa"
+REM_IPC_VARIABLE = "Precios minoristas (IPC nivel general; INDEC)"
+REM_IPC_REFERENCIA = "var. % mensual"
+
+# Variables que se conservan al parsear (el resto se descarta fila a fila)
+REM_VARIABLES = (REM_IPC_VARIABLE,)
+REM_STATS = ("Mediana", "Promedio")
+
+
+def _parse_rem_vintages_xlsx(raw: bytes) -> pd.DataFrame:
+    """
+    Lee "Base de Datos Completa" en modo streaming (excel_io.iter_rows) y
+    conserva solo las filas de REM_VARIABLES, TODAS las fechas de pronóstico.
+
+    Tabla compacta:
+      Fecha de pronóstico (datetime), Variable / Referencia / Período (category),
+      Date (Período como fecha; NaT si es "Próx. 12 meses", un año, etc.),
+      Mediana, Promedio (float)
+    """
+    cols = ["Fecha de pronóstico", "Variable", "Referencia", "Período", *REM_STATS]
+    rows = excel_io.iter_rows(raw, REM_SHEET)
+
+    # header por contenido (fila 2 con openpyxl; el motor puede recortar bordes vacíos)
+    for row in rows:
+        header = [str(c).strip() if c is not None else "" for c in row]
+        if "Variable" in header and "Fecha de pronóstico" in header:
+            break
+    else:
+        raise ValueError(f"REM: no se encontró el header en '{REM_SHEET}'")
+
+    pos = [header.index(c) for c in cols]
+    i_var = header.index("Variable")
+
+    wanted = set(REM_VARIABLES)
+    data = [tuple(row[i] for i in pos) for row in rows if row[i_var] in wanted]
+
+    df = pd.DataFrame.from_records(data, columns=cols)
+    df["Fecha de pronóstico"] = pd.to_datetime(df["Fecha de pronóstico"], errors="coerce")
+    df["Date"] = pd.to_datetime(df["Período"], errors="coerce")
+    for c in ["Variable", "Referencia", "Período"]:
+        df[c] = df[c].astype(str).astype("category")
+    for c in REM_STATS:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+
+    return (
+        df.dropna(subset=["Fecha de pronóstico"])
+        .sort_values(["Variable", "Referencia", "Fecha de pronóstico", "Date"])
+        .reset_index(drop=True)
     )
-    df = pd.read_excel(url, sheet_name="Base de Datos Completa", skiprows=1)
 
-    rem = df.loc[
-        (df["Variable"] == "Precios minoristas (IPC nivel general; INDEC)")
-        & (df["Referencia"] == "var. % mensual")
-    ].copy()
 
-    latest = rem["Fecha de pronóstico"].max()
+@st.cache_data(ttl=60 * 60)
+def get_rem_vintages() -> pd.DataFrame:
+    """Todas las ediciones del REM para REM_VARIABLES (ver _parse_rem_vintages_xlsx)."""
+    return http_cache.load_static(REM_XLSX_URL, _parse_rem_vintages_xlsx, profile="bcra_files")
+
+
+def rem_ipc_vintage(vintages: pd.DataFrame, fecha=None, n: int = 24) -> pd.DataFrame:
+    """
+    IPC mensual esperado de una edición del REM (fecha=None → la última).
+    Devuelve Date, v_m_REM (en %) + Fecha de pronóstico; últimos n períodos.
+    """
+    rem = vintages[
+        (vintages["Variable"] == REM_IPC_VARIABLE) & (vintages["Referencia"] == REM_IPC_REFERENCIA)
+    ]
+    if rem.empty:
+        return pd.DataFrame(columns=["Fecha de pronóstico", "Date", "v_m_REM"])
+
+    fecha = rem["Fecha de pronóstico"].max() if fecha is None else pd.Timestamp(fecha)
 
     return (
-        rem.loc[rem["Fecha de pronóstico"] == latest]
-        .sort_values("Período")
-        .tail(24)
-        .rename(columns={"Período": "Date", "Mediana": "v_m_REM"})
-        .assign(Date=lambda x: pd.to_datetime(x["Date"], errors="coerce"))
+        rem.loc[rem["Fecha de pronóstico"] == fecha, ["Fecha de pronóstico", "Date", "Mediana"]]
+        .sort_values("Date")
+        .tail(n)
+        .rename(columns={"Mediana": "v_m_REM"})
         .reset_index(drop=True)
     )
 
 
+@st.cache_data(ttl=60 * 60)
+def get_rem_last() -> pd.DataFrame:
+    return rem_ipc_vintage(get_rem_vintages())
+
+
 # ============================================================
 # IPC INDEC (para macro_precios.py)
 # ============================================================
-@st.cache_data(ttl=12 * 60 * 60)
-def get_ipc_indec_full() -> pd.DataFrame:
-    url = "https://www.indec.gob.ar/ftp/cuadros/economia/serie_ipc_divisiones.csv"
+IPC_INDEC_CSV_URL = "https://www.indec.gob.ar/ftp/cuadros/economia/serie_ipc_divisiones.csv"
+
+
+IPC_INDEC_CATEGORICAL = ["Codigo", "Descripcion", "Clasificador", "Region"]
+
+
+def _detect_text_encoding(raw: bytes) -> str:
+    """utf-8 (con o sin BOM) si los bytes son utf-8 válidos; si no, latin1."""
+    if raw.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
     try:
-        df = pd.read_csv(url, sep=";", decimal=",", encoding="utf-8")
+        raw.decode("utf-8")
+        return "utf-8"
     except UnicodeDecodeError:
-        df = pd.read_csv(url, sep=";", decimal=",", encoding="latin1")
+        return "latin1"
+
+
+def _parse_ipc_indec_csv(raw: bytes) -> pd.DataFrame:
+    """
+    Una sola lectura (encoding detectado sobre los bytes), columnas de texto
+    repetidas como category y filas ordenadas por (Region, Codigo, Periodo).
+    df.attrs["ipc_index"]: {(Codigo, Region): (fila_inicio, fila_fin)} → ver ipc_select.
+    """
+    df = pd.read_csv(BytesIO(raw), sep=";", decimal=",", encoding=_detect_text_encoding(raw))
 
     # ✅ CLAVE: mantener Codigo como string (preserva B/S/Núcleo/Regulados/Estacional)
-    df["Codigo"] = df["Codigo"].astype(str).str.strip()
+    codigo = df["Codigo"].astype(str).str.strip()
+    df["Codigo"] = codigo.where(~codigo.str.fullmatch(r"\d+\.0"), codigo.str[:-2])
 
     # ✅ versión numérica para filtros tipo Codigo == 0
     df["Codigo_num"] = pd.to_numeric(df["Codigo"], errors="coerce")
 
     df["Periodo"] = pd.to_datetime(df["Periodo"].astype(str), format="%Y%m", errors="coerce")
 
-    for c in ["Descripcion", "Clasificador", "Region"]:
-        df[c] = df[c].astype(str).str.strip()
+    for c in IPC_INDEC_CATEGORICAL:
+        df[c] = df[c].astype(str).str.strip().astype("category")
 
     for c in ["Indice_IPC", "v_m_IPC", "v_i_a_IPC"]:
         df[c] = pd.to_numeric(df[c], errors="coerce")
 
-    return df.dropna(subset=["Periodo"]).sort_values("Periodo").reset_index(drop=True)
+    df = df.dropna(subset=["Periodo"]).sort_values(["Region", "Codigo", "Periodo"]).reset_index(drop=True)
+
+    # (Codigo, Region) -> rango de filas contiguo
+    codes = df["Codigo"].astype(str).to_numpy()
+    regions = df["Region"].astype(str).to_numpy()
+    change = np.r_[True, (codes[1:] != codes[:-1]) | (regions[1:] != regions[:-1])] if len(df) else np.array([], bool)
+    starts = np.flatnonzero(change)
+    stops = np.r_[starts[1:], len(df)]
+
+    df.attrs["ipc_index"] = {(codes[a], regions[a]): (int(a), int(b)) for a, b in zip(starts, stops)}
+    df.attrs["ipc_rows"] = len(df)
+    return df
+
+
+def _is_fresh_range(idx: pd.Index) -> bool:
+    return isinstance(idx, pd.RangeIndex) and idx.start == 0 and idx.step == 1
+
+
+def ipc_select(df: pd.DataFrame, codigo, region: str = "Nacional") -> pd.DataFrame:
+    """
+    Serie de un Codigo/Region del IPC INDEC ordenada por Periodo.
+    Usa el índice precalculado (slice O(1)); si df ya fue filtrado/reordenado
+    cae a la máscara booleana de siempre.
+    """
+    key = (str(codigo).strip(), str(region).strip())
+    index = df.attrs.get("ipc_index")
+
+    # attrs sobrevive a sort_values / iloc[::-1]: además del largo se exige el
+    # RangeIndex original y que el rango guardado siga siendo de esa clave
+    if index is not None and df.attrs.get("ipc_rows") == len(df) and _is_fresh_range(df.index):
+        if key not in index:
+            return df.iloc[0:0]
+        start, stop = index[key]
+        out = df.iloc[start:stop]
+        if (
+            (out["Codigo"].astype(str).to_numpy() == key[0]).all()
+            and (out["Region"].astype(str).to_numpy() == key[1]).all()
+            and out["Periodo"].is_monotonic_increasing
+        ):
+            return out
+
+    mask = (df["Codigo"].astype(str) == key[0]) & (df["Region"].astype(str) == key[1])
+    return df[mask].sort_values("Periodo")
+
+
+@swr_cache(ttl=12 * 60 * 60)
+def get_ipc_indec_full() -> pd.DataFrame:
+    """
+    Stale-while-revalidate: vencido el TTL se sirve la última copia buena y se
+    refresca en segundo plano (get_ipc_indec_full.fetched_at() = antigüedad).
+    """
+    return http_cache.load_static(IPC_INDEC_CSV_URL, _parse_ipc_indec_csv, profile="indec")
 
 
-@st.cache_data(ttl=12 * 60 * 60)
 def get_ipc_nacional_nivel_general() -> pd.DataFrame:
+    # sin st.cache_data encima: guardaría la copia stale del swr otras 12 h
     df = get_ipc_indec_full()
 
     tmp = (
-        df[(df["Codigo_num"] == 0) & (df["Region"] == "Nacional")]
+        ipc_select(df, "0", "Nacional")
         .dropna(subset=["v_m_IPC"])
         .rename(columns={"Periodo": "Date"})
         .sort_values("Date")
@@ -191,17 +628,101 @@ def get_ipc_nacional_nivel_general() -> pd.DataFrame:
 
 
 # ============================================================
-# IPC BCRA (id=27) para bandas
+# IPIM (INDEC) — un solo parseo para el KPI de macro_home y macro_precios
 # ============================================================
+IPIM_CSV_URL = "https://www.indec.gob.ar/ftp/cuadros/economia/indice_ipim.csv"
+IPIM_COLS = ["periodo", "nivel_general_aperturas", "indice_ipim"]
+
+
+def _sniff_delimiter(raw: bytes, candidates=(";", ",", "\t")) -> str:
+    """Separador más frecuente en la primera línea (header)."""
+    header = raw[:4096].split(b"\n", 1)[0]
+    return max(candidates, key=lambda sep: header.count(sep.encode()))
+
+
+def _norm_ipim_apertura(x: str) -> str:
+    return (
+        str(x).strip().lower()
+        .replace("\u00a0", " ")
+        .replace(".", "")
+        .replace(" ", "_")
+        .replace("__", "_")
+    )
+
+
+def _parse_ipim_csv(raw: bytes) -> pd.DataFrame:
+    """
+    Separador detectado una vez sobre el header y parser C.
+    Apertura normalizada sobre los valores únicos (category).
+    Devuelve Periodo, Apertura, Indice, v_m, v_i_a (ordenado por Apertura, Periodo).
+    """
+    df = pd.read_csv(
+        BytesIO(raw),
+        sep=_sniff_delimiter(raw),
+        engine="c",
+        dtype=str,
+        encoding=_detect_text_encoding(raw),
+    )
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if not set(IPIM_COLS).issubset(df.columns):
+        return pd.DataFrame(columns=["Periodo", "Apertura", "Indice", "v_m", "v_i_a"])
+
+    ap = df["nivel_general_aperturas"].astype("category")
+    ap_norm = {c: _norm_ipim_apertura(c) for c in ap.cat.categories}
+
+    per = pd.to_datetime(df["periodo"].str.strip(), format="%Y-%m-%d", errors="coerce")
+
+    s = df["indice_ipim"].str.strip().str.replace("\u00a0", "", regex=False).str.replace(" ", "", regex=False)
+    has_comma = s.str.contains(",", na=False)
+    s = s.where(~has_comma, s.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+
+    out = pd.DataFrame(
+        {
+            "Periodo": per.dt.to_period("M").dt.to_timestamp(how="start"),
+            "Apertura": ap.map(ap_norm).astype("category"),
+            "Indice": pd.to_numeric(s, errors="coerce"),
+        }
+    )
+    out = out.dropna(subset=["Periodo", "Apertura", "Indice"]).sort_values(["Apertura", "Periodo"]).reset_index(drop=True)
+
+    g = out.groupby("Apertura", observed=True)["Indice"]
+    out["v_m"] = g.pct_change(1) * 100
+    out["v_i_a"] = g.pct_change(12) * 100
+    return out
+
+
 @st.cache_data(ttl=12 * 60 * 60)
+def get_ipim() -> pd.DataFrame:
+    """
+    IPIM por apertura: Periodo, Apertura (category), Indice, v_m, v_i_a (en %).
+    """
+    try:
+        return http_cache.load_static(IPIM_CSV_URL, _parse_ipim_csv, profile="indec")
+    except Exception as e:
+        st.warning(f"INDEC IPIM error: {e}")
+        return pd.DataFrame(columns=["Periodo", "Apertura", "Indice", "v_m", "v_i_a"])
+
+
+# ============================================================
+# IPC BCRA (id=27) para bandas
+# ============================================================
 def get_ipc_bcra() -> pd.DataFrame:
     """
     IPC (% mensual) desde BCRA Monetarias idVariable=27.
-    Devuelve v_m_CPI en DECIMAL (ej 2.8% -> 0.028).
+    Devuelve v_m_CPI en DECIMAL (ej 2.8% -> 0.028); vacío (sin cachear) si el BCRA no trajo nada.
     """
+    try:
+        return _ipc_bcra_cached()
+    except _SourceDown as e:
+        return e.value
+
+
+@st.cache_data(ttl=12 * 60 * 60)
+def _ipc_bcra_cached() -> pd.DataFrame:
     df = get_monetaria_serie(27)
+    status = df.attrs.get("status")
     if df.empty:
-        return pd.DataFrame(columns=["Date", "v_m_CPI", "Period"])
+        raise _SourceDown(pd.DataFrame(columns=["Date", "v_m_CPI", "Period"]))
 
     df = df.rename(columns={"value": "v_m_pct"}).copy()
     df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
@@ -211,12 +732,15 @@ def get_ipc_bcra() -> pd.DataFrame:
     df["Period"] = df["Date"].dt.to_period("M")
     df["v_m_CPI"] = df["v_m_pct"] / 100.0
 
-    return (
+    out = (
         df[["Date", "v_m_CPI", "Period"]]
         .drop_duplicates("Period")
         .sort_values("Period")
         .reset_index(drop=True)
     )
+    if status in BCRA_DEGRADED_STATUS:
+        raise _SourceDown(out)  # copia local: se sirve, pero no se cachea 12 h
+    return out
 
 
 # ============================================================
@@ -261,372 +785,503 @@ def build_bands_2026(bands_2025: pd.DataFrame, rem: pd.DataFrame, ipc: pd.DataFr
 
 
 # ============================================================
-# ITCRM (Excel BCRA) - ITCRM + bilaterales
+# Bandas — motor memoizado por (edición REM, versión IPC)
 # ============================================================
-@st.cache_data(ttl=12 * 60 * 60)
-def get_itcrm_excel_long() -> pd.DataFrame:
+BANDS_2025_START = "2025-04-14"
+BANDS_2025_END = "2025-12-31"
+BANDS_LOWER0 = 1000.0
+BANDS_UPPER0 = 1400.0
+BANDS_2026_START = pd.Period("2026-01", freq="M")
+BANDS_IPC_LAG = 2  # la banda del mes M se mueve con la inflación de M-2
+IPC_PUBLICATION_DAYS = 15  # el IPC del mes P se publica ~día 15 de P+1
+BANDS_COLS = ["Date", "lower", "upper"]
+
+
+def _ipc_version(ipc: pd.DataFrame) -> str:
+    """Último período + hash de los valores: cambia si INDEC publica o revisa."""
+    if ipc is None or ipc.empty:
+        return "sin-ipc"
+    h = int(pd.util.hash_pandas_object(ipc[["Date", "v_m_CPI"]], index=False).sum())
+    return f"{ipc['Period'].max()}-{h:x}"
+
+
+def _rem_fecha_key(fecha) -> str:
+    return "" if fecha is None or pd.isna(fecha) else pd.Timestamp(fecha).strftime("%Y-%m-%d")
+
+
+def ipc_known_until(fechas) -> np.ndarray:
     """
-    Descarga ITCRMSerie.xlsx del BCRA y devuelve formato largo:
-    columnas: Date, Serie, Value
+    IPC publicado a la fecha f (vista histórica por edición): hasta el mes
+    (f - IPC_PUBLICATION_DAYS) - 1. Devuelve ordinales de Period("M").
     """
-    url = "https://www.bcra.gob.ar/archivos/Pdfs/PublicacionesEstadisticas/ITCRMSerie.xlsx"
-    sheet = "ITCRM y bilaterales"
+    return ((pd.DatetimeIndex(fechas) - pd.Timedelta(days=IPC_PUBLICATION_DAYS)).to_period("M") - 1).asi8
 
-    r = requests.get(url, timeout=60)
-    r.raise_for_status()
 
-    df = pd.read_excel(
-        BytesIO(r.content),
-        sheet_name=sheet,
-        header=1,
-        engine="openpyxl",
+@st.cache_data(ttl=12 * 60 * 60, show_spinner=False, max_entries=32)
+def _fx_bands_for(rem_fecha: str, ipc_version: str) -> pd.DataFrame:
+    # ipc_version solo entra en la clave del cache: si el IPC cambia se recalcula
+    bands_2025 = build_bands_2025(BANDS_2025_START, BANDS_2025_END, BANDS_LOWER0, BANDS_UPPER0)
+
+    # vista vigente: todo el IPC publicado hoy + la edición REM para lo que falta
+    # (ipc_known_until es solo para la vista histórica, fx_bands_by_vintage)
+    rem = rem_ipc_vintage(get_rem_vintages(), fecha=rem_fecha or None)
+    parts = [bands_2025]
+    if not rem.empty and rem["Date"].notna().any():
+        parts.append(build_bands_2026(bands_2025, rem, get_ipc_bcra()))
+
+    return (
+        pd.concat(parts, ignore_index=True)
+        .dropna(subset=BANDS_COLS)
+        .sort_values("Date")
+        .reset_index(drop=True)
     )
 
-    df = df.rename(columns={df.columns[0]: "Date"}).copy()
-    df["Date"] = pd.to_datetime(df["Date"], dayfirst=True, errors="coerce")
-    df = df.dropna(subset=["Date"])
 
-    for c in df.columns[1:]:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
+def get_fx_bands(fecha=None) -> pd.DataFrame:
+    """
+    Bandas 2025 + 2026 (Date, lower, upper) con la edición `fecha` del REM
+    (None → la última) y el IPC BCRA vigente. Memoizado por (edición, versión IPC):
+    los reruns no rearman el calendario ni los productos acumulados.
+    """
+    if fecha is None:
+        vintages = get_rem_vintages()
+        fecha = vintages["Fecha de pronóstico"].max() if not vintages.empty else None
+    return _fx_bands_for(_rem_fecha_key(fecha), _ipc_version(get_ipc_bcra()))
 
-    value_cols = [c for c in df.columns if c != "Date"]
-    long_df = (
-        df.melt(id_vars=["Date"], value_vars=value_cols, var_name="Serie", value_name="Value")
-        .dropna(subset=["Value"])
-        .sort_values(["Serie", "Date"])
-        .reset_index(drop=True)
+
+def fx_bands_by_vintage(vintages: pd.DataFrame, ipc: pd.DataFrame) -> pd.DataFrame:
+    """
+    Camino de bandas 2026 implícito en CADA edición del REM, en una sola pasada:
+    matriz ediciones x meses de inflación (IPC ya publicado a la fecha de la
+    edición, si no la mediana REM) -> tasas diarias -> cumprod por fila.
+    Una edición sin dato para algún mes corta su camino ahí.
+
+    Devuelve largo: Fecha de pronóstico, Date, lower, upper.
+    """
+    empty = pd.DataFrame(columns=["Fecha de pronóstico", *BANDS_COLS])
+
+    rem = vintages[
+        (vintages["Variable"] == REM_IPC_VARIABLE) & (vintages["Referencia"] == REM_IPC_REFERENCIA)
+    ].dropna(subset=["Date", "Mediana"])
+    if rem.empty:
+        return empty
+
+    grid = rem.assign(Period=rem["Date"].dt.to_period("M")).pivot_table(
+        index="Fecha de pronóstico", columns="Period", values="Mediana", aggfunc="last"
     )
-    return long_df
+
+    p0 = BANDS_2026_START - BANDS_IPC_LAG
+    p_end = grid.columns.max()
+    if ipc is not None and not ipc.empty:
+        p_end = max(p_end, ipc["Period"].max())
+    if p_end < p0:
+        return empty
+    periods = pd.period_range(p0, p_end, freq="M")
+
+    rem_mat = grid.reindex(columns=periods).to_numpy(dtype="float64") / 100.0
+    keep = ~np.isnan(rem_mat).all(axis=1)  # ediciones sin pronóstico para 2026 afuera
+    rem_mat = rem_mat[keep]
+    fechas = pd.DatetimeIndex(grid.index[keep])
+    if not len(fechas):
+        return empty
+
+    if ipc is not None and not ipc.empty:
+        cpi = ipc.drop_duplicates("Period").set_index("Period")["v_m_CPI"].reindex(periods).to_numpy(dtype="float64")
+    else:
+        cpi = np.full(len(periods), np.nan)
+
+    # IPC conocido a la fecha de cada edición (ipc_known_until)
+    known_until = ipc_known_until(fechas)
+    known = (periods.asi8[None, :] <= known_until[:, None]) & ~np.isnan(cpi)[None, :]
+    rate = np.where(known, cpi[None, :], rem_mat)  # ediciones x meses
+
+    days = pd.date_range(
+        BANDS_2026_START.start_time, (periods[-1] + BANDS_IPC_LAG).end_time.normalize(), freq="D"
+    )
+    ref = days.to_period("M").asi8 - BANDS_IPC_LAG - periods[0].ordinal  # columna de rate por día
+
+    r_d = (1.0 + rate[:, ref]) ** (1 / 30) - 1.0  # NaN se propaga en cumprod: corta el camino
+    bands_2025 = build_bands_2025(BANDS_2025_START, BANDS_2025_END, BANDS_LOWER0, BANDS_UPPER0)
+    lower = bands_2025["lower"].iloc[-1] * np.cumprod(1.0 - r_d, axis=1)
+    upper = bands_2025["upper"].iloc[-1] * np.cumprod(1.0 + r_d, axis=1)
+
+    n_v, n_d = lower.shape
+    out = pd.DataFrame(
+        {
+            "Fecha de pronóstico": np.repeat(fechas.to_numpy(), n_d),
+            "Date": np.tile(days.to_numpy(), n_v),
+            "lower": lower.ravel(),
+            "upper": upper.ravel(),
+        }
+    )
+    return out.dropna(subset=["lower", "upper"]).reset_index(drop=True)
 
 
 # ============================================================
-# DATOS.GOB.AR — SERIES (GENÉRICO)
+# ITCRM (Excel BCRA) - ITCRM + bilaterales
 # ============================================================
-DATOS_GOB_AR_SERIES_URL = "https://apis.datos.gob.ar/series/api/series"
+ITCRM_XLSX_URL = "https://www.bcra.gob.ar/archivos/Pdfs/PublicacionesEstadisticas/ITCRMSerie.xlsx"
+ITCRM_SHEET = "ITCRM y bilaterales"
 
 
-def _parse_datos_gob_series_csv(csv_text: str, series_id: str) -> pd.DataFrame:
+def _parse_itcrm_xlsx(raw: bytes) -> pd.DataFrame:
     """
-    Parsea CSV de datos.gob.ar.
-    Soporta:
-      - formato largo: indice_tiempo, serie_id, valor
-      - formato ancho: indice_tiempo + columna con el id de la serie
-      - formato simple: indice_tiempo, valor
-    Devuelve DataFrame con columnas Date, Value.
+    Matriz ancha: índice Date (ordenado, único) y una columna float64 por serie,
+    en un solo bloque Fortran-order (cada columna contigua en memoria).
+    attrs["cols"] = {serie: posición}, attrs["last"] = {serie: última fecha con dato}.
     """
-    try:
-        df = pd.read_csv(StringIO(csv_text))
-        if df.empty:
-            return pd.DataFrame(columns=["Date", "Value"])
+    df = excel_io.read_excel(raw, sheet_name=ITCRM_SHEET, header=1)
 
-        df.columns = [c.strip() for c in df.columns]
+    dates = pd.to_datetime(df.iloc[:, 0], dayfirst=True, errors="coerce").dt.normalize()
+    keep = dates.notna().to_numpy()
 
-        # 1) Formato largo
-        if {"indice_tiempo", "serie_id", "valor"}.issubset(df.columns):
-            out = df[df["serie_id"] == series_id][["indice_tiempo", "valor"]].copy()
-            out = out.rename(columns={"indice_tiempo": "Date", "valor": "Value"})
+    values = df.iloc[keep, 1:].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64")
+    names = [str(c) for c in df.columns[1:]]
 
-        # 2) Formato ancho
-        elif "indice_tiempo" in df.columns and series_id in df.columns:
-            out = df[["indice_tiempo", series_id]].copy()
-            out = out.rename(columns={"indice_tiempo": "Date", series_id: "Value"})
+    # columnas vacías (Unnamed) y filas sin ningún dato afuera
+    has_col = ~np.isnan(values).all(axis=0)
+    values = values[:, has_col]
+    names = [n for n, ok in zip(names, has_col) if ok]
+    has_row = ~np.isnan(values).all(axis=1)
 
-        # 3) Formato simple (una sola serie)
-        elif {"indice_tiempo", "valor"}.issubset(df.columns):
-            out = df[["indice_tiempo", "valor"]].copy()
-            out = out.rename(columns={"indice_tiempo": "Date", "valor": "Value"})
+    idx = pd.DatetimeIndex(dates[keep][has_row], name="Date")
+    values = values[has_row]
 
-        # 4) Fallback clásico
-        elif {"fecha", "valor"}.issubset(df.columns):
-            out = df.rename(columns={"fecha": "Date", "valor": "Value"})[["Date", "Value"]]
+    order = np.argsort(idx.to_numpy(), kind="stable")
+    idx, values = idx[order], values[order]
+    dup = idx.duplicated(keep="last")
+    idx, values = idx[~dup], np.asfortranarray(values[~dup])
 
-        else:
-            return pd.DataFrame(columns=["Date", "Value"])
-
-        out["Date"] = pd.to_datetime(out["Date"], errors="coerce")
-        out["Value"] = pd.to_numeric(out["Value"], errors="coerce")
-
-        return (
-            out.dropna(subset=["Date", "Value"])
-            .drop_duplicates(subset=["Date"])
-            .sort_values("Date")
-            .reset_index(drop=True)
-        )
+    wide = pd.DataFrame(values, index=idx, columns=names, copy=False)
 
-    except Exception:
-        return pd.DataFrame(columns=["Date", "Value"])
+    valid = ~np.isnan(values)
+    last_pos = len(idx) - 1 - np.argmax(valid[::-1], axis=0)
+    wide.attrs["cols"] = {n: j for j, n in enumerate(names)}
+    wide.attrs["last"] = {n: idx[last_pos[j]] for j, n in enumerate(names)}
+    return wide
 
 
 @st.cache_data(ttl=12 * 60 * 60)
-def get_datos_gob_series(series_id: str) -> pd.DataFrame:
+def get_itcrm_wide() -> pd.DataFrame:
     """
-    Descarga una serie puntual desde datos.gob.ar.
+    Descarga ITCRMSerie.xlsx del BCRA y devuelve la matriz ancha
+    (índice Date, una columna por serie). Para leer series usar itcrm_views.
     """
-    params = {"ids": series_id, "format": "csv", "limit": 1000}
-
     try:
-        r = requests.get(
-            DATOS_GOB_AR_SERIES_URL,
-            params=params,
-            timeout=30,
-            headers={
-                "User-Agent": "monitor-ceu-uia/1.0 (streamlit)",
-                "Accept": "text/csv,*/*",
-            },
-        )
-
-        if r.status_code != 200:
-            st.warning(f"datos.gob.ar ({series_id}) status={r.status_code}: {r.text[:200]}")
-            return pd.DataFrame(columns=["Date", "Value"])
+        return http_cache.load_static(ITCRM_XLSX_URL, _parse_itcrm_xlsx, profile="bcra_files")
+    except Exception as e:
+        st.warning(f"BCRA ITCRM error: {e}")
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
 
-        return _parse_datos_gob_series_csv(r.text, series_id)
 
-    except Exception as e:
-        st.warning(f"datos.gob.ar ({series_id}) error: {e}")
-        return pd.DataFrame(columns=["Date", "Value"])
+def itcrm_views(wide: pd.DataFrame, series) -> dict[str, pd.Series]:
+    """
+    {serie: Series indexada por Date} para las series pedidas que existan.
+    Cada Series es una vista sobre la columna de la matriz (sin copiar):
+    tratarla como solo lectura.
+    """
+    cols = wide.attrs.get("cols") or {c: j for j, c in enumerate(wide.columns)}
+    values = wide.to_numpy()
+    return {
+        s: pd.Series(values[:, cols[s]], index=wide.index, name=s, copy=False)
+        for s in series
+        if s in cols
+    }
 
 
 # ============================================================
-# DATOS.GOB.AR — EMAE (INDEC)
+# DATOS.GOB.AR — SERIES (GENÉRICO, BATCH)
 # ============================================================
+DATOS_GOB_AR_SERIES_URL = "https://apis.datos.gob.ar/series/api/series"
+DATOS_GOB_AR_HEADERS = {"Accept": "text/csv,*/*"}
+DATOS_GOB_AR_MAX_IDS = 40  # máximo de ids por request que acepta la API
+DATOS_GOB_AR_PAGE_LIMIT = 1000  # máximo de filas por página (después: start=)
+DATOS_GOB_AR_STORE_NS = "datos_gob"
+DATOS_GOB_AR_SYNC_OVERLAP = pd.DateOffset(months=3)  # ventana re-pedida para detectar revisiones
+DATOS_GOB_AR_BATCH_GAP = pd.DateOffset(months=6)  # series más atrasadas que esto van en otro request
+DATOS_GOB_AR_PROVISIONAL = pd.DateOffset(months=2)  # últimos datos, revisados de rutina (los absorbe el merge)
+DATOS_GOB_AR_REVISION_RTOL = 1e-3  # cambio relativo que cuenta como revisión de la historia
 
 # IDs (confirmados por vos)
 EMAE_ORIGINAL_ID = "143.3_NO_PR_2004_A_21"
 EMAE_DESEASON_ID = "143.3_NO_PR_2004_A_31"
+ISAC_ORIGINAL_ID = "33.2_ISAC_NIVELRAL_0_M_18_63"
+ISAC_DESEASON_ID = "33.2_ISAC_SIN_EDAD_0_M_23_56"
+IPI_MANUF_ORIGINAL_ID = "453.1_SERIE_ORIGNAL_0_0_14_46"
+IPI_MANUF_DESEASON_ID = "453.1_SERIE_DESEADA_0_0_24_58"
 
+# Todas las series de la página de actividad: un solo request
+ACTIVIDAD_SERIES_IDS = (
+    EMAE_ORIGINAL_ID,
+    EMAE_DESEASON_ID,
+    ISAC_ORIGINAL_ID,
+    ISAC_DESEASON_ID,
+    IPI_MANUF_ORIGINAL_ID,
+    IPI_MANUF_DESEASON_ID,
+)
 
-@st.cache_data(ttl=12 * 60 * 60)
-def get_emae_both_csv() -> pd.DataFrame:
-    ids = f"{EMAE_ORIGINAL_ID},{EMAE_DESEASON_ID}"
-    params = {"ids": ids, "format": "csv", "limit": 1000}
+# Por si la API ignora header=ids y devuelve títulos genéricos
+DATOS_GOB_AR_TITLE_ALIASES = {
+    "emae_original": EMAE_ORIGINAL_ID,
+    "emae_desestacionalizada": EMAE_DESEASON_ID,
+    "isac_nivel_general": ISAC_ORIGINAL_ID,
+    "isac_sin_estacionalidad": ISAC_DESEASON_ID,
+    "serie_original": IPI_MANUF_ORIGINAL_ID,
+    "serie_desestacionalizada": IPI_MANUF_DESEASON_ID,
+}
+
+
+def _parse_datos_gob_wide_csv(csv_text: str, ids: list[str]) -> pd.DataFrame:
+    """
+    Parsea el CSV de datos.gob.ar a formato ancho: Date + una columna por id.
+    Soporta:
+      - formato ancho con header=ids (lo que pedimos)
+      - formato ancho con títulos (alias conocidos o, si no, por posición)
+      - formato largo: indice_tiempo, serie_id, valor
+    Devuelve None si el formato no se reconoce.
+    """
+    df = pd.read_csv(StringIO(csv_text))
+    if df.empty:
+        return pd.DataFrame(columns=["Date", *ids])
+
+    df.columns = [str(c).strip() for c in df.columns]
+    if "indice_tiempo" not in df.columns:
+        return None
+
+    # formato largo
+    if {"serie_id", "valor"}.issubset(df.columns):
+        df = df.pivot_table(index="indice_tiempo", columns="serie_id", values="valor", aggfunc="last")
+        df = df.reset_index().rename_axis(None, axis=1)
+
+    df = df.rename(columns={"indice_tiempo": "Date", **DATOS_GOB_AR_TITLE_ALIASES})
+
+    value_cols = [c for c in df.columns if c != "Date"]
+    if not set(ids).issubset(value_cols):
+        # títulos desconocidos: la API respeta el orden de ids
+        if len(value_cols) != len(ids):
+            return None
+        df = df.rename(columns=dict(zip(value_cols, ids)))
 
-    r = requests.get(
+    out = df[["Date", *ids]].copy()
+    out["Date"] = pd.to_datetime(out["Date"], errors="coerce")
+    out[ids] = out[ids].apply(pd.to_numeric, errors="coerce")
+    return out.dropna(subset=["Date"])
+
+
+@shared_cached("datos_gob_csv", ttl=60 * 60)  # no-op salvo CEU_SHARED_CACHE
+def _get_datos_gob_csv(ids: tuple[str, ...], start: int, start_date: str | None = None) -> str:
+    params = {
+        "ids": ",".join(ids),
+        "format": "csv",
+        "header": "ids",
+        "limit": DATOS_GOB_AR_PAGE_LIMIT,
+        "start": start,
+    }
+    if start_date:
+        params["start_date"] = start_date
+    r = http_client.get(
         DATOS_GOB_AR_SERIES_URL,
+        profile="datos_gob",
         params=params,
-        timeout=30,
-        headers={
-            "User-Agent": "monitor-ceu-uia/1.0 (streamlit)",
-            "Accept": "text/csv,*/*",
-        },
+        headers=DATOS_GOB_AR_HEADERS,
     )
-
     if r.status_code != 200:
-        st.warning(f"datos.gob.ar EMAE both status={r.status_code}: {r.text[:200]}")
-        return pd.DataFrame()
-
-    df = pd.read_csv(StringIO(r.text))
-    df.columns = [c.strip() for c in df.columns]
+        raise requests.exceptions.HTTPError(f"status={r.status_code}: {r.text[:200]}", response=r)
+    return r.text
 
-    # Caso A) columnas con nombre por ID
-    if "indice_tiempo" in df.columns and (EMAE_ORIGINAL_ID in df.columns) and (EMAE_DESEASON_ID in df.columns):
-        df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
-        return df.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
-
-    # Caso B) columnas genéricas
-    if {"indice_tiempo", "emae_original", "emae_desestacionalizada"}.issubset(df.columns):
-        df = df.rename(
-            columns={
-                "emae_original": EMAE_ORIGINAL_ID,
-                "emae_desestacionalizada": EMAE_DESEASON_ID,
-            }
-        )
-        df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
-        return df.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
-
-    # Caso C) formato largo
-    if {"indice_tiempo", "serie_id", "valor"}.issubset(df.columns):
-        df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
-        df["valor"] = pd.to_numeric(df["valor"], errors="coerce")
-        wide = (
-            df.pivot(index="indice_tiempo", columns="serie_id", values="valor")
-            .reset_index()
-            .rename_axis(None, axis=1)
-        )
-        return wide.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
-
-    st.warning(f"datos.gob.ar EMAE both: formato CSV inesperado. cols={df.columns.tolist()}")
-    return pd.DataFrame()
 
+def fetch_datos_gob_wide(ids, start_date: str | None = None) -> pd.DataFrame:
+    """
+    Baja cualquier lista de series de datos.gob.ar en la menor cantidad de
+    requests posible: bloques de DATOS_GOB_AR_MAX_IDS ids y paginado con
+    start= cuando hay más de DATOS_GOB_AR_PAGE_LIMIT filas.
+    start_date (YYYY-MM-DD) limita a observaciones desde esa fecha.
+    Devuelve un DataFrame ancho: Date + una columna por id (orden pedido).
+    Lanza excepción si algún bloque falla (el llamador decide cómo avisar).
+    """
+    ids = list(dict.fromkeys(ids))
+    out = pd.DataFrame({"Date": pd.Series(dtype="datetime64[ns]")})
 
-@st.cache_data(ttl=12 * 60 * 60)
-def get_emae_original() -> pd.DataFrame:
-    df = get_emae_both_csv()
-    if df.empty or EMAE_ORIGINAL_ID not in df.columns:
-        return pd.DataFrame(columns=["Date", "Value"])
-    out = df[["indice_tiempo", EMAE_ORIGINAL_ID]].rename(columns={"indice_tiempo": "Date", EMAE_ORIGINAL_ID: "Value"})
-    return out.dropna().reset_index(drop=True)
+    for i in range(0, len(ids), DATOS_GOB_AR_MAX_IDS):
+        chunk = ids[i : i + DATOS_GOB_AR_MAX_IDS]
+        pages = []
+        start = 0
+        while True:
+            page = _parse_datos_gob_wide_csv(_get_datos_gob_csv(tuple(chunk), start, start_date), chunk)
+            if page is None:
+                raise ValueError(f"datos.gob.ar: formato CSV inesperado para {chunk}")
+            pages.append(page)
+            if len(page) < DATOS_GOB_AR_PAGE_LIMIT:
+                break
+            start += DATOS_GOB_AR_PAGE_LIMIT
 
+        block = pd.concat(pages, ignore_index=True).drop_duplicates(subset=["Date"], keep="last")
+        out = out.merge(block, on="Date", how="outer")
 
-@st.cache_data(ttl=12 * 60 * 60)
-def get_emae_deseasonalizado() -> pd.DataFrame:
-    df = get_emae_both_csv()
-    if df.empty or EMAE_DESEASON_ID not in df.columns:
-        return pd.DataFrame(columns=["Date", "Value"])
-    out = df[["indice_tiempo", EMAE_DESEASON_ID]].rename(columns={"indice_tiempo": "Date", EMAE_DESEASON_ID: "Value"})
-    return out.dropna().reset_index(drop=True)
+    return out.sort_values("Date").reset_index(drop=True)[["Date", *ids]]
 
 
-# ============================================================
-# DATOS.GOB.AR — ISAC (INDEC)
-# ============================================================
+def _datos_gob_is_revised(stored: pd.DataFrame, new: pd.DataFrame) -> bool:
+    """
+    True si en el solapamiento cambió algún valor ya consolidado (anterior a
+    los últimos DATOS_GOB_AR_PROVISIONAL): reestimación desestacionalizada,
+    cambio de base. Las revisiones de rutina de los datos provisorios no
+    cuentan; el merge ya las toma.
+    """
+    cutoff = last_date(stored) - DATOS_GOB_AR_PROVISIONAL
+    both = stored.merge(new, on="Date", how="inner", suffixes=("_old", "_new"))
+    both = both[both["Date"] < cutoff]
+    if both.empty:
+        return False
+    return not np.allclose(
+        both["Value_old"], both["Value_new"], rtol=DATOS_GOB_AR_REVISION_RTOL, atol=0, equal_nan=True
+    )
 
-ISAC_ORIGINAL_ID = "33.2_ISAC_NIVELRAL_0_M_18_63"
-ISAC_DESEASON_ID = "33.2_ISAC_SIN_EDAD_0_M_23_56"
 
+def sync_datos_gob_wide(ids) -> pd.DataFrame:
+    """
+    Como fetch_datos_gob_wide pero contra el store local por serie
+    (services.series_store, namespace DATOS_GOB_AR_STORE_NS):
+
+      - series sin store: historia completa
+      - series con store: agrupadas por última fecha (DATOS_GOB_AR_BATCH_GAP);
+        cada lote pide solo desde su fecha más vieja - DATOS_GOB_AR_SYNC_OVERLAP,
+        así una serie discontinuada no arrastra la ventana de las demás
+      - si en el solapamiento cambió algún valor consolidado (revisión /
+        reestimación desestacionalizada) esa serie se vuelve a bajar completa
+      - solo se reescriben en disco las series que cambiaron
+      - si datos.gob.ar falla se sirve lo guardado con attrs["status"] = "stale";
+        solo tira error si no hay nada
+    """
+    ids = list(dict.fromkeys(ids))
+    stored = {sid: load_series(DATOS_GOB_AR_STORE_NS, sid) for sid in ids}
+    last = {sid: last_date(stored[sid]) for sid in ids}
 
-@st.cache_data(ttl=12 * 60 * 60)
-def get_isac_both_csv() -> pd.DataFrame:
-    ids = f"{ISAC_ORIGINAL_ID},{ISAC_DESEASON_ID}"
-    params = {"ids": ids, "format": "csv", "limit": 1000}
+    full_ids = [sid for sid in ids if last[sid] is None]
+    frames: dict[str, pd.DataFrame] = {sid: stored[sid] for sid in ids if last[sid] is not None}
+    errors: list[Exception] = []
 
-    r = requests.get(
-        DATOS_GOB_AR_SERIES_URL,
-        params=params,
-        timeout=30,
-        headers={
-            "User-Agent": "monitor-ceu-uia/1.0 (streamlit)",
-            "Accept": "text/csv,*/*",
-        },
+    inc = {sid: d for sid, d in last.items() if d is not None}
+    for oldest, batch in batches_by_last_date(inc, DATOS_GOB_AR_BATCH_GAP):
+        since = oldest - DATOS_GOB_AR_SYNC_OVERLAP
+        try:
+            new = fetch_datos_gob_wide(batch, start_date=since.strftime("%Y-%m-%d"))
+        except Exception as e:
+            errors.append(e)
+            continue
+        for sid in batch:
+            new_s = _slice_datos_gob(new, sid)
+            if _datos_gob_is_revised(stored[sid], new_s):
+                full_ids.append(sid)
+            else:
+                frames[sid] = merge_series(stored[sid], new_s)
+
+    if full_ids:
+        try:
+            full = fetch_datos_gob_wide(full_ids)
+        except Exception as e:
+            full = None
+            errors.append(e)
+        if full is not None:
+            for sid in full_ids:
+                frames[sid] = _slice_datos_gob(full, sid)
+
+    if errors and not any(not f.empty for f in frames.values()):
+        raise errors[0]
+
+    for sid, df in frames.items():
+        if not df.empty and series_changed(stored[sid], df):
+            save_series(DATOS_GOB_AR_STORE_NS, sid, df)
+
+    empty = pd.Series(dtype="float64", index=pd.DatetimeIndex([], name="Date"))
+    wide = pd.concat(
+        [frames[sid].set_index("Date")["Value"].rename(sid) if sid in frames else empty.rename(sid) for sid in ids],
+        axis=1,
+        sort=True,
     )
+    wide = wide.rename_axis("Date").reset_index().sort_values("Date").reset_index(drop=True)
+    wide.attrs["status"] = "stale" if errors else "ok"
+    if errors:
+        wide.attrs["message"] = f"datos.gob.ar ({', '.join(ids)}) no respondió ({errors[0]}): se muestra la copia local."
+    return wide
 
-    if r.status_code != 200:
-        st.warning(f"datos.gob.ar ISAC both status={r.status_code}: {r.text[:200]}")
-        return pd.DataFrame()
-
-    df = pd.read_csv(StringIO(r.text))
-    df.columns = [c.strip() for c in df.columns]
 
-    # ✅ Caso A) columnas con nombre por ID
-    if "indice_tiempo" in df.columns and (ISAC_ORIGINAL_ID in df.columns) and (ISAC_DESEASON_ID in df.columns):
-        df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
-        return df.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
-
-    # ✅ Caso B) columnas genéricas (TU CASO)
-    if {"indice_tiempo", "isac_nivel_general", "isac_sin_estacionalidad"}.issubset(df.columns):
-        df = df.rename(
-            columns={
-                "isac_nivel_general": ISAC_ORIGINAL_ID,
-                "isac_sin_estacionalidad": ISAC_DESEASON_ID,
-            }
-        )
-        df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
-        return df.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
-
-    # ✅ Caso C) formato largo
-    if {"indice_tiempo", "serie_id", "valor"}.issubset(df.columns):
-        df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
-        df["valor"] = pd.to_numeric(df["valor"], errors="coerce")
-        wide = (
-            df.pivot(index="indice_tiempo", columns="serie_id", values="valor")
-              .reset_index()
-              .rename_axis(None, axis=1)
-        )
-        return wide.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
+@st.cache_data(ttl=12 * 60 * 60)
+def _datos_gob_wide_cached(ids: tuple[str, ...]) -> pd.DataFrame:
+    try:
+        wide = sync_datos_gob_wide(ids)
+    except Exception as e:
+        out = pd.DataFrame(columns=["Date", *ids])
+        out.attrs.update(status="error", message=f"datos.gob.ar ({', '.join(ids)}) error: {e}")
+        raise _SourceDown(out)
+    if wide.attrs.get("status") in BCRA_DEGRADED_STATUS:
+        raise _SourceDown(wide)  # copia local: se sirve, pero no se cachea 12 h
+    return wide
 
-    st.warning(f"datos.gob.ar ISAC both: formato CSV inesperado. cols={df.columns.tolist()}")
-    return pd.DataFrame()
 
+def get_datos_gob_wide(ids: tuple[str, ...]) -> pd.DataFrame:
+    """
+    Versión cacheada de sync_datos_gob_wide (una entrada por tupla de ids):
+    al vencer el TTL solo se piden las observaciones nuevas.
+    Cache: 12 h con datos frescos; copia local o vacío (fuente caída) solo
+    BCRA_DEGRADED_TTL. Si falla devuelve vacío con las columnas esperadas y
+    avisa en la app.
+    """
+    wide = _with_short_degraded(("datos_gob", tuple(ids)), _datos_gob_wide_cached, tuple(ids))
+    msg = wide.attrs.get("message")
+    if msg:
+        st.warning(msg)
+    return wide
 
 
-@st.cache_data(ttl=12 * 60 * 60)
-def get_isac_original() -> pd.DataFrame:
-    df = get_isac_both_csv()
-    if df.empty or ISAC_ORIGINAL_ID not in df.columns:
+def _slice_datos_gob(wide: pd.DataFrame, series_id: str) -> pd.DataFrame:
+    """Date, Value de una serie dentro del frame ancho."""
+    if wide is None or wide.empty or series_id not in wide.columns:
         return pd.DataFrame(columns=["Date", "Value"])
-    out = df[["indice_tiempo", ISAC_ORIGINAL_ID]].rename(columns={"indice_tiempo": "Date", ISAC_ORIGINAL_ID: "Value"})
-    return out.dropna().reset_index(drop=True)
+    return (
+        wide[["Date", series_id]]
+        .rename(columns={series_id: "Value"})
+        .dropna(subset=["Date", "Value"])
+        .reset_index(drop=True)
+    )
 
 
-@st.cache_data(ttl=12 * 60 * 60)
-def get_isac_deseasonalizado() -> pd.DataFrame:
-    df = get_isac_both_csv()
-    if df.empty or ISAC_DESEASON_ID not in df.columns:
-        return pd.DataFrame(columns=["Date", "Value"])
-    out = df[["indice_tiempo", ISAC_DESEASON_ID]].rename(columns={"indice_tiempo": "Date", ISAC_DESEASON_ID: "Value"})
-    return out.dropna().reset_index(drop=True)
+def get_datos_gob_series(series_id: str) -> pd.DataFrame:
+    """
+    Descarga una serie puntual desde datos.gob.ar.
+    Sin cache propio: el corte es barato y get_datos_gob_wide ya decide
+    cuánto se recuerda (12 h fresco, poco si la fuente está caída).
+    """
+    return _slice_datos_gob(get_datos_gob_wide((series_id,)), series_id)
 
 
 # ============================================================
-# DATOS.GOB.AR — IPI Manufacturero (INDEC)
+# DATOS.GOB.AR — EMAE / ISAC / IPI Manufacturero (INDEC)
+# Todos salen del mismo frame ancho (ACTIVIDAD_SERIES_IDS); sin cache
+# propio para no guardar 12 h un frame degradado
 # ============================================================
+def get_emae_original() -> pd.DataFrame:
+    return _slice_datos_gob(get_datos_gob_wide(ACTIVIDAD_SERIES_IDS), EMAE_ORIGINAL_ID)
 
-IPI_MANUF_ORIGINAL_ID = "453.1_SERIE_ORIGNAL_0_0_14_46"
-IPI_MANUF_DESEASON_ID = "453.1_SERIE_DESEADA_0_0_24_58"
-
-@st.cache_data(ttl=12 * 60 * 60)
-def get_ipi_manuf_both_csv() -> pd.DataFrame:
-    ids = f"{IPI_MANUF_ORIGINAL_ID},{IPI_MANUF_DESEASON_ID}"
-    params = {"ids": ids, "format": "csv", "limit": 1000}
 
-    r = requests.get(
-        DATOS_GOB_AR_SERIES_URL,
-        params=params,
-        timeout=30,
-        headers={
-            "User-Agent": "monitor-ceu-uia/1.0 (streamlit)",
-            "Accept": "text/csv,*/*",
-        },
-    )
-
-    if r.status_code != 200:
-        st.warning(f"datos.gob.ar IPI manuf both status={r.status_code}: {r.text[:200]}")
-        return pd.DataFrame()
+def get_emae_deseasonalizado() -> pd.DataFrame:
+    return _slice_datos_gob(get_datos_gob_wide(ACTIVIDAD_SERIES_IDS), EMAE_DESEASON_ID)
 
-    df = pd.read_csv(StringIO(r.text))
-    df.columns = [c.strip() for c in df.columns]
 
-    # ✅ Caso A) columnas con nombre por ID
-    if "indice_tiempo" in df.columns and (IPI_MANUF_ORIGINAL_ID in df.columns) and (IPI_MANUF_DESEASON_ID in df.columns):
-        df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
-        return df.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
-
-    # ✅ Caso B) columnas genéricas (TU CASO)
-    if {"indice_tiempo", "serie_original", "serie_desestacionalizada"}.issubset(df.columns):
-        df = df.rename(
-            columns={
-                "serie_original": IPI_MANUF_ORIGINAL_ID,
-                "serie_desestacionalizada": IPI_MANUF_DESEASON_ID,
-            }
-        )
-        df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
-        return df.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
-
-    # ✅ Caso C) formato largo
-    if {"indice_tiempo", "serie_id", "valor"}.issubset(df.columns):
-        df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
-        df["valor"] = pd.to_numeric(df["valor"], errors="coerce")
-        wide = (
-            df.pivot(index="indice_tiempo", columns="serie_id", values="valor")
-              .reset_index()
-              .rename_axis(None, axis=1)
-        )
-        return wide.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
+def get_isac_original() -> pd.DataFrame:
+    return _slice_datos_gob(get_datos_gob_wide(ACTIVIDAD_SERIES_IDS), ISAC_ORIGINAL_ID)
 
-    st.warning(f"datos.gob.ar IPI manuf both: formato CSV inesperado. cols={df.columns.tolist()}")
-    return pd.DataFrame()
 
+def get_isac_deseasonalizado() -> pd.DataFrame:
+    return _slice_datos_gob(get_datos_gob_wide(ACTIVIDAD_SERIES_IDS), ISAC_DESEASON_ID)
 
 
-@st.cache_data(ttl=12 * 60 * 60)
 def get_ipi_manuf_original() -> pd.DataFrame:
-    df = get_ipi_manuf_both_csv()
-    if df.empty or IPI_MANUF_ORIGINAL_ID not in df.columns:
-        return pd.DataFrame(columns=["Date", "Value"])
-    out = df[["indice_tiempo", IPI_MANUF_ORIGINAL_ID]].rename(
-        columns={"indice_tiempo": "Date", IPI_MANUF_ORIGINAL_ID: "Value"}
-    )
-    return out.dropna().reset_index(drop=True)
+    return _slice_datos_gob(get_datos_gob_wide(ACTIVIDAD_SERIES_IDS), IPI_MANUF_ORIGINAL_ID)
 
 
-@st.cache_data(ttl=12 * 60 * 60)
 def get_ipi_manuf_deseasonalizado() -> pd.DataFrame:
-    df = get_ipi_manuf_both_csv()
-    if df.empty or IPI_MANUF_DESEASON_ID not in df.columns:
-        return pd.DataFrame(columns=["Date", "Value"])
-    out = df[["indice_tiempo", IPI_MANUF_DESEASON_ID]].rename(
-        columns={"indice_tiempo": "Date", IPI_MANUF_DESEASON_ID: "Value"}
-    )
-    return out.dropna().reset_index(drop=True)
+    return _slice_datos_gob(get_datos_gob_wide(ACTIVIDAD_SERIES_IDS), IPI_MANUF_DESEASON_ID)
 
 
 # ============================================================
@@ -672,15 +1327,9 @@ def get_ipi_minero_excel_long() -> pd.DataFrame:
       - H: serie sin estacionalidad (nivel general, números índice)
     """
     try:
-        r = requests.get(IPI_MINERO_XLSX_URL, timeout=60)
-        r.raise_for_status()
-
-        raw = pd.read_excel(
-            BytesIO(r.content),
-            sheet_name=IPI_MINERO_SHEET,
-            header=None,
-            engine="openpyxl",
-        )
+        content = http_client.get_bytes(IPI_MINERO_XLSX_URL, profile="indec")
+
+        raw = excel_io.read_excel(content, sheet_name=IPI_MINERO_SHEET, header=None)
 
         # fila 9 -> índice 8 (0-based)
         df = raw.iloc[8:, :].copy()
@@ -767,48 +1416,49 @@ EMAE_SECTORES_CSV_URL = (
     "download/emae-apertura-por-sectores-valores-mensuales-indice-base-2004.csv"
 )
 
-@st.cache_data(ttl=12 * 60 * 60)
+@swr_cache(ttl=12 * 60 * 60)
 def get_emae_sectores_wide() -> pd.DataFrame:
     """
     Descarga EMAE apertura por sectores (serie original, índice base 2004) en formato ancho.
     Columnas: indice_tiempo + sectores.
+    Stale-while-revalidate: si la descarga falla se sigue sirviendo la última buena.
+    Sin st.* adentro: el refresh corre en un hilo sin contexto de Streamlit;
+    los errores se propagan y avisa get_emae_sectores_long.
     """
-    try:
-        r = requests.get(
-            EMAE_SECTORES_CSV_URL,
-            timeout=30,
-            headers={"User-Agent": "monitor-ceu-uia/1.0 (streamlit)"},
-        )
-        r.raise_for_status()
+    r = http_client.get(EMAE_SECTORES_CSV_URL, profile="datos_gob")
+    r.raise_for_status()
 
-        df = pd.read_csv(StringIO(r.text))
-        df.columns = [c.strip() for c in df.columns]
+    df = pd.read_csv(StringIO(r.text))
+    df.columns = [c.strip() for c in df.columns]
 
-        if "indice_tiempo" not in df.columns:
-            st.warning(f"EMAE sectores: CSV inesperado. cols={df.columns.tolist()}")
-            return pd.DataFrame()
+    if "indice_tiempo" not in df.columns:
+        raise ValueError(f"CSV inesperado. cols={df.columns.tolist()}")
 
-        df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
-        df = df.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
+    df["indice_tiempo"] = pd.to_datetime(df["indice_tiempo"], errors="coerce")
+    df = df.dropna(subset=["indice_tiempo"]).sort_values("indice_tiempo")
 
-        # numeric all sector cols
-        for c in df.columns:
-            if c != "indice_tiempo":
-                df[c] = pd.to_numeric(df[c], errors="coerce")
+    # numeric all sector cols
+    for c in df.columns:
+        if c != "indice_tiempo":
+            df[c] = pd.to_numeric(df[c], errors="coerce")
 
-        return df.reset_index(drop=True)
+    return df.reset_index(drop=True)
 
-    except Exception as e:
-        st.warning(f"EMAE sectores CSV error: {e}")
-        return pd.DataFrame()
 
-@st.cache_data(ttl=12 * 60 * 60)
 def get_emae_sectores_long() -> pd.DataFrame:
     """
     Devuelve formato largo:
       Date, Sector, Value
+    Sin st.cache_data encima: guardaría la copia stale del swr otras 12 h.
     """
-    wide = get_emae_sectores_wide()
+    try:
+        wide = get_emae_sectores_wide()
+    except Exception as e:
+        st.warning(f"EMAE sectores CSV error: {e}")
+        return pd.DataFrame(columns=["Date", "Sector", "Value"])
+
+    if get_emae_sectores_wide.last_error() is not None:
+        st.warning("EMAE sectores: no se pudo actualizar, se muestra la última copia disponible.")
     if wide is None or wide.empty:
         return pd.DataFrame(columns=["Date", "Sector", "Value"])
 
@@ -1,9 +1,24 @@
 # services/market_data.py
 from __future__ import annotations
 
+import threading
+import time
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from services import excel_io, http_cache
+from services.cache import singleflight, swr_cache
+from services.series_store import (
+    batches_by_last_date,
+    last_date,
+    load_series,
+    merge_series,
+    save_series,
+    series_changed,
+)
+
 # yfinance opcional
 try:
     import yfinance as yf
@@ -11,92 +26,21 @@ except Exception:
     yf = None
 
 
-
-
-
-import time
-
-def _history_one(ticker: str, start: str) -> pd.DataFrame:
-    if yf is None:
-        raise RuntimeError("yfinance no está disponible (pip install yfinance).")
-
-    t = yf.Ticker(ticker)
-
-    last_err = None
-    for _ in range(2):  # 2 intentos
-        try:
-            df = t.history(start=start, auto_adjust=False)  # daily
-            if df is None or df.empty:
-                raise RuntimeError(f"Yahoo devolvió vacío para {ticker}")
-            df = df.copy()
-
-            idx = pd.to_datetime(df.index, errors="coerce")
-            # quitar tz solo si existe
-            try:
-                if getattr(idx, "tz", None) is not None:
-                    idx = idx.tz_convert(None)
-            except Exception:
-                try:
-                    idx = idx.tz_localize(None)
-                except Exception:
-                    pass
-
-            df.index = idx
-            return df
-
-        except Exception as e:
-            last_err = e
-            time.sleep(0.3)  # micro pausa
-
-    # IMPORTANTE: tirar error para NO cachear vacío
-    raise RuntimeError(f"history() falló para {ticker}: {last_err}")
-
-
-
-def _pick_price_single(df: pd.DataFrame, prefer_adj: bool = False) -> pd.Series:
-    if df is None or df.empty:
-        return pd.Series(dtype="float64")
-    if prefer_adj and "Adj Close" in df.columns:
-        return df["Adj Close"].astype("float64")
-    if "Close" in df.columns:
-        return df["Close"].astype("float64")
-    # fallback
-    for c in ["Adj Close", "Open", "High", "Low"]:
-        if c in df.columns:
-            return df[c].astype("float64")
-    raise KeyError(f"No encuentro columnas de precio. cols={list(df.columns)}")
-
-
-@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
 def get_ypf_ars_history(start: str = "2000-01-01", prefer_adj: bool = False) -> pd.Series:
-    df = _history_one("YPFD.BA", start=start)
-    s = _pick_price_single(df, prefer_adj=prefer_adj)
-    s.name = "YPF_ARS"
-    return s.dropna()
+    # del panel del hub (mismo sync batcheado), sin descarga propia
+    return hub_series("YPFD.BA", adjusted=prefer_adj, start=start).dropna().rename("YPF_ARS")
 
 
-@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
 def get_ypf_usd_history(start: str = "1993-01-01", prefer_adj: bool = False) -> pd.Series:
-    df = _history_one("YPF", start=start)
-    s = _pick_price_single(df, prefer_adj=prefer_adj)
-    s.name = "YPF_USD"
-    return s.dropna()
+    return hub_series("YPF", adjusted=prefer_adj, start=start).dropna().rename("YPF_USD")
 
 
-@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
 def get_ccl_ypf_history(start: str = "2000-01-01", prefer_adj: bool = False) -> pd.Series:
     """
-    CCL proxy diario: YPFD.BA (ARS) / YPF (USD)
+    CCL proxy diario: YPFD.BA (ARS) / YPF (USD), desde start.
+    Recorte de la serie canónica (get_ccl_ypf): sin descarga propia. Solo lectura.
     """
-    s_ars = get_ypf_ars_history(start=start, prefer_adj=prefer_adj)
-    s_usd = get_ypf_usd_history(start="1993-01-01", prefer_adj=prefer_adj)
-
-    df = pd.concat([s_ars, s_usd], axis=1, join="inner").dropna()
-    df["CCL_YPF"] = df["YPF_ARS"] / df["YPF_USD"]
-
-    out = df["CCL_YPF"].replace([float("inf"), -float("inf")], pd.NA).dropna()
-    out.name = "CCL_YPF"
-    return out
+    return get_ccl_ypf(adjusted=prefer_adj).loc[pd.Timestamp(start):]
 
 
 def get_ccl_ypf_df(start: str = "2000-01-01", prefer_adj: bool = False) -> pd.DataFrame:
@@ -104,83 +48,41 @@ def get_ccl_ypf_df(start: str = "2000-01-01", prefer_adj: bool = False) -> pd.Da
     Devuelve DataFrame con columnas Date, value (estándar para tus plots).
     """
     s = get_ccl_ypf_history(start=start, prefer_adj=prefer_adj)
-    return s.rename("value").reset_index().rename(columns={"index": "Date"})
+    return pd.DataFrame({"Date": s.index, "value": s.to_numpy()})
 
 
-import time
+def _period_start(period: str, last: pd.Timestamp):
+    """"5y" / "6mo" / "10d" / "max" (convención yfinance) -> fecha de corte."""
+    p = str(period).strip().lower()
+    if p in ("max", "", "none"):
+        return None
+    if p.endswith("mo"):
+        return last - pd.DateOffset(months=int(p[:-2]))
+    if p.endswith("y"):
+        return last - pd.DateOffset(years=int(p[:-1]))
+    if p.endswith("wk"):
+        return last - pd.DateOffset(weeks=int(p[:-2]))
+    if p.endswith("d"):
+        return last - pd.DateOffset(days=int(p[:-1]))
+    return None
+
 
-@st.cache_data(ttl=60 * 60, show_spinner=False)
 def get_ccl_ypf_df_fast(period: str = "2y", prefer_adj: bool = False) -> pd.DataFrame:
     """
-    CCL proxy diario liviano (igual estilo que macro_home):
-    usa yf.download con period corto para evitar history(start=1993).
+    CCL proxy diario YPFD.BA / YPF: recorte de la serie canónica (get_ccl_ypf).
+    period recorta al estilo yfinance ("2y", "5y", "max").
     Devuelve DataFrame: Date, value
     """
-    if yf is None:
+    s = get_ccl_ypf(adjusted=prefer_adj)
+    if s.empty:
         return pd.DataFrame(columns=["Date", "value"])
 
-    def _get_close(dl, ticker: str) -> pd.Series:
-        # dl es DataFrame con MultiIndex cols cuando pedís varios tickers
-        # Queremos Close de cada ticker
-        if dl is None or dl.empty:
-            return pd.Series(dtype="float64")
-
-        if isinstance(dl.columns, pd.MultiIndex):
-            # formato: (campo, ticker) o (ticker, campo) depende
-            if ("Close", ticker) in dl.columns:
-                s = dl[("Close", ticker)]
-            elif (ticker, "Close") in dl.columns:
-                s = dl[(ticker, "Close")]
-            else:
-                # fallback: buscar "Close" en el segundo nivel
-                candidates = [c for c in dl.columns if "Close" in c]
-                s = dl[candidates[0]] if candidates else pd.Series(dtype="float64")
-        else:
-            # si viniera plano (raro en multi-ticker), probar Close
-            s = dl["Close"] if "Close" in dl.columns else pd.Series(dtype="float64")
-
-        s = s.copy()
-        s.index = pd.to_datetime(s.index, errors="coerce")
-        try:
-            s.index = s.index.tz_localize(None)
-        except Exception:
-            pass
-        s.index = s.index.normalize()
-        return pd.to_numeric(s, errors="coerce").dropna()
-
-    last_err = None
-    for _ in range(2):  # reintento rápido
-        try:
-            dl = yf.download(
-                ["YPFD.BA", "YPF"],
-                period=period,
-                progress=False,
-                auto_adjust=False,
-                group_by="column",
-                threads=False,     # clave: no más subthreads
-            )
-            s_ars = _get_close(dl, "YPFD.BA")
-            s_usd = _get_close(dl, "YPF")
-
-            df = pd.concat([s_ars.rename("YPF_ARS"), s_usd.rename("YPF_USD")], axis=1).dropna()
-            if df.empty:
-                raise RuntimeError("download devolvió vacío para YPFD.BA/YPF")
-
-            df["value"] = (df["YPF_ARS"] / df["YPF_USD"]).replace([float("inf"), -float("inf")], pd.NA)
-            out = df[["value"]].dropna().reset_index().rename(columns={"index": "Date"})
-            return out
-
-        except Exception as e:
-            last_err = e
-            time.sleep(0.25)
-
-    # No caches vacío “silencioso”: devolvemos vacío pero con columnas
-    return pd.DataFrame(columns=["Date", "value"])
-
-
+    start = _period_start(period, s.index[-1])
+    if start is not None:
+        s = s.loc[start:]
+    return pd.DataFrame({"Date": s.index, "value": s.to_numpy()})
 
 
-@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
 def get_ticker_history(
     ticker: str,
     start: str = "2000-01-01",
@@ -188,12 +90,9 @@ def get_ticker_history(
 ) -> pd.Series:
     """
     Serie diaria (Close o Adj Close) para cualquier ticker de Yahoo.
-    NO toca tus funciones existentes.
+    El ticker entra al registro del hub: sin descarga ni sync propios.
     """
-    df = _history_one(ticker, start=start)
-    s = _pick_price_single(df, prefer_adj=prefer_adj)
-    s.name = ticker
-    return s.dropna()
+    return hub_series(ticker, adjusted=prefer_adj, start=start).dropna()
 
 
 def series_to_df(s: pd.Series) -> pd.DataFrame:
@@ -210,7 +109,6 @@ def get_ticker_df(
     return series_to_df(get_ticker_history(ticker, start=start, prefer_adj=prefer_adj))
 
 
-@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
 def get_ratio_history(
     num_ticker: str,
     den_ticker: str,
@@ -220,73 +118,692 @@ def get_ratio_history(
 ) -> pd.Series:
     """
     Ratio diario: num/den (ej: ARS/BRL, CCL proxy, etc.)
-    NO reemplaza tu CCL; solo lo complementa.
+    NO reemplaza tu CCL; solo lo complementa. Sale del motor de cruces
+    (cross_panel + cross_ratio): sin alineación ni cache propios por par.
+    """
+    panel = cross_panel((num_ticker, den_ticker), adjusted=prefer_adj, start=start)
+    return cross_ratio(panel, num_ticker, den_ticker, name=name)
+
+
+# ============================================================
+# Market data hub (Yahoo)
+#   - registro único de tickers que usa la app (MARKET_TICKERS + register_tickers)
+#   - historia OHLC por ticker en disco (services.series_store, YAHOO_STORE_NS):
+#     cada ciclo (HUB_TTL) yf.download batcheados desde la última fecha
+#     guardada - YAHOO_SYNC_OVERLAP (un batch por grupo de fechas parecidas);
+#     la historia completa solo la primera vez
+#   - panel ancho Date x ticker por campo (Close / Adj Close), float64 en un bloque
+#   - las páginas leen vistas de columnas (hub_series) o Date/value (hub_df);
+#     el panel es compartido: tratarlo como solo lectura
+# ============================================================
+HUB_TTL = 15 * 60
+HUB_FIELDS = ("Close", "Adj Close")
+
+YAHOO_STORE_NS = "yahoo"
+YAHOO_OHLC = ("Open", "High", "Low", "Close", "Adj Close", "Volume")
+YAHOO_SYNC_OVERLAP = pd.Timedelta(days=7)  # barras que se vuelven a pedir (correcciones)
+YAHOO_REVISION_RTOL = 1e-4  # Close/Adj Close que cambian más que esto => split/dividendo
+YAHOO_BATCH_GAP = pd.Timedelta(days=7)  # últimas fechas más separadas => otro batch incremental
+YAHOO_STALE_AFTER = pd.Timedelta(days=30)  # sin barras nuevas hace tanto (vs. el resto) => discontinuado
+YAHOO_STALE_RETRY = 6 * 60 * 60  # seg sin volver a pedir un ticker discontinuado o inexistente
+
+# visor de precios (finanzas)
+TAPE_TICKERS = (
+    "ARS=X", "BRL=X", "DX-Y.NYB", "^GSPC", "^MERV", "EWZ",
+    "FXI", "BTC-USD", "CL=F", "GC=F", "ZS=F", "ZW=F",
+)
+# CCL proxy (YPFD.BA / YPF)
+CCL_TICKERS = ("YPFD.BA", "YPF")
+# ADRs argentinos (finanzas: Merval USD + ADRs)
+ADR_TICKERS = (
+    "BBAR", "BMA", "CAAP", "CEPU", "CRESY", "EDN", "GGAL", "GLOB", "IRS",
+    "LOMA", "MELI", "PAM", "SUPV", "TEO", "TGS", "TS", "TX", "YPF",
+)
+MARKET_TICKERS = tuple(dict.fromkeys(TAPE_TICKERS + CCL_TICKERS + ADR_TICKERS))
+
+_registry: list[str] = list(MARKET_TICKERS)
+_registry_lock = threading.Lock()
+
+# (panel del swr, ese panel + tickers registrados después de su refresh)
+_extended: tuple[dict, dict] | None = None
+# historias que no se pudieron guardar en disco (store de respaldo en memoria)
+_yahoo_mem: dict[str, pd.DataFrame] = {}
+# ticker -> monotonic en que se lo dio por discontinuado (ver YAHOO_STALE_RETRY)
+_yahoo_stale: dict[str, float] = {}
+_extend_lock = threading.Lock()
+
+
+def register_tickers(*tickers: str) -> None:
+    """
+    Suma tickers al registro: se agregan al panel vigente en la próxima lectura
+    y desde el refresh siguiente entran en la descarga batcheada.
+    """
+    with _registry_lock:
+        for t in tickers:
+            if t and t not in _registry:
+                _registry.append(t)
+
+
+def _norm_date_index(idx) -> pd.DatetimeIndex:
+    idx = pd.DatetimeIndex(pd.to_datetime(idx, errors="coerce"))
+    if idx.tz is not None:
+        idx = idx.tz_convert(None)
+    return idx.normalize()
+
+
+def _field_wide(dl: pd.DataFrame, field: str, tickers: tuple) -> pd.DataFrame:
+    """Un campo de yf.download (group_by="column") como Date x ticker float64."""
+    if isinstance(dl.columns, pd.MultiIndex):
+        if field in dl.columns.get_level_values(0):
+            wide = dl[field]
+        elif field in dl.columns.get_level_values(1):
+            wide = dl.xs(field, axis=1, level=1)
+        else:
+            wide = pd.DataFrame(index=dl.index)
+    else:
+        # un solo ticker: columnas planas
+        wide = dl[[field]].set_axis([tickers[0]], axis=1) if field in dl.columns else pd.DataFrame(index=dl.index)
+
+    wide = wide.reindex(columns=list(tickers)).apply(pd.to_numeric, errors="coerce")
+    idx = _norm_date_index(wide.index)
+    keep = ~(idx.isna() | idx.duplicated(keep="last"))
+    wide = wide[keep]
+    wide.index = idx[keep]
+    return _as_block(wide.sort_index(), tickers)
+
+
+def _as_block(wide: pd.DataFrame, tickers: tuple) -> pd.DataFrame:
+    """Date x ticker float64 en un solo bloque Fortran (columnas = vistas sin copia)."""
+    wide = wide.reindex(columns=list(tickers))
+    values = np.asfortranarray(wide.to_numpy(dtype="float64"))
+    return pd.DataFrame(values, index=wide.index.rename("Date"), columns=list(tickers), copy=False)
+
+
+class _YahooEmpty(RuntimeError):
+    """yf.download respondió sin filas para todo el batch (no es un error de red)."""
+
+
+def _download_panel(tickers: tuple, **kwargs) -> dict[str, pd.DataFrame]:
+    if yf is None:
+        raise RuntimeError("yfinance no está disponible (pip install yfinance).")
+
+    dl = yf.download(
+        tickers=list(tickers),
+        interval="1d",
+        auto_adjust=False,
+        group_by="column",
+        progress=False,
+        threads=True,
+        **kwargs,
+    )
+    if dl is None or dl.empty:
+        raise _YahooEmpty(f"Yahoo devolvió vacío para {len(tickers)} tickers")
+
+    return {f: _field_wide(dl, f, tickers) for f in YAHOO_OHLC}
+
+
+def _ticker_frame(panel: dict[str, pd.DataFrame], ticker: str) -> pd.DataFrame:
+    """Date + OHLC de un ticker del panel descargado (sin las fechas en que no operó)."""
+    df = pd.DataFrame({f: panel[f][ticker].to_numpy() for f in YAHOO_OHLC}, index=panel["Close"].index)
+    return df.dropna(subset=["Close"]).rename_axis("Date").reset_index()
+
+
+def _yahoo_is_revised(old: pd.DataFrame, new: pd.DataFrame) -> bool:
+    """
+    True si en el solapamiento cambió un cierre ya guardado: Yahoo reescribe
+    toda la historia ante splits (Close) y dividendos (Adj Close), así que el
+    merge incremental quedaría con dos escalas. La última barra guardada no
+    cuenta (puede haber sido parcial, intradiaria).
+    """
+    if new.empty:
+        return False
+    both = old.merge(new, on="Date", suffixes=("_old", "_new"))
+    both = both[both["Date"] < last_date(old)]
+    for f in ("Close", "Adj Close"):
+        a = both[f"{f}_old"].to_numpy(dtype="float64")
+        b = both[f"{f}_new"].to_numpy(dtype="float64")
+        ok = ~(np.isnan(a) | np.isnan(b))
+        if not np.allclose(a[ok], b[ok], rtol=YAHOO_REVISION_RTOL, atol=0):
+            return True
+    return False
+
+
+def _load_yahoo(ticker: str) -> pd.DataFrame | None:
+    df = load_series(YAHOO_STORE_NS, ticker)
+    return df if df is not None else _yahoo_mem.get(ticker)
+
+
+def _yahoo_gave_up(ticker: str) -> bool:
+    ts = _yahoo_stale.get(ticker)
+    return ts is not None and time.monotonic() - ts < YAHOO_STALE_RETRY
+
+
+def _sync_yahoo_batch(tickers: list, frames: dict, fresh: set, seen: dict, errors: list, **kwargs) -> list:
+    """
+    Un yf.download para tickers; mergea en frames (full: reemplaza), anota en
+    seen {ticker: última barra conocida o None} y devuelve los tickers cuya
+    historia cambió de escala (split / dividendo).
+    """
+    try:
+        new = _download_panel(tuple(tickers), **kwargs)
+    except _YahooEmpty:
+        new = {f: _as_block(pd.DataFrame(index=pd.DatetimeIndex([], name="Date")), tuple(tickers)) for f in YAHOO_OHLC}
+    except Exception as e:
+        errors.append(e)
+        return []
+
+    revised = []
+    for t in tickers:
+        new_t = _ticker_frame(new, t)
+        old = frames.get(t)
+        if new_t.empty:
+            seen[t] = last_date(old)
+            continue
+        seen[t] = max(d for d in (last_date(old), last_date(new_t)) if d is not None)
+        if "period" not in kwargs and old is not None and _yahoo_is_revised(old, new_t):
+            revised.append(t)
+            continue
+        merged = new_t if "period" in kwargs else merge_series(old, new_t)
+        if series_changed(old, merged):
+            frames[t] = merged
+            fresh.add(t)
+    return revised
+
+
+def sync_yahoo_history(tickers) -> dict[str, pd.DataFrame]:
+    """
+    {ticker: Date + OHLC} contra el store local por ticker (YAHOO_STORE_NS):
+
+      - tickers sin store: historia completa (period="max"), en un solo batch
+      - tickers con store: un batch por grupo de última fecha parecida
+        (batches_by_last_date, YAHOO_BATCH_GAP) desde esa fecha - YAHOO_SYNC_OVERLAP;
+        en fechas repetidas gana lo nuevo. Un ticker atrasado va en su propio batch
+      - si en el solapamiento cambió un cierre (split / dividendo) ese ticker
+        se vuelve a bajar completo
+      - un ticker sin barras (inexistente) o sin barras nuevas hace YAHOO_STALE_AFTER
+        respecto del resto (discontinuado) no se pide por YAHOO_STALE_RETRY
+      - solo se reescribe el archivo si el sync agregó o cambió filas
+
+    Si Yahoo falla se sirve lo guardado; solo tira error si no hay nada.
+    Con disco de solo lectura lo sincronizado queda en memoria (_yahoo_mem):
+    la ventana sigue siendo incremental, no la historia completa por ciclo.
+    """
+    tickers = tuple(dict.fromkeys(tickers))
+    stored = {t: _load_yahoo(t) for t in tickers}
+    frames = {t: stored[t] for t in tickers if last_date(stored[t]) is not None}
+    active = [t for t in tickers if not _yahoo_gave_up(t)]
+
+    full = [t for t in active if t not in frames]
+    inc = {t: last_date(frames[t]) for t in active if t in frames}
+    fresh: set[str] = set()
+    seen: dict[str, pd.Timestamp | None] = {}
+    errors: list[Exception] = []
+
+    for oldest, batch in batches_by_last_date(inc, YAHOO_BATCH_GAP):
+        since = oldest - YAHOO_SYNC_OVERLAP
+        full += _sync_yahoo_batch(batch, frames, fresh, seen, errors, start=since.strftime("%Y-%m-%d"))
+
+    if full:
+        _sync_yahoo_batch(full, frames, fresh, seen, errors, period="max")
+
+    # inexistente (sin barras) o discontinuado (la última barra quedó muy atrás
+    # de la del resto). Se compara contra otros tickers, no contra hoy: un
+    # vacío general es un problema de Yahoo, no del ticker
+    newest = max((d for d in seen.values() if d is not None), default=None)
+    if newest is not None:
+        now = time.monotonic()
+        for t, d in seen.items():
+            if d is None or d < newest - YAHOO_STALE_AFTER:
+                _yahoo_stale[t] = now
+            else:
+                _yahoo_stale.pop(t, None)
+
+    for t in fresh:
+        if save_series(YAHOO_STORE_NS, t, frames[t]):
+            _yahoo_mem.pop(t, None)
+        else:
+            _yahoo_mem[t] = frames[t]
+
+    if not frames and errors:
+        raise errors[0]
+    return frames
+
+
+def _panel_from_frames(frames: dict[str, pd.DataFrame], tickers: tuple) -> dict[str, pd.DataFrame]:
+    """HUB_FIELDS como Date x ticker (unión de fechas) desde las historias por ticker."""
+    have = [t for t in tickers if t in frames and not frames[t].empty]
+    panel = {}
+    for f in HUB_FIELDS:
+        if have:
+            wide = pd.concat({t: frames[t].set_index("Date")[f] for t in have}, axis=1).sort_index()
+        else:
+            wide = pd.DataFrame(index=pd.DatetimeIndex([], name="Date"))
+        panel[f] = _as_block(wide, tickers)
+    return panel
+
+
+def _panel_is_good(panel) -> bool:
+    return panel is not None and not panel["Close"].empty
+
+
+@swr_cache(ttl=HUB_TTL, is_good=_panel_is_good)
+def _hub_panel() -> dict[str, pd.DataFrame]:
+    # clave única y estable: cada refresh sincroniza el registro vigente
+    with _registry_lock:
+        tickers = tuple(_registry)
+    return _panel_from_frames(sync_yahoo_history(tickers), tickers)
+
+
+def _missing_tickers(panel: dict[str, pd.DataFrame]) -> tuple:
+    have = panel["Close"].columns
+    with _registry_lock:
+        return tuple(t for t in _registry if t not in have)
+
+
+def _extend_panel(panel: dict[str, pd.DataFrame], tickers: tuple) -> dict[str, pd.DataFrame]:
+    """Panel nuevo = panel + columnas de tickers (solo esos se sincronizan)."""
+    try:
+        new = _panel_from_frames(sync_yahoo_history(tickers), tickers)
+    except Exception:
+        # sin datos: columnas vacías; se reintentan en el próximo refresh del hub
+        new = _panel_from_frames({}, tickers)
+    cols = tuple(panel["Close"].columns) + tickers
+    return {f: _as_block(pd.concat([panel[f], new[f]], axis=1).sort_index(), cols) for f in HUB_FIELDS}
+
+
+def hub_panel() -> dict[str, pd.DataFrame]:
+    """
+    {campo: Date x ticker} para todo el registro (una descarga por ciclo).
+    Un ticker registrado después del último refresh se suma al panel vigente
+    sincronizando solo ese ticker; el refresh siguiente ya lo trae en el batch.
+    """
+    global _extended
+    base = _hub_panel()
+    ext = _extended
+    panel = ext[1] if ext is not None and ext[0] is base else base
+    if not _missing_tickers(panel):
+        return panel
+
+    with _extend_lock:
+        ext = _extended
+        panel = ext[1] if ext is not None and ext[0] is base else base
+        missing = _missing_tickers(panel)
+        if missing:
+            panel = _extend_panel(panel, missing)
+            _extended = (base, panel)
+        return panel
+
+
+def _panel_series(panel: dict[str, pd.DataFrame], ticker: str, adjusted: bool = False) -> pd.Series:
+    close = panel["Close"]
+    if ticker not in close.columns:
+        return pd.Series(dtype="float64", name=ticker)
+    j = close.columns.get_loc(ticker)
+
+    values = close.to_numpy()[:, j]
+    if adjusted:
+        adj = panel["Adj Close"].to_numpy()[:, j]
+        if not np.isnan(adj).all():
+            values = adj
+
+    return pd.Series(values, index=close.index, name=ticker, copy=False)
+
+
+def hub_series(ticker: str, adjusted: bool = False, start=None) -> pd.Series:
+    """
+    Columna del panel para ticker como vista (sin copia), indexada por Date.
+    Tiene NaN en fechas donde operó otro ticker y este no. adjusted=True usa
+    Adj Close (si Yahoo no lo trae para ese ticker, Close).
+    """
+    register_tickers(ticker)
+    try:
+        panel = hub_panel()
+    except Exception:
+        return pd.Series(dtype="float64", name=ticker)
+
+    s = _panel_series(panel, ticker, adjusted=adjusted)
+    if start is not None:
+        s = s.loc[pd.Timestamp(start):]
+    return s
+
+
+def hub_df(ticker: str, adjusted: bool = False, start=None) -> pd.DataFrame:
+    """hub_series sin NaN en formato estándar Date, value."""
+    s = hub_series(ticker, adjusted=adjusted, start=start).dropna()
+    return pd.DataFrame({"Date": s.index, "value": s.to_numpy()})
+
+
+# ============================================================
+# Ticker tape (finanzas): snapshot último / anterior cierre
+#   - descarga chica y propia (TAPE_PERIOD): el tape no espera al sync del hub,
+#     que en frío baja la historia completa de todo el registro; es la única
+#     descarga Yahoo fuera del hub y trae pocas barras por ticker
+#   - un hilo daemon la refresca cada TAPE_REFRESH para cada set de tickers
+#     leído en los últimos TAPE_IDLE seg; sin lecturas el hilo termina y la
+#     próxima lectura lo vuelve a arrancar
+#   - si Yahoo falla queda el último snapshot bueno
+# ============================================================
+TAPE_REFRESH = 3 * 60
+TAPE_IDLE = 15 * 60
+TAPE_PERIOD = "10d"
+
+# (tickers, adjusted) -> {"snap": {ticker: (último, anterior)}, "read": monotonic}
+_tape: dict[tuple, dict] = {}
+_tape_lock = threading.Lock()
+_tape_thread: threading.Thread | None = None
+
+
+def _last_prev(values: np.ndarray) -> tuple[float | None, float | None]:
+    v = values[~np.isnan(values)]
+    last = float(v[-1]) if len(v) else None
+    prev = float(v[-2]) if len(v) >= 2 else None
+    return last, prev
+
+
+@singleflight
+def _fetch_tape(tickers: tuple, adjusted: bool) -> dict[str, tuple[float | None, float | None]]:
+    panel = _download_panel(tickers, period=TAPE_PERIOD)
+    return {t: _last_prev(_panel_series(panel, t, adjusted=adjusted).to_numpy()) for t in tickers}
+
+
+def _refresh_tape(key: tuple) -> None:
+    try:
+        snap = _fetch_tape(*key)
+    except Exception:
+        return  # queda el último bueno
+    if not any(last is not None for last, _ in snap.values()):
+        return
+    with _tape_lock:
+        entry = _tape.get(key)
+        if entry is not None:
+            entry["snap"] = snap
+
+
+def _tape_loop() -> None:
+    global _tape_thread
+    while True:
+        time.sleep(TAPE_REFRESH)
+        now = time.monotonic()
+        with _tape_lock:
+            keys = [k for k, e in _tape.items() if now - e["read"] < TAPE_IDLE]
+            if not keys:
+                _tape_thread = None
+                return
+        for key in keys:
+            _refresh_tape(key)
+
+
+def _ensure_tape_thread() -> None:
+    global _tape_thread
+    with _tape_lock:
+        if _tape_thread is None:
+            _tape_thread = threading.Thread(target=_tape_loop, name="tape-refresh", daemon=True)
+            _tape_thread.start()
+
+
+def get_tape_snapshot(tickers=TAPE_TICKERS, adjusted: bool = True) -> dict[str, tuple[float | None, float | None]]:
+    """
+    {ticker: (último cierre, cierre anterior)} para el visor de precios.
+    Solo la primera lectura de cada set de tickers espera la descarga chica;
+    después se lee el snapshot en memoria. Sin datos => (None, None).
+    Compartido entre sesiones: tratarlo como solo lectura.
+    """
+    key = (tuple(tickers), adjusted)
+    with _tape_lock:
+        entry = _tape.get(key)
+        if entry is not None:
+            entry["read"] = time.monotonic()
+
+    if entry is None:
+        entry = {"snap": {t: (None, None) for t in key[0]}, "read": time.monotonic()}
+        with _tape_lock:
+            entry = _tape.setdefault(key, entry)
+        _refresh_tape(key)
+
+    _ensure_tape_thread()
+    return entry["snap"]
+
+
+# ============================================================
+# Cruces / ratios entre N tickers
+#   - cross_panel alinea el set una sola vez: Date x ticker float64 (bloque
+#     Fortran) tomado del panel del hub, sin concat por par
+#   - cross_ratio: un par; pairwise_ratios: todos los pares (N x N) por
+#     broadcasting; rebased: base 100 para comparar trayectorias
+#   - ej. cruces regionales: cross_panel(("ARS=X", "BRL=X", "CLP=X")) y de ahí
+#     ARS/BRL, ARS/CLP, ... sin volver a alinear
+# ============================================================
+def cross_panel(tickers, adjusted: bool = False, start=None) -> pd.DataFrame:
+    """
+    Date x ticker (en el orden pedido) con los cierres del hub. Conserva NaN
+    donde un ticker no operó (feriados distintos por mercado); descarta las
+    fechas en que no operó ninguno del set.
+    """
+    tickers = tuple(dict.fromkeys(tickers))
+    register_tickers(*tickers)
+    try:
+        panel = hub_panel()
+    except Exception:
+        return _as_block(pd.DataFrame(index=pd.DatetimeIndex([], name="Date")), tickers)
+
+    close = panel["Close"]
+    cols = close.columns.get_indexer(list(tickers))
+    n = len(close)
+    values = np.full((n, len(tickers)), np.nan, order="F")
+    for k, j in enumerate(cols):
+        if j >= 0:
+            values[:, k] = _panel_series(panel, tickers[k], adjusted=adjusted).to_numpy()
+
+    keep = ~np.isnan(values).all(axis=1)
+    idx = close.index
+    if start is not None:
+        keep &= idx >= pd.Timestamp(start)
+    values = np.asfortranarray(values[keep])
+    return pd.DataFrame(values, index=idx[keep], columns=list(tickers), copy=False)
+
+
+def cross_ratio(panel: pd.DataFrame, num: str, den: str, name: str | None = None) -> pd.Series:
+    """num/den sobre un cross_panel; solo fechas con los dos precios (finitos)."""
+    cols = panel.columns
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = panel.to_numpy()[:, cols.get_loc(num)] / panel.to_numpy()[:, cols.get_loc(den)]
+    ok = np.isfinite(value)
+    return pd.Series(value[ok], index=panel.index[ok], name=name or f"{num}/{den}")
+
+
+def pairwise_ratios(panel: pd.DataFrame, at=None) -> pd.DataFrame:
+    """
+    Matriz N x N de ratios fila/columna con el último precio de cada ticker
+    a la fecha at (o al final del panel): m[i, j] = precio_i / precio_j.
     """
-    s1 = get_ticker_history(num_ticker, start=start, prefer_adj=prefer_adj)
-    s2 = get_ticker_history(den_ticker, start=start, prefer_adj=prefer_adj)
+    hist = panel if at is None else panel.loc[: pd.Timestamp(at)]
+    last = hist.ffill().to_numpy()[-1] if len(hist) else np.full(panel.shape[1], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        m = last[:, None] / last[None, :]
+    m[~np.isfinite(m)] = np.nan
+    return pd.DataFrame(m, index=panel.columns, columns=panel.columns)
 
-    df = pd.concat([s1, s2], axis=1, join="inner").dropna()
-    out = (df.iloc[:, 0] / df.iloc[:, 1]).replace([float("inf"), -float("inf")], pd.NA).dropna()
-    out.name = name or f"{num_ticker}/{den_ticker}"
-    return out
 
+def pairwise_ratio_panel(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Todos los ratios en el tiempo: Date x (num, den), un solo broadcasting
+    (T, N, 1) / (T, 1, N). Incluye la diagonal (= 1) para que el reshape
+    quede en orden num-mayor.
+    """
+    v = panel.to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cube = v[:, :, None] / v[:, None, :]
+    cube[~np.isfinite(cube)] = np.nan
+    cols = pd.MultiIndex.from_product([panel.columns, panel.columns], names=["num", "den"])
+    n = panel.shape[1]
+    return pd.DataFrame(cube.reshape(len(panel), n * n), index=panel.index, columns=cols)
 
 
+def rebased(panel: pd.DataFrame, base_date=None, base: float = 100.0) -> pd.DataFrame:
+    """
+    Cada columna dividida por su primer precio en/después de base_date
+    (o el primero del panel), por base. Un solo broadcasting (T, N) / (N,).
+    """
+    hist = panel if base_date is None else panel.loc[pd.Timestamp(base_date):]
+    if hist.empty:
+        return hist.copy()
+    v = hist.to_numpy()
+    has = ~np.isnan(v)
+    first = np.where(has.any(axis=0), v[has.argmax(axis=0), np.arange(v.shape[1])], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = v / first * base
+    return pd.DataFrame(out, index=hist.index, columns=panel.columns)
+
+
+# ============================================================
+# CCL canónico (YPFD.BA / YPF)
+#   - una sola serie a historia máxima por versión del panel del hub
+#     (se recalcula solo cuando el hub trae un panel nuevo)
+#   - get_ccl_ypf_df_fast(period) / get_ccl_ypf_history(start) son recortes
+#   - una serie por variante de precio: sin ajustar (home, finanzas) y
+#     Adj Close (macro_fx), cada una memoizada aparte
+# ============================================================
+_ccl_memo: dict[bool, tuple[pd.DataFrame, pd.Series]] = {}  # adjusted -> (panel["Close"], serie)
+_ccl_lock = threading.Lock()
+
+
+def _ccl_from_panel(panel: dict[str, pd.DataFrame], adjusted: bool) -> pd.Series:
+    ars = _panel_series(panel, CCL_TICKERS[0], adjusted=adjusted).to_numpy()
+    usd = _panel_series(panel, CCL_TICKERS[1], adjusted=adjusted).to_numpy()
+    if not len(ars) or not len(usd):
+        return pd.Series(dtype="float64", name="CCL_YPF")
+
+    # mismo índice (panel alineado): división directa, NaN donde falta alguno
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = ars / usd
+    ok = np.isfinite(value)
+    return pd.Series(value[ok], index=panel["Close"].index[ok], name="CCL_YPF")
+
+
+def get_ccl_ypf(adjusted: bool = False) -> pd.Series:
+    """
+    CCL proxy diario YPFD.BA / YPF a historia máxima, indexado por Date.
+    Compartido entre todos los consumidores: tratarlo como solo lectura.
+    """
+    try:
+        panel = hub_panel()
+    except Exception:
+        return pd.Series(dtype="float64", name="CCL_YPF")
+
+    hit = _ccl_memo.get(adjusted)
+    if hit is not None and hit[0] is panel["Close"]:
+        return hit[1]
+
+    s = _ccl_from_panel(panel, adjusted)
+    with _ccl_lock:
+        _ccl_memo[adjusted] = (panel["Close"], s)
+    return s
 
 
 # ============================================================
 # EMBI / Riesgo País (BCRA) — XLSX Serie_Historica_Spread_del_EMBI.xlsx
-# Devuelve formato largo: Date, Serie, Value
+# Un solo parseo (matriz ancha) y de ahí las vistas:
+#   get_embi_wide()          Date + países/regiones (unidades del Excel)
+#   get_embi_spread_long()   Date, Serie, Value (puntos básicos)
+#   get_riesgo_pais()        Date, value (puntos básicos, Argentina)
 # ============================================================
 
 EMBI_XLSX_URL = "https://bcrdgdcprod.blob.core.windows.net/documents/entorno-internacional/documents/Serie_Historica_Spread_del_EMBI.xlsx"
+EMBI_HEADERS = {"User-Agent": "Mozilla/5.0"}
+EMBI_LAST_COL = "Venezuela"       # hasta esta columna inclusive
+EMBI_DEFAULT_SERIE = "Argentina"  # riesgo país
+EMBI_TO_POINTS = 100.0            # el Excel viene en % => puntos básicos
 
-@st.cache_data(ttl=12 * 60 * 60, show_spinner=False)
-def get_embi_spread_long() -> pd.DataFrame:
+
+def _to_float_block(block: pd.DataFrame) -> np.ndarray:
     """
-    Descarga el Excel del BCRA con spreads EMBI y lo devuelve en formato largo:
-      Date (datetime), Serie (str), Value (float)
+    Todas las columnas de una vez (sin loop por columna): lo que ya es número
+    pasa directo; el texto con coma decimal ("1.234,5") se limpia en una sola
+    pasada de .str sobre las celdas que no convirtieron.
+    """
+    flat = pd.Series(block.to_numpy(dtype=object).ravel(order="F"))
+    num = pd.to_numeric(flat, errors="coerce")
+
+    pending = num.isna() & flat.notna()
+    if pending.any():
+        txt = flat[pending].astype(str).str.strip()
+        has_comma = txt.str.contains(",", regex=False)
+        txt = txt.where(~has_comma, txt.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+        num[pending] = pd.to_numeric(txt, errors="coerce")
+
+    return num.to_numpy(dtype="float64").reshape(block.shape, order="F")
+
+
+def _parse_embi_xlsx(raw: bytes) -> pd.DataFrame:
+    df = excel_io.read_excel(raw, header=1)  # header=1 => fila 2
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["Date"])
+
+    df.columns = [str(c).strip() for c in df.columns]
+
+    # detectar columna fecha
+    date_col = next((c for c in df.columns if c.lower() in ("fecha", "date")), df.columns[0])
+    dates = pd.to_datetime(df[date_col], errors="coerce").dt.normalize()
+
+    # cortar hasta Venezuela (inclusive)
+    cols = [c for c in df.columns if c != date_col]
+    if EMBI_LAST_COL in cols:
+        cols = cols[: cols.index(EMBI_LAST_COL) + 1]
+    else:
+        cols = [c for c in cols if not c.lower().startswith("unnamed")]
+
+    values = _to_float_block(df[cols])
+
+    wide = pd.DataFrame(values, columns=cols, index=df.index)
+    wide.insert(0, "Date", dates)
+    return wide.dropna(subset=["Date"]).sort_values("Date", kind="stable").reset_index(drop=True)
+
+
+@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
+def get_embi_wide() -> pd.DataFrame:
+    """
+    Wide: Date + columnas países/regiones (B..T, hasta Venezuela), en % como el Excel.
     """
     try:
-        df = pd.read_excel(EMBI_XLSX_URL, engine="openpyxl")
+        return http_cache.load_static(EMBI_XLSX_URL, _parse_embi_xlsx, profile="bcra_files", headers=EMBI_HEADERS)
     except Exception as e:
         st.warning(f"EMBI XLSX error: {e}")
-        return pd.DataFrame(columns=["Date", "Serie", "Value"])
+        return pd.DataFrame(columns=["Date"])
 
-    if df is None or df.empty:
+
+@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
+def get_embi_spread_long() -> pd.DataFrame:
+    """
+    Long: Date (datetime), Serie (str), Value (float, EN PUNTOS => x100)
+    """
+    wide = get_embi_wide()
+    if wide is None or wide.empty:
         return pd.DataFrame(columns=["Date", "Serie", "Value"])
 
-    # Normalizar nombres por si vienen con espacios raros
-    df = df.copy()
-    df.columns = [str(c).strip() for c in df.columns]
+    series = [c for c in wide.columns if c != "Date"]
+    values = wide[series].to_numpy(dtype="float64") * EMBI_TO_POINTS
 
-    # Primera columna suele ser "Fecha" (como en tu captura)
-    date_col = None
-    for cand in ["Fecha", "fecha", "Date", "date"]:
-        if cand in df.columns:
-            date_col = cand
-            break
-    if date_col is None:
-        # fallback: primera columna
-        date_col = df.columns[0]
-
-    df = df.rename(columns={date_col: "Date"})
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-    df = df.dropna(subset=["Date"]).sort_values("Date")
-
-    # Todo lo demás numérico
-    value_cols = [c for c in df.columns if c != "Date"]
-    for c in value_cols:
-        df[c] = pd.to_numeric(df[c], errors="coerce")
-
-    long_df = (
-        df.melt(id_vars=["Date"], value_vars=value_cols, var_name="Serie", value_name="Value")
-          .dropna(subset=["Value"])
-          .sort_values(["Serie", "Date"])
-          .reset_index(drop=True)
+    # melt vectorizado sobre la matriz: (fecha, serie) en orden Date
+    long = pd.DataFrame(
+        {
+            "Date": np.repeat(wide["Date"].to_numpy(), len(series)),
+            "Serie": np.tile(np.asarray(series, dtype=object), len(wide)),
+            "Value": values.ravel(order="C"),
+        }
     )
+    return long.dropna(subset=["Value"]).reset_index(drop=True)
 
-    # Limpieza suave de nombres
-    long_df["Serie"] = long_df["Serie"].astype(str).str.strip()
 
-    return long_df
+@st.cache_data(ttl=6 * 60 * 60, show_spinner=False)
+def get_riesgo_pais() -> pd.DataFrame:
+    """
+    DataFrame: Date, value (puntos EMBI Argentina; si no está, la primera serie)
+    """
+    wide = get_embi_wide()
+    series = [c for c in wide.columns if c != "Date"] if wide is not None else []
+    if not series:
+        return pd.DataFrame(columns=["Date", "value"])
+
+    col = EMBI_DEFAULT_SERIE if EMBI_DEFAULT_SERIE in series else series[0]
+    out = pd.DataFrame({"Date": wide["Date"], "value": wide[col] * EMBI_TO_POINTS})
+    return out.dropna(subset=["Date", "value"]).reset_index(drop=True)
@@ -0,0 +1,135 @@
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+# Parquet opcional (pyarrow / fastparquet); si no está, CSV
+try:
+    import pyarrow  # noqa: F401
+
+    _HAS_PARQUET = True
+except Exception:
+    _HAS_PARQUET = False
+
+
+ROOT = Path(__file__).resolve().parents[1]
+CACHE_DIR = Path(os.environ.get("CEU_CACHE_DIR", ROOT / ".cache"))
+STORE_DIR = CACHE_DIR / "series"
+
+
+def _store_path(namespace: str, key) -> Path:
+    ext = "parquet" if _HAS_PARQUET else "csv"
+    safe_key = str(key).replace("/", "_").replace(":", "_")
+    return STORE_DIR / namespace / f"{safe_key}.{ext}"
+
+
+def load_series(namespace: str, key, date_col: str = "Date") -> pd.DataFrame | None:
+    """
+    Lee la serie guardada (namespace/key). Devuelve None si no existe o está rota.
+    """
+    path = _store_path(namespace, key)
+    if not path.exists():
+        return None
+
+    try:
+        if _HAS_PARQUET:
+            df = pd.read_parquet(path)
+        else:
+            df = pd.read_csv(path)
+    except Exception:
+        return None
+
+    if date_col not in df.columns:
+        return None
+
+    df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+    return df.dropna(subset=[date_col]).sort_values(date_col).reset_index(drop=True)
+
+
+def save_series(namespace: str, key, df: pd.DataFrame) -> bool:
+    """
+    Guarda la serie de forma atómica (tmp + replace).
+    Si no se puede escribir (disco, serialización) devuelve False y la app sigue sin store.
+    """
+    path = _store_path(namespace, key)
+    # tmp único por escritor: dos syncs del mismo key no se pisan el archivo a medio escribir
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if _HAS_PARQUET:
+            df.to_parquet(tmp, index=False)
+        else:
+            df.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        # disco de solo lectura o error al serializar (pyarrow, tipos mezclados)
+        try:
+            tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return False
+
+
+def last_date(df: pd.DataFrame | None, date_col: str = "Date") -> pd.Timestamp | None:
+    if df is None or df.empty or date_col not in df.columns:
+        return None
+    d = df[date_col].max()
+    return None if pd.isna(d) else pd.Timestamp(d)
+
+
+def merge_series(old: pd.DataFrame | None, new: pd.DataFrame, date_col: str = "Date") -> pd.DataFrame:
+    """
+    Une lo guardado con lo recién bajado. En fechas repetidas gana lo nuevo
+    (así la ventana de solapamiento corrige revisiones).
+    """
+    if old is None or old.empty:
+        out = new
+    elif new is None or new.empty:
+        out = old
+    else:
+        out = pd.concat([old, new], ignore_index=True)
+
+    return (
+        out.drop_duplicates(subset=[date_col], keep="last")
+        .sort_values(date_col)
+        .reset_index(drop=True)
+    )
+
+
+def series_changed(old: pd.DataFrame | None, new: pd.DataFrame) -> bool:
+    """
+    True si new agrega o cambia filas respecto de old (mismas columnas).
+    Para no reescribir el archivo en cada sync cuando el solapamiento no trajo nada.
+    """
+    if old is None or old.empty:
+        return new is not None and not new.empty
+    if new is None or len(new) != len(old) or list(new.columns) != list(old.columns):
+        return True
+    for c in old.columns:
+        a, b = old[c].reset_index(drop=True), new[c].reset_index(drop=True)
+        if pd.api.types.is_datetime64_any_dtype(a) and pd.api.types.is_datetime64_any_dtype(b):
+            a, b = a.dt.as_unit("ns"), b.dt.as_unit("ns")
+        if not a.equals(b):
+            return True
+    return False
+
+
+def batches_by_last_date(last_dates: dict, gap) -> list[tuple[pd.Timestamp, list]]:
+    """
+    Agrupa claves por última fecha guardada para pedirlas en lotes: dentro de
+    un lote ninguna fecha queda más de gap por debajo de la más nueva, así una
+    serie atrasada (discontinuada, sin datos) no arrastra la ventana de todas.
+    Devuelve [(fecha más vieja del lote, claves)], del lote más nuevo al más viejo.
+    """
+    out: list[tuple[pd.Timestamp, list]] = []
+    top = None
+    for key, d in sorted(last_dates.items(), key=lambda kv: kv[1], reverse=True):
+        if top is None or d < top - gap:
+            top = d
+            out.append((d, [key]))
+        else:
+            out[-1] = (d, [*out[-1][1], key])
+    return out
@@ -0,0 +1,161 @@
+# ============================================================
+# Cache compartido entre réplicas (SQLite en WAL sobre un volumen común)
+#   - opcional: solo se activa con CEU_SHARED_CACHE=/ruta/compartida/cache.sqlite
+#   - TTL por clave
+#   - file lock por clave: una sola réplica refresca, el resto espera y lee
+#   - valores pickleados: el volumen tiene que ser de confianza (solo la app escribe)
+# Sin la variable de entorno todo pasa directo a la función (no-op).
+# ============================================================
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin lock entre procesos
+    fcntl = None
+
+
+SHARED_CACHE_PATH = os.environ.get("CEU_SHARED_CACHE")
+LOCK_TIMEOUT = 120  # seg máximo esperando a que otra réplica termine de refrescar
+_PURGE_EVERY = 50  # puts entre limpiezas de claves vencidas
+
+_local = threading.local()
+_puts = 0
+_puts_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return bool(SHARED_CACHE_PATH)
+
+
+def _conn() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        Path(SHARED_CACHE_PATH).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(SHARED_CACHE_PATH, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL, created REAL NOT NULL)"
+        )
+        _local.conn = conn
+    return conn
+
+
+def get(key: str):
+    """Valor vigente para key, o None si no existe / venció / el cache falla."""
+    try:
+        row = _conn().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    try:
+        return pickle.loads(row[0])
+    except Exception:
+        return None
+
+
+def put(key: str, value, ttl: float) -> None:
+    global _puts
+    now = time.time()
+    try:
+        conn = _conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires, created) VALUES (?, ?, ?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now + ttl, now),
+        )
+        with _puts_lock:
+            _puts += 1
+            purge = _puts % _PURGE_EVERY == 0
+        if purge:
+            conn.execute("DELETE FROM entries WHERE expires <= ?", (now,))
+    except sqlite3.Error:
+        pass
+
+
+class _KeyLock:
+    """flock exclusivo en <dir>/locks/<sha1(key)>.lock (entre procesos y entre hilos)."""
+
+    def __init__(self, key: str):
+        lock_dir = Path(SHARED_CACHE_PATH).parent / "locks"
+        lock_dir.mkdir(parents=True, exist_ok=True)
+        self.path = lock_dir / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.lock"
+        self.fh = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        self.fh = open(self.path, "a+")
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                fcntl.flock(self.fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return self
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    # la otra réplica quedó colgada: seguimos sin lock
+                    return self
+                time.sleep(0.2)
+
+    def __exit__(self, *exc):
+        if self.fh is not None:
+            try:
+                fcntl.flock(self.fh, fcntl.LOCK_UN)
+            finally:
+                self.fh.close()
+                self.fh = None
+        return False
+
+
+def get_or_compute(key: str, ttl: float, compute):
+    """
+    Lee key del cache compartido; si no está, toma el lock de la clave,
+    vuelve a mirar (otra réplica pudo haberlo llenado) y recién ahí calcula.
+    Las excepciones de compute no se cachean.
+    """
+    if not enabled():
+        return compute()
+
+    hit = get(key)
+    if hit is not None:
+        return hit
+
+    try:
+        lock = _KeyLock(key)
+    except OSError:
+        return compute()
+
+    with lock:
+        hit = get(key)
+        if hit is not None:
+            return hit
+        value = compute()
+        if value is not None:
+            put(key, value, ttl)
+        return value
+
+
+def shared_cached(namespace: str, ttl: float):
+    """Decorador: get_or_compute con clave namespace + argumentos."""
+
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return fn(*args, **kwargs)
+            key = f"{namespace}:{args!r}:{sorted(kwargs.items())!r}"
+            return get_or_compute(key, ttl, lambda: fn(*args, **kwargs))
+
+        return wrapper
+
+    return deco
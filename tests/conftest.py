@@ -0,0 +1,80 @@
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from services import series_store, shared_cache  # noqa: E402
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    """services.series_store apuntando a un directorio temporal."""
+    monkeypatch.setattr(series_store, "STORE_DIR", tmp_path / "series")
+    return tmp_path / "series"
+
+
+@pytest.fixture
+def shared_db(tmp_path, monkeypatch):
+    """services.shared_cache activo sobre un SQLite temporal (conexiones nuevas)."""
+    monkeypatch.setattr(shared_cache, "SHARED_CACHE_PATH", str(tmp_path / "shared" / "cache.sqlite"))
+    monkeypatch.setattr(shared_cache, "_local", threading.local())
+    return shared_cache
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", headers=None, payload=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self._payload = payload
+        self.text = content.decode("utf-8", "replace")
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"status={self.status_code}", response=self)
+
+
+@pytest.fixture
+def fake_response():
+    return FakeResponse
+
+
+class FakeSource:
+    """
+    Fuente remota simulada para los syncs contra series_store: history es
+    {clave: DataFrame con Date}; cada pedido queda en calls como (claves, desde).
+    """
+
+    def __init__(self, history: dict):
+        self.history = history
+        self.calls: list[tuple[list, object]] = []
+        self.fail = False
+
+    def window(self, keys, start=None) -> dict:
+        keys = list(keys)
+        self.calls.append((keys, start))
+        if self.fail:
+            raise requests.exceptions.ConnectionError("sin red")
+        out = {}
+        for k in keys:
+            df = self.history.get(k)
+            if df is None:
+                continue
+            out[k] = df if start is None else df[df["Date"] >= pd.Timestamp(start)]
+        return out
+
+
+@pytest.fixture
+def source(store_dir):
+    """FakeSource vacía (history se completa en cada test) con el store en tmp."""
+    return FakeSource({})
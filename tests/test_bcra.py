@@ -0,0 +1,237 @@
+import threading
+
+import pandas as pd
+import pytest
+import requests
+
+from services import macro_data as mdata
+from services import series_store
+from services.series_store import load_series
+
+
+class FakeBCRA:
+    """
+    Monetarias/{id} simulado: n filas diarias desde 2024-01-01 (valor = posición),
+    Limit/Offset/Desde como la API. fail = {offset: fallas antes de responder}.
+    """
+
+    def __init__(self, n: int, count: bool = True):
+        dates = pd.date_range("2024-01-01", periods=n, freq="D").strftime("%Y-%m-%d")
+        self.rows = [{"fecha": d, "valor": float(i)} for i, d in enumerate(dates)]
+        self.count = count
+        self.fail: dict[int, int] = {}
+        self.calls: list[tuple[int, str | None]] = []
+        self._lock = threading.Lock()
+
+    def get(self, url, profile=None, params=None, **kwargs):
+        off, desde = params["Offset"], params.get("Desde")
+        with self._lock:
+            self.calls.append((off, desde))
+            if self.fail.get(off, 0) > 0:
+                self.fail[off] -= 1
+                raise requests.exceptions.ConnectionError(f"offset {off} caído")
+        rows = [r for r in self.rows if desde is None or r["fecha"] >= desde]
+        meta = {"resultset": {"count": len(rows)}} if self.count else {}
+        payload = {"results": [{"detalle": rows[off : off + params["Limit"]]}], "metadata": meta}
+        return self.response(payload=payload)
+
+
+@pytest.fixture
+def bcra(monkeypatch, store_dir, fake_response):
+    def make(n: int, count: bool = True) -> FakeBCRA:
+        fake = FakeBCRA(n, count=count)
+        fake.response = fake_response
+        monkeypatch.setattr(mdata.http_client, "get", fake.get)
+        return fake
+
+    monkeypatch.setattr(mdata, "BCRA_PAGE_LIMIT", 3)
+    monkeypatch.setattr(mdata, "BCRA_RETRY_BACKOFF", 0)
+    monkeypatch.setattr(mdata, "_degraded", {})
+    monkeypatch.setattr(mdata.st, "warning", lambda msg: None)
+    monkeypatch.setattr(mdata.st, "error", lambda msg: None)
+    mdata._monetaria_serie_cached.clear()
+    yield make
+    mdata._monetaria_serie_cached.clear()
+
+
+# ------------------------------------------------------------
+# paginado con reintentos por página
+# ------------------------------------------------------------
+def test_failed_page_is_retried_and_series_completes(bcra):
+    fake = bcra(10)
+    fake.fail[6] = mdata.BCRA_PAGE_RETRIES - 1
+    df = mdata.sync_monetaria_serie(1, parallel=False, notify=False)
+    assert df.attrs["status"] == "ok"
+    assert df["value"].tolist() == [float(i) for i in range(10)]
+    assert [off for off, _ in fake.calls].count(6) == mdata.BCRA_PAGE_RETRIES
+
+
+def test_page_out_of_retries_keeps_the_rest(bcra):
+    fake = bcra(10)
+    fake.fail[3] = 99
+    df = mdata.sync_monetaria_serie(1, parallel=False, notify=False)
+    assert df.attrs["status"] == "partial"
+    assert df.attrs["missing_offsets"] == [3]
+    assert df["value"].tolist() == [0.0, 1.0, 2.0, 6.0, 7.0, 8.0, 9.0]
+    assert load_series(mdata.BCRA_STORE_NS, 1) is None  # incompleta: no se guarda
+
+
+def test_attempt_budget_caps_failed_requests(bcra, monkeypatch):
+    monkeypatch.setattr(mdata, "BCRA_MAX_ATTEMPTS", 4)
+    fake = bcra(30)
+    fake.fail.update({off: 99 for off in range(3, 30, 3)})
+    df = mdata.sync_monetaria_serie(1, parallel=False, notify=False)
+    assert df.attrs["missing_offsets"] == list(range(3, 30, 3))
+    # 1 (offset 0) + 9 páginas, reintentos solo mientras quede presupuesto
+    assert len(fake.calls) == 1 + 9 + (mdata.BCRA_MAX_ATTEMPTS - 1)
+
+
+def test_without_count_stops_on_short_page(bcra):
+    fake = bcra(7, count=False)
+    df = mdata.sync_monetaria_serie(1, parallel=True, notify=False)
+    assert df.attrs["status"] == "ok" and len(df) == 7
+    assert [off for off, _ in fake.calls] == [0, 3, 6]
+
+
+def test_without_count_failure_marks_from_there(bcra):
+    fake = bcra(10, count=False)
+    fake.fail[6] = 99
+    df = mdata.sync_monetaria_serie(1, parallel=False, notify=False)
+    assert df.attrs["missing_offsets"] == [6]
+    assert len(df) == 6
+
+
+def test_first_page_down_returns_error(bcra):
+    fake = bcra(10)
+    fake.fail[0] = 99
+    df = mdata.sync_monetaria_serie(1, parallel=False, notify=False)
+    assert df.empty and df.attrs["status"] == "error"
+
+
+# ------------------------------------------------------------
+# get_monetaria_serie: lo incompleto no se cachea la hora
+# ------------------------------------------------------------
+def test_partial_series_is_cached_only_briefly(bcra, monkeypatch):
+    fake = bcra(10)
+    fake.fail[3] = 99
+    assert mdata.get_monetaria_serie(1).attrs["status"] == "partial"
+    n = len(fake.calls)
+    mdata.get_monetaria_serie(1)
+    assert len(fake.calls) == n  # dentro de BCRA_DEGRADED_TTL
+
+    fake.fail.clear()
+    monkeypatch.setattr(mdata, "BCRA_DEGRADED_TTL", 0)
+    df = mdata.get_monetaria_serie(1)
+    assert df.attrs["status"] == "ok" and len(df) == 10
+    n = len(fake.calls)
+    mdata.get_monetaria_serie(1)
+    assert len(fake.calls) == n  # completa: queda la hora en st.cache_data
+
+
+# ------------------------------------------------------------
+# páginas en paralelo una vez conocido count
+# ------------------------------------------------------------
+def test_parallel_pages_are_reassembled_in_order(bcra, monkeypatch):
+    fake = bcra(20)
+    seen = []
+    real_get = fake.get
+    gate = threading.Barrier(mdata.BCRA_MAX_WORKERS, timeout=5)
+
+    def slow_first_pages(url, profile=None, params=None, **kwargs):
+        # las primeras BCRA_MAX_WORKERS páginas salen juntas: hay concurrencia real
+        off = params["Offset"]
+        if 0 < off <= 3 * mdata.BCRA_MAX_WORKERS:
+            gate.wait()
+        seen.append(off)
+        return real_get(url, profile=profile, params=params, **kwargs)
+
+    monkeypatch.setattr(mdata.http_client, "get", slow_first_pages)
+    df = mdata.sync_monetaria_serie(1, parallel=True, notify=False)
+    assert df["value"].tolist() == [float(i) for i in range(20)]
+    assert sorted(seen) == list(range(0, 20, 3))
+    assert df.attrs["status"] == "ok"
+
+
+def test_sequential_and_parallel_match(bcra):
+    bcra(20)
+    seq = mdata._get_monetaria_detalle(mdata.BCRA_MONETARIAS_URL.format(id_variable=1), parallel=False)
+    par = mdata._get_monetaria_detalle(mdata.BCRA_MONETARIAS_URL.format(id_variable=1), parallel=True)
+    assert seq == par
+    assert [r["valor"] for r in par[0]] == [float(i) for i in range(20)]
+
+
+# ------------------------------------------------------------
+# sync_monetaria_serie contra el store local
+# ------------------------------------------------------------
+def test_second_sync_only_asks_from_last_stored_date(bcra):
+    fake = bcra(10)
+    mdata.sync_monetaria_serie(1, parallel=False, notify=False)
+    assert len(load_series(mdata.BCRA_STORE_NS, 1)) == 10
+
+    fake.rows.append({"fecha": "2024-01-11", "valor": 10.0})
+    fake.rows[8]["valor"] = 80.0  # revisión dentro del solapamiento
+    fake.calls.clear()
+    df = mdata.sync_monetaria_serie(1, parallel=False, notify=False)
+
+    desde = (pd.Timestamp("2024-01-10") - pd.Timedelta(days=mdata.BCRA_SYNC_OVERLAP_DAYS)).strftime("%Y-%m-%d")
+    assert {d for _, d in fake.calls} == {desde}
+    assert len(df) == 11 and df["value"].iloc[8] == 80.0
+    assert load_series(mdata.BCRA_STORE_NS, 1)["value"].iloc[-1] == 10.0
+
+
+def test_bcra_down_serves_store_as_stale(bcra):
+    fake = bcra(10)
+    mdata.sync_monetaria_serie(1, parallel=False, notify=False)
+
+    fake.fail[0] = 99
+    df = mdata.sync_monetaria_serie(1, parallel=False, notify=False)
+    assert df.attrs["status"] == "stale"
+    assert df["value"].tolist() == [float(i) for i in range(10)]
+    assert "copia local" in df.attrs["message"]
+
+
+def test_store_write_error_does_not_break_the_sync(bcra, monkeypatch):
+    bcra(10)
+
+    def boom(*args, **kwargs):
+        raise OSError("disco de solo lectura")
+
+    monkeypatch.setattr(series_store.os, "replace", boom)
+    df = mdata.sync_monetaria_serie(1, parallel=False, notify=False)
+    assert df.attrs["status"] == "ok" and len(df) == 10
+    assert load_series(mdata.BCRA_STORE_NS, 1) is None
+
+
+# ------------------------------------------------------------
+# get_monetaria_many
+# ------------------------------------------------------------
+def test_monetaria_many_matches_one_by_one(bcra, monkeypatch, fake_response):
+    fakes = {}
+    for sid, n in ((1, 4), (2, 7), (3, 5)):
+        fakes[sid] = FakeBCRA(n)
+        fakes[sid].response = fake_response
+
+    def route(url, **kwargs):
+        return fakes[int(url.rsplit("/", 1)[1])].get(url, **kwargs)
+
+    monkeypatch.setattr(mdata.http_client, "get", route)
+    mdata._monetaria_many_cached.clear()
+    try:
+        frames = mdata.get_monetaria_many([2, 1, 2, 3])
+        assert list(frames) == [2, 1, 3]
+        assert {k: len(v) for k, v in frames.items()} == {2: 7, 1: 4, 3: 5}
+        assert all(df.attrs["status"] == "ok" for df in frames.values())
+
+        n = sum(len(f.calls) for f in fakes.values())
+        mdata.get_monetaria_many((2, 1, 3))
+        assert sum(len(f.calls) for f in fakes.values()) == n  # una sola entrada de cache
+
+        fakes[3].fail[0] = 99
+        monkeypatch.setattr(mdata, "BCRA_DEGRADED_TTL", 0)
+        mdata._monetaria_many_cached.clear()
+        frames = mdata.get_monetaria_many((1, 2, 3))
+        assert frames[3].attrs["status"] == "stale"  # copia local del sync anterior
+        assert frames[1].attrs["status"] == "ok"
+    finally:
+        mdata._monetaria_many_cached.clear()
+    assert mdata.get_monetaria_many([]) == {}
@@ -0,0 +1,261 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from services import cache
+from services import macro_data as mdata
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(cache, "time", c)
+    return c
+
+
+def _wait_for(cond, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not cond():
+        assert time.monotonic() < end, "timeout esperando al otro hilo"
+        time.sleep(0.005)
+
+
+class Loader:
+    """Función cacheable que devuelve results en orden (excepciones se lanzan)."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self, *args):
+        r = self.results[min(self.calls, len(self.results) - 1)]
+        self.calls += 1
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+
+def _df(*values):
+    return pd.DataFrame({"v": list(values)})
+
+
+# ------------------------------------------------------------
+# swr_cache
+# ------------------------------------------------------------
+def test_swr_serves_cached_copy_within_ttl(clock):
+    fn = Loader(_df(1))
+    get = cache.swr_cache(ttl=60)(fn)
+
+    first = get("a")
+    first.loc[0, "v"] = 99  # el llamador puede mutar lo que recibe
+    clock.now += 59
+    assert get("a")["v"].tolist() == [1]
+    assert fn.calls == 1
+    assert get.fetched_at("a") == pd.Timestamp(1_000_000.0, unit="s")
+
+
+def test_swr_expired_serves_stale_and_refreshes_in_background(clock):
+    fn = Loader(_df(1), _df(2))
+    get = cache.swr_cache(ttl=60)(fn)
+    get()
+
+    clock.now += 61
+    assert get()["v"].tolist() == [1]  # no espera la descarga
+    _wait_for(lambda: get()["v"].tolist() == [2])
+    assert fn.calls == 2
+
+
+def test_swr_failed_refresh_keeps_last_good(clock):
+    fn = Loader(_df(1), RuntimeError("caído"), _df())
+    get = cache.swr_cache(ttl=60)(fn)
+    get()
+
+    clock.now += 61
+    get()
+    _wait_for(lambda: get.last_error() is not None)
+    assert get.last_error() == "RuntimeError: caído"
+    assert get()["v"].tolist() == [1]
+
+    clock.now += 61
+    get()
+    _wait_for(lambda: get.last_error() == "resultado vacío")
+    assert get()["v"].tolist() == [1]
+
+
+def test_swr_without_good_copy_raises_and_remembers_negative(clock):
+    fn = Loader(RuntimeError("caído"), _df(1))
+    get = cache.swr_cache(ttl=60)(fn)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            get()
+    assert fn.calls == 1
+    assert get.fetched_at() is None
+
+    clock.now += cache.NEGATIVE_TTL
+    assert get()["v"].tolist() == [1]
+    assert get.last_error() is None
+
+
+def test_swr_empty_result_is_served_but_retried_after_negative_ttl(clock):
+    fn = Loader(_df(), _df(1))
+    get = cache.swr_cache(ttl=60)(fn)
+    assert get().empty
+    assert get().empty and fn.calls == 1
+
+    clock.now += cache.NEGATIVE_TTL
+    assert get()["v"].tolist() == [1]
+
+
+def test_swr_clear(clock):
+    fn = Loader(_df(1))
+    get = cache.swr_cache(ttl=60)(fn)
+    get()
+    get.clear()
+    get()
+    assert fn.calls == 2
+
+
+# ------------------------------------------------------------
+# singleflight
+# ------------------------------------------------------------
+@pytest.fixture
+def waiters(monkeypatch):
+    """Cantidad de seguidores bloqueados esperando un vuelo (para no depender de sleeps)."""
+    count = [0]
+
+    class _Done(threading.Event):
+        def wait(self, timeout=None):
+            count[0] += 1
+            return super().wait(timeout)
+
+    class _CountingFlight(cache._Flight):
+        def __init__(self):
+            super().__init__()
+            self.done = _Done()
+
+    monkeypatch.setattr(cache, "_Flight", _CountingFlight)
+    return count
+
+
+def _concurrent(fn, n, *args):
+    out, errors = [None] * n, [None] * n
+
+    def run(i):
+        try:
+            out[i] = fn(*args)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    return threads, out, errors
+
+
+def test_singleflight_coalesces_concurrent_calls(waiters):
+    release = threading.Event()
+    calls = []
+
+    @cache.singleflight
+    def load(key):
+        calls.append(key)
+        release.wait(5)
+        return _df(1)
+
+    threads, out, _ = _concurrent(load, 5, "a")
+    _wait_for(lambda: waiters[0] == 4)  # 1 líder + 4 esperando
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert calls == ["a"]
+    assert all(df["v"].tolist() == [1] for df in out)
+    out[0].loc[0, "v"] = 99  # cada seguidor recibe su copia
+    assert sum(df["v"].iloc[0] == 99 for df in out) == 1
+
+
+def test_singleflight_shares_the_exception_and_does_not_cache(waiters):
+    release = threading.Event()
+    calls = []
+
+    @cache.singleflight
+    def load():
+        calls.append(1)
+        release.wait(5)
+        raise RuntimeError("caído")
+
+    threads, _, errors = _concurrent(load, 3)
+    _wait_for(lambda: waiters[0] == 2)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    with pytest.raises(RuntimeError):
+        load()  # terminado el vuelo, la próxima llamada vuelve a correr
+    assert len(calls) == 2
+
+
+def test_singleflight_different_args_run_separately():
+    calls = []
+
+    @cache.singleflight
+    def load(key, scale=1):
+        calls.append((key, scale))
+        return key * scale
+
+    assert load(2) == 2 and load(2, scale=3) == 6 and load(2) == 2
+    assert calls == [(2, 1), (2, 3), (2, 1)]
+
+
+# ------------------------------------------------------------
+# get_emae_sectores_long: el aviso sale del llamador, no del swr
+# ------------------------------------------------------------
+EMAE_CSV = b"indice_tiempo,agro,industria\n2024-01-01,100,200\n2024-02-01,101,\n"
+
+
+@pytest.fixture
+def emae(monkeypatch, fake_response):
+    responses = []
+    warnings = []
+
+    def fake_get(url, **kwargs):
+        r = responses.pop(0)
+        if isinstance(r, Exception):
+            raise r
+        return r
+
+    monkeypatch.setattr(mdata.http_client, "get", fake_get)
+    monkeypatch.setattr(mdata.st, "warning", warnings.append)
+    mdata.get_emae_sectores_wide.clear()
+    yield responses, warnings
+    mdata.get_emae_sectores_wide.clear()
+
+
+def test_emae_sectores_long(emae, fake_response):
+    responses, warnings = emae
+    responses.append(fake_response(content=EMAE_CSV))
+    out = mdata.get_emae_sectores_long()
+    assert list(out.columns) == ["Date", "Sector", "Value"]
+    assert out["Sector"].tolist() == ["agro", "agro", "industria"]
+    assert warnings == []
+
+
+def test_emae_sectores_error_warns_in_caller(emae, fake_response):
+    responses, warnings = emae
+    responses.append(fake_response(content=b"fecha,agro\n2024-01-01,1\n"))
+    out = mdata.get_emae_sectores_long()
+    assert out.empty and list(out.columns) == ["Date", "Sector", "Value"]
+    assert len(warnings) == 1 and "CSV inesperado" in warnings[0]
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import market_data as md
+
+DATES = pd.date_range("2024-01-01", periods=5, freq="D", name="Date")
+
+
+@pytest.fixture
+def panel():
+    # C no operó el 2 y el 3 (feriado local); el 4 D no tiene precio
+    return pd.DataFrame(
+        {
+            "A": [10.0, 11.0, 12.0, 13.0, 14.0],
+            "B": [2.0, 2.0, 4.0, 4.0, 7.0],
+            "C": [5.0, np.nan, np.nan, 6.5, 7.0],
+            "D": [1.0, 1.0, 1.0, 0.0, 2.0],
+        },
+        index=DATES,
+    )
+
+
+# ------------------------------------------------------------
+# cross_ratio
+# ------------------------------------------------------------
+def test_cross_ratio_values_and_name(panel):
+    s = md.cross_ratio(panel, "A", "B")
+    assert s.name == "A/B"
+    pd.testing.assert_series_equal(s, (panel["A"] / panel["B"]).rename("A/B"), check_freq=False)
+
+
+def test_cross_ratio_drops_missing_and_zero(panel):
+    s = md.cross_ratio(panel, "C", "D", name="C/D")
+    assert list(s.index) == [DATES[0], DATES[4]]
+    assert s.tolist() == [5.0, 3.5]
+
+
+# ------------------------------------------------------------
+# rebased
+# ------------------------------------------------------------
+def test_rebased_uses_first_price_per_column(panel):
+    out = md.rebased(panel[["A", "C"]], base_date="2024-01-02")
+    assert out.index[0] == DATES[1]
+    assert out["A"].iloc[0] == 100.0
+    # C recién tiene precio el 4: ese es su 100
+    assert np.isnan(out["C"].iloc[0])
+    assert out["C"].iloc[2] == 100.0
+    assert out["C"].iloc[3] == pytest.approx(700 / 6.5)
+
+
+def test_rebased_custom_base_and_empty(panel):
+    out = md.rebased(panel[["B"]], base=1.0)
+    assert out["B"].tolist() == [1.0, 1.0, 2.0, 2.0, 3.5]
+    assert md.rebased(panel, base_date="2030-01-01").empty
+
+
+def test_rebased_all_nan_column(panel):
+    out = md.rebased(panel.assign(E=np.nan)[["A", "E"]])
+    assert out["E"].isna().all()
+    assert out["A"].iloc[-1] == 140.0
+
+
+# ------------------------------------------------------------
+# pairwise_ratios / pairwise_ratio_panel
+# ------------------------------------------------------------
+def test_pairwise_ratios_last_price(panel):
+    m = md.pairwise_ratios(panel[["A", "B", "C"]], at="2024-01-03")
+    # C sin precio el 3: último conocido (5.0)
+    assert m.loc["A", "B"] == 3.0
+    assert m.loc["A", "C"] == 12.0 / 5.0
+    assert m.loc["C", "A"] == pytest.approx(5.0 / 12.0)
+    assert (np.diag(m.to_numpy()) == 1.0).all()
+
+
+def test_pairwise_ratios_zero_price_is_nan(panel):
+    m = md.pairwise_ratios(panel[["A", "D"]], at="2024-01-04")
+    assert np.isnan(m.loc["A", "D"])
+    assert m.loc["D", "A"] == 0.0
+
+
+def test_pairwise_ratio_panel_matches_cross_ratio(panel):
+    cube = md.pairwise_ratio_panel(panel)
+    assert cube.shape == (5, 16)
+    assert list(cube.columns[:4]) == [("A", "A"), ("A", "B"), ("A", "C"), ("A", "D")]
+    for num in panel.columns:
+        for den in panel.columns:
+            s = md.cross_ratio(panel, num, den)
+            pd.testing.assert_series_equal(cube[(num, den)].dropna(), s, check_names=False, check_freq=False)
+
+
+# ------------------------------------------------------------
+# cross_panel (hub simulado)
+# ------------------------------------------------------------
+def test_cross_panel_from_hub(monkeypatch, panel):
+    close = panel[["A", "C"]]
+    hub = {"Close": close, "Adj Close": close.assign(A=close["A"] / 2, C=np.nan)}
+    monkeypatch.setattr(md, "hub_panel", lambda: hub)
+    monkeypatch.setattr(md, "register_tickers", lambda *t: None)
+
+    out = md.cross_panel(["C", "ZZZ", "A", "C"], start="2024-01-02")
+    assert list(out.columns) == ["C", "ZZZ", "A"]
+    assert out.index[0] == DATES[1]
+    assert out["ZZZ"].isna().all()
+    assert out.to_numpy().flags.f_contiguous
+
+    adj = md.cross_panel(["A", "C"], adjusted=True)
+    assert adj["A"].iloc[0] == 5.0
+    assert adj["C"].iloc[0] == 5.0  # sin Adj Close: cae a Close
@@ -0,0 +1,222 @@
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from services import macro_data as mdata
+from services.series_store import load_series
+
+
+def _series(start, values):
+    dates = pd.date_range(start, periods=len(values), freq="MS")
+    return pd.DataFrame({"Date": dates, "Value": np.asarray(values, dtype="float64")})
+
+
+# ------------------------------------------------------------
+# _datos_gob_is_revised
+# ------------------------------------------------------------
+def test_is_revised_false_on_equal_overlap():
+    stored = _series("2024-01-01", range(1, 13))
+    new = _series("2024-07-01", range(7, 14))
+    assert not mdata._datos_gob_is_revised(stored, new)
+
+
+def test_is_revised_ignores_provisional_tail():
+    # los últimos DATOS_GOB_AR_PROVISIONAL se revisan de rutina
+    stored = _series("2024-01-01", range(1, 13))
+    new = _series("2024-10-01", [10, 11.5, 12.5, 13])
+    assert not mdata._datos_gob_is_revised(stored, new)
+
+
+def test_is_revised_detects_consolidated_change():
+    stored = _series("2024-01-01", range(1, 13))
+    new = _series("2024-07-01", [7, 8.2, 9, 10, 11, 12, 13])
+    assert mdata._datos_gob_is_revised(stored, new)
+
+
+def test_is_revised_within_tolerance():
+    stored = _series("2024-01-01", [1000.0] * 12)
+    new = _series("2024-07-01", [1000.5] * 6)
+    assert not mdata._datos_gob_is_revised(stored, new)
+
+
+# ------------------------------------------------------------
+# sync_datos_gob_wide (FakeSource como fetch_datos_gob_wide)
+# ------------------------------------------------------------
+@pytest.fixture
+def datos_gob(source, monkeypatch):
+    def fake_fetch(ids, start_date=None):
+        got = source.window(ids, start_date)
+        out = pd.concat({sid: got[sid].set_index("Date")["Value"] for sid in ids}, axis=1, sort=True)
+        return out.rename_axis("Date").reset_index()
+
+    saves = []
+    real_save = mdata.save_series
+
+    def spy_save(ns, key, df):
+        saves.append(key)
+        return real_save(ns, key, df)
+
+    monkeypatch.setattr(mdata, "fetch_datos_gob_wide", fake_fetch)
+    monkeypatch.setattr(mdata, "save_series", spy_save)
+    source.history.update(A=_series("2023-01-01", range(1, 25)), B=_series("2023-01-01", range(101, 125)))
+    source.saves = saves
+    return source
+
+
+def test_sync_full_then_incremental(datos_gob):
+    wide = mdata.sync_datos_gob_wide(["A", "B"])
+    assert datos_gob.calls == [(["A", "B"], None)]
+    assert list(wide.columns) == ["Date", "A", "B"]
+    assert len(wide) == 24 and wide.attrs["status"] == "ok"
+    assert len(load_series(mdata.DATOS_GOB_AR_STORE_NS, "A")) == 24
+
+    datos_gob.history.update(A=_series("2023-01-01", range(1, 26)), B=_series("2023-01-01", range(101, 126)))
+    wide = mdata.sync_datos_gob_wide(["A", "B"])
+    assert datos_gob.calls[1:] == [(["A", "B"], "2024-09-01")]  # 2024-12 - DATOS_GOB_AR_SYNC_OVERLAP
+    assert len(wide) == 25
+    assert wide["B"].iloc[-1] == 125
+
+
+def test_sync_discontinued_series_gets_its_own_window(datos_gob):
+    datos_gob.history["OLD"] = _series("2015-01-01", range(1, 25))  # termina en 2016-12
+    mdata.sync_datos_gob_wide(["A", "B", "OLD"])
+
+    mdata.sync_datos_gob_wide(["A", "B", "OLD"])
+    assert datos_gob.calls[1:] == [(["A", "B"], "2024-09-01"), (["OLD"], "2016-09-01")]
+
+
+def test_sync_refetches_revised_series_only(datos_gob):
+    mdata.sync_datos_gob_wide(["A", "B"])
+
+    # cambio de base en A: toda la historia reescalada
+    h = datos_gob.history["A"]
+    datos_gob.history["A"] = h.assign(Value=h["Value"] * 10)
+    wide = mdata.sync_datos_gob_wide(["A", "B"])
+
+    assert datos_gob.calls[-1] == (["A"], None)
+    assert wide["A"].iloc[0] == 10
+    assert wide["B"].iloc[0] == 101
+    assert load_series(mdata.DATOS_GOB_AR_STORE_NS, "A")["Value"].iloc[0] == 10
+
+
+def test_sync_rewrites_only_changed_series(datos_gob):
+    mdata.sync_datos_gob_wide(["A", "B"])
+    mdata.sync_datos_gob_wide(["A", "B"])
+    assert sorted(datos_gob.saves) == ["A", "B"]
+
+    datos_gob.history["B"] = _series("2023-01-01", range(101, 126))
+    mdata.sync_datos_gob_wide(["A", "B"])
+    assert sorted(datos_gob.saves) == ["A", "B", "B"]
+
+
+def test_sync_serves_store_marked_stale_when_fetch_fails(datos_gob):
+    mdata.sync_datos_gob_wide(["A"])
+
+    datos_gob.fail = True
+    wide = mdata.sync_datos_gob_wide(["A", "B"])
+    assert len(wide) == 24
+    assert wide["B"].isna().all()
+    assert wide.attrs["status"] == "stale"
+
+    with pytest.raises(Exception):
+        mdata.sync_datos_gob_wide(["B"])
+
+
+# ------------------------------------------------------------
+# get_datos_gob_wide: lo degradado no se cachea 12 h
+# ------------------------------------------------------------
+@pytest.fixture
+def cached(datos_gob, monkeypatch):
+    monkeypatch.setattr(mdata, "_degraded", {})
+    mdata._datos_gob_wide_cached.clear()
+    yield datos_gob
+    mdata._datos_gob_wide_cached.clear()
+
+
+def test_get_wide_degraded_is_remembered_only_briefly(cached, monkeypatch):
+    mdata.sync_datos_gob_wide(["A"])  # copia local
+    cached.fail = True
+    assert mdata.get_datos_gob_wide(("A",)).attrs["status"] == "stale"
+    n = len(cached.calls)
+    mdata.get_datos_gob_wide(("A",))
+    assert len(cached.calls) == n  # dentro de BCRA_DEGRADED_TTL no se reintenta
+
+    cached.fail = False
+    monkeypatch.setattr(mdata, "BCRA_DEGRADED_TTL", 0)
+    assert mdata.get_datos_gob_wide(("A",)).attrs["status"] == "ok"
+    n = len(cached.calls)
+    mdata.get_datos_gob_wide(("A",))
+    assert len(cached.calls) == n  # fresco: queda en st.cache_data
+
+
+def test_get_wide_error_returns_empty_frame(cached, monkeypatch):
+    cached.fail = True
+    wide = mdata.get_datos_gob_wide(("A", "B"))
+    assert wide.empty and list(wide.columns) == ["Date", "A", "B"]
+    assert wide.attrs["status"] == "error"
+
+
+# ------------------------------------------------------------
+# fetch_datos_gob_wide: bloques de ids y paginado
+# ------------------------------------------------------------
+@pytest.fixture
+def api(monkeypatch, fake_response):
+    """/series/api/series simulado: history {id: frame}, calls con los params de cada request."""
+    history, calls = {}, []
+
+    def fake_get(url, profile=None, params=None, headers=None, **kwargs):
+        calls.append(dict(params))
+        ids = params["ids"].split(",")
+        wide = pd.concat({sid: history[sid].set_index("Date")["Value"] for sid in ids}, axis=1, sort=True)
+        if params.get("start_date"):
+            wide = wide[wide.index >= params["start_date"]]
+        page = wide.iloc[params["start"] : params["start"] + params["limit"]]
+        csv = page.rename_axis("indice_tiempo").reset_index().to_csv(index=False, date_format="%Y-%m-%d")
+        return fake_response(content=csv.encode())
+
+    monkeypatch.setattr(mdata.http_client, "get", fake_get)
+    return history, calls
+
+
+def test_fetch_wide_splits_ids_in_chunks(api, monkeypatch):
+    history, calls = api
+    monkeypatch.setattr(mdata, "DATOS_GOB_AR_MAX_IDS", 2)
+    history.update({f"s{k}": _series(f"2024-0{k}-01", [k] * 3) for k in range(1, 6)})
+
+    wide = mdata.fetch_datos_gob_wide(["s3", "s1", "s5", "s2", "s4", "s1"])
+    assert [c["ids"] for c in calls] == ["s3,s1", "s5,s2", "s4"]
+    assert list(wide.columns) == ["Date", "s3", "s1", "s5", "s2", "s4"]
+    assert wide["Date"].tolist() == list(pd.date_range("2024-01-01", "2024-07-01", freq="MS"))
+    assert wide["s1"].notna().sum() == 3 and wide["s5"].iloc[-1] == 5
+
+
+def test_fetch_wide_pages_with_start(api, monkeypatch):
+    history, calls = api
+    monkeypatch.setattr(mdata, "DATOS_GOB_AR_PAGE_LIMIT", 5)
+    history["A"] = _series("2023-01-01", range(12))
+
+    wide = mdata.fetch_datos_gob_wide(["A"], start_date="2023-02-01")
+    assert [(c["start"], c["start_date"]) for c in calls] == [(0, "2023-02-01"), (5, "2023-02-01"), (10, "2023-02-01")]
+    assert wide["A"].tolist() == list(range(1, 12))
+
+
+def test_fetch_wide_http_error(monkeypatch, fake_response):
+    monkeypatch.setattr(mdata.http_client, "get", lambda url, **kw: fake_response(status_code=400, content=b"bad ids"))
+    with pytest.raises(requests.exceptions.HTTPError):
+        mdata.fetch_datos_gob_wide(["nope"])
+
+
+def test_parse_wide_csv_formats():
+    ids = [mdata.EMAE_ORIGINAL_ID, mdata.EMAE_DESEASON_ID]
+    by_ids = f"indice_tiempo,{ids[0]},{ids[1]}\n2024-01-01,1,2\n"
+    titles = "indice_tiempo,emae_original,emae_desestacionalizada\n2024-01-01,1,2\n"
+    positional = "indice_tiempo,foo,bar\n2024-01-01,1,2\n"
+    long = f"indice_tiempo,serie_id,valor\n2024-01-01,{ids[1]},2\n2024-01-01,{ids[0]},1\n"
+    for csv in (by_ids, titles, positional, long):
+        out = mdata._parse_datos_gob_wide_csv(csv, ids)
+        assert list(out.columns) == ["Date", *ids]
+        assert out.iloc[0, 1:].tolist() == [1, 2]
+
+    assert mdata._parse_datos_gob_wide_csv("fecha,x\n2024-01-01,1\n", ids) is None
+    assert mdata._parse_datos_gob_wide_csv("indice_tiempo,x\n2024-01-01,1\n", ids) is None
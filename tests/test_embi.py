@@ -0,0 +1,61 @@
+from io import BytesIO
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from services import market_data as md
+
+
+def _embi_xlsx() -> bytes:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Spread del EMBI (en %)"])
+    ws.append(["Fecha", "Global", "Argentina", "Venezuela", "Nota"])
+    ws.append([pd.Timestamp("2024-01-03"), 3.1, "19,5", 70.0, "x"])
+    ws.append([pd.Timestamp("2024-01-02"), 3.0, 20.25, "1.234,5", None])
+    ws.append([None, 1.0, 1.0, 1.0, None])
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def test_to_float_block_numbers_and_comma_text():
+    block = pd.DataFrame({"a": [1, "2,5", None], "b": ["1.234,5", 3.5, "s/d"]}, dtype=object)
+    out = md._to_float_block(block)
+    assert out.dtype == np.float64
+    np.testing.assert_array_equal(out, [[1.0, 1234.5], [2.5, 3.5], [np.nan, np.nan]])
+
+
+def test_parse_embi_cuts_at_last_col_and_sorts():
+    wide = md._parse_embi_xlsx(_embi_xlsx())
+    assert list(wide.columns) == ["Date", "Global", "Argentina", "Venezuela"]
+    assert wide["Date"].tolist() == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03")]
+    assert wide["Argentina"].tolist() == [20.25, 19.5]
+    assert wide["Venezuela"].tolist() == [1234.5, 70.0]
+
+
+@pytest.fixture
+def embi(monkeypatch):
+    wide = md._parse_embi_xlsx(_embi_xlsx())
+    monkeypatch.setattr(md, "get_embi_wide", lambda: wide)
+    md.get_embi_spread_long.clear()
+    md.get_riesgo_pais.clear()
+    yield wide
+    md.get_embi_spread_long.clear()
+    md.get_riesgo_pais.clear()
+
+
+def test_spread_long_in_points(embi):
+    long = md.get_embi_spread_long()
+    assert list(long.columns) == ["Date", "Serie", "Value"]
+    assert long["Serie"].tolist()[:3] == ["Global", "Argentina", "Venezuela"]
+    arg = long[long["Serie"] == "Argentina"]
+    assert arg["Value"].tolist() == pytest.approx([2025.0, 1950.0])
+
+
+def test_riesgo_pais_is_argentina_in_points(embi):
+    rp = md.get_riesgo_pais()
+    assert list(rp.columns) == ["Date", "value"]
+    assert rp["value"].tolist() == pytest.approx([2025.0, 1950.0])
@@ -0,0 +1,181 @@
+from io import BytesIO
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from services import excel_io
+
+
+def _workbook() -> bytes:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Datos"
+    ws.append(["Fecha", "Serie", "Nota", "Entero"])
+    for k in range(6):
+        ws.append([pd.Timestamp("2024-01-01") + pd.Timedelta(days=k), 1.5 * k, "s/d" if k % 2 else k, k])
+    ws.append([pd.Timestamp("2024-01-07"), None, None, 6])
+
+    ws = wb.create_sheet("Cuadro")
+    ws.append(["Cuadro 1. Título suelto"])
+    ws.append([])
+    ws.append(["Período", "Valor", "Var %"])
+    ws.append(["ene-24", 100, 0.5])
+    ws.append(["feb-24", 101.25, None])
+    ws.append(["Fuente: INDEC"])
+
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+SHEETS = {"Datos": {}, "Cuadro": {"header": None}}
+
+
+# ------------------------------------------------------------
+# _pack_sheet / _unpack_sheet
+# ------------------------------------------------------------
+def test_pack_roundtrip_mixed_frame():
+    df = pd.DataFrame(
+        {
+            "f": [1.5, np.nan, 3.0],
+            "i": np.array([1, 2, 3], dtype="int64"),
+            "d": pd.to_datetime(["2024-01-01", None, "2024-03-01"]).as_unit("us"),
+            "z": pd.to_datetime(["2024-01-01 10:00", "2024-02-01 00:00", None]).tz_localize("America/Argentina/Buenos_Aires"),
+            "o": pd.Series(["a", 2, 3.5], dtype=object),
+            "t": pd.Series([None, "x", np.nan], dtype=object),
+        },
+        index=pd.RangeIndex(3),
+    )
+    out = excel_io._unpack_sheet(excel_io._pack_sheet(df))
+    assert out["o"].tolist() == ["a", 2, 3.5]
+    assert isinstance(out["o"].iloc[1], int)
+    assert out["t"].iloc[1] == "x"
+    assert pd.isna(out["t"].iloc[0]) and pd.isna(out["t"].iloc[2])
+    pd.testing.assert_frame_equal(out[["f", "i", "d", "z"]], df[["f", "i", "d", "z"]])
+
+
+def test_pack_values_are_fortran_float64():
+    p = excel_io._pack_sheet(pd.DataFrame({"a": [1.0, 2.0], "b": ["x", 3]}))
+    assert p["values"].dtype == np.float64
+    assert p["values"].flags.f_contiguous
+    assert p["text"] == [(0, 1, "x")]
+
+
+# ------------------------------------------------------------
+# parse_sheets: pool de procesos == lectura secuencial
+# ------------------------------------------------------------
+@pytest.fixture
+def raw():
+    return _workbook()
+
+
+def test_parse_sheets_sequential_matches_read_excel(raw, monkeypatch):
+    monkeypatch.setattr(excel_io, "EXCEL_WORKERS", 1)
+    out = excel_io.parse_sheets(raw, SHEETS, engine="openpyxl")
+    for name, kw in SHEETS.items():
+        exp = pd.read_excel(BytesIO(raw), sheet_name=name, engine="openpyxl", **kw)
+        pd.testing.assert_frame_equal(out[name], exp)
+
+
+def test_parse_sheets_pool_roundtrip(raw, monkeypatch):
+    monkeypatch.setattr(excel_io, "EXCEL_WORKERS", 2)
+    try:
+        pooled = excel_io.parse_sheets(raw, SHEETS, engine="openpyxl")
+        if excel_io._POOL is None:
+            pytest.skip("sin procesos: parse_sheets cayó a la lectura secuencial")
+    finally:
+        excel_io._reset_pool()
+
+    for name, kw in SHEETS.items():
+        exp = pd.read_excel(BytesIO(raw), sheet_name=name, engine="openpyxl", **kw)
+        pd.testing.assert_frame_equal(pooled[name], exp)
+
+
+def test_parse_sheets_without_workers_never_starts_the_pool(raw, monkeypatch):
+    monkeypatch.setattr(excel_io, "_get_pool", lambda n: pytest.fail("CEU_EXCEL_WORKERS=0: sin pool"))
+    monkeypatch.setattr(excel_io, "EXCEL_WORKERS", 0)
+    assert set(excel_io.parse_sheets(raw, SHEETS, engine="openpyxl")) == set(SHEETS)
+
+
+class _HungPool:
+    def __init__(self, workers):
+        self.workers = workers
+        self.timeouts = []
+
+    def submit(self, fn, *args):
+        pool = self
+
+        class _Future:
+            def result(self, timeout=None):
+                pool.timeouts.append(timeout)
+                raise TimeoutError
+
+        return _Future()
+
+
+def test_parse_sheets_pool_timeout_falls_back_to_sequential(raw, monkeypatch):
+    pools, resets = [], []
+
+    def fake_get_pool(workers):
+        pools.append(_HungPool(workers))
+        return pools[-1]
+
+    monkeypatch.setattr(excel_io, "EXCEL_WORKERS", 8)
+    monkeypatch.setattr(excel_io, "EXCEL_POOL_TIMEOUT", 0.5)
+    monkeypatch.setattr(excel_io, "_get_pool", fake_get_pool)
+    monkeypatch.setattr(excel_io, "_reset_pool", lambda: resets.append(1))
+
+    out = excel_io.parse_sheets(raw, SHEETS, engine="openpyxl")
+    assert pools[0].workers == len(SHEETS)  # min(hojas, CEU_EXCEL_WORKERS)
+    assert pools[0].timeouts == [0.5]
+    assert resets == [1]
+    exp = pd.read_excel(BytesIO(raw), sheet_name="Cuadro", engine="openpyxl", header=None)
+    pd.testing.assert_frame_equal(out["Cuadro"], exp)
+
+
+# ------------------------------------------------------------
+# selección de motor
+# ------------------------------------------------------------
+def test_engine_for_respects_format_and_forced(raw, monkeypatch):
+    monkeypatch.setattr(excel_io, "FORCED_ENGINE", None)
+    monkeypatch.setattr(excel_io, "_HAS_CALAMINE", False)
+    assert excel_io.engine_for(raw) == "openpyxl"
+    assert excel_io.engine_for(excel_io.OLE2_MAGIC + b"\x00" * 8) == "xlrd"
+    assert excel_io.available_engines() == ["openpyxl", "xlrd"]
+
+    monkeypatch.setattr(excel_io, "_HAS_CALAMINE", True)
+    monkeypatch.setattr(excel_io, "_PANDAS_CALAMINE", True)
+    assert excel_io.engine_for(raw) == "calamine"
+    assert excel_io.available_engines()[0] == "calamine"
+
+    monkeypatch.setattr(excel_io, "FORCED_ENGINE", "openpyxl")
+    assert excel_io.engine_for(raw) == "openpyxl"
+
+
+def test_read_excel_falls_back_to_classic_engine(raw, monkeypatch):
+    engines = []
+    real = pd.read_excel
+
+    def fake_read_excel(src, sheet_name=0, engine=None, **kwargs):
+        engines.append(engine)
+        if engine == "calamine":
+            raise ValueError("calamine no pudo")
+        return real(src, sheet_name=sheet_name, engine=engine, **kwargs)
+
+    monkeypatch.setattr(excel_io.pd, "read_excel", fake_read_excel)
+    monkeypatch.setattr(excel_io, "engine_for", lambda src: "calamine")
+    out = excel_io.read_excel(raw, sheet_name="Datos")
+    assert engines == ["calamine", "openpyxl"]
+    assert len(out) == 7
+
+    with pytest.raises(ValueError):
+        excel_io.read_excel(raw, sheet_name="Datos", engine="calamine")  # motor explícito: sin fallback
+
+
+def test_iter_rows_openpyxl_streaming(raw):
+    rows = list(excel_io.iter_rows(raw, "Cuadro", engine="openpyxl"))
+    assert rows[0][0] == "Cuadro 1. Título suelto"
+    assert rows[2] == ("Período", "Valor", "Var %")
+    assert rows[-1][0] == "Fuente: INDEC"
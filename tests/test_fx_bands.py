@@ -0,0 +1,134 @@
+import pandas as pd
+import pytest
+
+from services import macro_data as mdata
+
+
+def _vintages(editions: dict[str, dict[str, float]]) -> pd.DataFrame:
+    """{fecha edición: {mes "YYYY-MM": mediana en %}} en el formato largo del REM."""
+    rows = [
+        {
+            "Fecha de pronóstico": pd.Timestamp(fecha),
+            "Variable": mdata.REM_IPC_VARIABLE,
+            "Referencia": mdata.REM_IPC_REFERENCIA,
+            "Date": pd.Period(mes, freq="M").to_timestamp(how="end").normalize(),
+            "Mediana": med,
+        }
+        for fecha, path in editions.items()
+        for mes, med in path.items()
+    ]
+    return pd.DataFrame(rows)
+
+
+def _ipc(path: dict[str, float]) -> pd.DataFrame:
+    """IPC BCRA: {mes: variación en DECIMAL}."""
+    periods = pd.PeriodIndex(list(path), freq="M")
+    return pd.DataFrame({"Date": periods.to_timestamp(how="end").normalize(), "v_m_CPI": list(path.values()), "Period": periods})
+
+
+def _reference_path(monthly: dict[str, float], end: str) -> pd.DataFrame:
+    """Bucle día a día: banda del mes M con la inflación (decimal) de M-2."""
+    b25 = mdata.build_bands_2025(mdata.BANDS_2025_START, mdata.BANDS_2025_END, mdata.BANDS_LOWER0, mdata.BANDS_UPPER0)
+    lo, up = b25["lower"].iloc[-1], b25["upper"].iloc[-1]
+    rows = []
+    for d in pd.date_range("2026-01-01", end, freq="D"):
+        r = (1 + monthly[str(d.to_period("M") - 2)]) ** (1 / 30) - 1
+        lo, up = lo * (1 - r), up * (1 + r)
+        rows.append((d, lo, up))
+    return pd.DataFrame(rows, columns=mdata.BANDS_COLS)
+
+
+REM_PATH = {"2025-11": 2.0, "2025-12": 2.1, "2026-01": 2.2, "2026-02": 2.3, "2026-03": 2.4}
+IPC = {"2025-10": 0.023, "2025-11": 0.025, "2025-12": 0.028, "2026-01": 0.022}
+
+
+def test_single_vintage_matches_daily_loop():
+    # 2026-02-20: a esa fecha se conoce el IPC hasta 2026-01
+    out = mdata.fx_bands_by_vintage(_vintages({"2026-02-20": REM_PATH}), _ipc(IPC))
+    monthly = {"2025-11": 0.025, "2025-12": 0.028, "2026-01": 0.022, "2026-02": 0.023, "2026-03": 0.024}
+    exp = _reference_path(monthly, "2026-05-31")
+
+    assert list(out.columns) == ["Fecha de pronóstico", *mdata.BANDS_COLS]
+    assert (out["Fecha de pronóstico"] == pd.Timestamp("2026-02-20")).all()
+    pd.testing.assert_frame_equal(out[mdata.BANDS_COLS].reset_index(drop=True), exp, check_dtype=False)
+
+
+def test_ipc_known_only_after_publication():
+    fechas = pd.to_datetime(["2025-12-10", "2025-12-20", "2026-01-15", "2026-01-16"])
+    known = pd.PeriodIndex.from_ordinals(mdata.ipc_known_until(fechas), freq="M").astype(str).tolist()
+    assert known == ["2025-10", "2025-11", "2025-11", "2025-12"]
+
+
+def test_each_vintage_uses_ipc_known_at_its_date():
+    out = mdata.fx_bands_by_vintage(_vintages({"2025-12-10": REM_PATH, "2026-02-20": REM_PATH}), _ipc(IPC))
+    early = out[out["Fecha de pronóstico"] == "2025-12-10"].reset_index(drop=True)
+
+    # la edición de diciembre todavía no conocía el IPC de noviembre: usa la mediana REM
+    monthly = {"2025-11": 0.020, "2025-12": 0.021, "2026-01": 0.022, "2026-02": 0.023, "2026-03": 0.024}
+    pd.testing.assert_frame_equal(early[mdata.BANDS_COLS], _reference_path(monthly, "2026-05-31"), check_dtype=False)
+    assert out["Fecha de pronóstico"].nunique() == 2
+
+
+def test_missing_month_cuts_path():
+    path = {k: v for k, v in REM_PATH.items() if k != "2026-02"}
+    out = mdata.fx_bands_by_vintage(_vintages({"2025-12-10": path}), _ipc({}))
+    assert out["Date"].max() == pd.Timestamp("2026-03-31")
+
+
+def test_edition_without_2026_forecasts_is_dropped():
+    out = mdata.fx_bands_by_vintage(
+        _vintages({"2024-06-05": {"2024-07": 3.0, "2024-08": 2.9}, "2026-02-20": REM_PATH}), _ipc(IPC)
+    )
+    assert out["Fecha de pronóstico"].unique().tolist() == [pd.Timestamp("2026-02-20")]
+
+
+def test_empty_inputs():
+    cols = ["Fecha de pronóstico", "Variable", "Referencia", "Date", "Mediana"]
+    assert mdata.fx_bands_by_vintage(pd.DataFrame(columns=cols), _ipc(IPC)).empty
+    assert mdata.fx_bands_by_vintage(_vintages({"2025-12-10": REM_PATH}), None)["Date"].max() == pd.Timestamp("2026-05-31")
+
+
+@pytest.fixture
+def live(monkeypatch):
+    vintages = _vintages({"2025-12-10": REM_PATH, "2026-02-20": REM_PATH})
+    ipc = _ipc(IPC)
+    monkeypatch.setattr(mdata, "get_rem_vintages", lambda: vintages)
+    monkeypatch.setattr(mdata, "get_ipc_bcra", lambda: ipc)
+    mdata._fx_bands_for.clear()
+    yield vintages, ipc
+    mdata._fx_bands_for.clear()
+
+
+def test_get_fx_bands_uses_all_published_ipc(live):
+    # la edición de diciembre no conocía el IPC de noviembre, pero la vista
+    # vigente usa todo el IPC publicado hoy y el REM solo para lo que falta
+    monthly = {"2025-11": 0.025, "2025-12": 0.028, "2026-01": 0.022, "2026-02": 0.023, "2026-03": 0.024}
+    for fecha in ("2025-12-10", "2026-02-20", None):
+        bands = mdata.get_fx_bands(fecha)
+        got = bands[bands["Date"] >= "2026-01-01"].reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, _reference_path(monthly, "2026-05-31"), check_dtype=False)
+        assert bands["Date"].min() == pd.Timestamp(mdata.BANDS_2025_START)
+        assert bands["Date"].is_monotonic_increasing
+
+
+def test_get_fx_bands_differs_from_vintage_view_before_publication(live):
+    vintages, ipc = live
+    hist = mdata.fx_bands_by_vintage(vintages, ipc)
+    hist = hist[hist["Fecha de pronóstico"] == "2025-12-10"].reset_index(drop=True)
+    bands = mdata.get_fx_bands("2025-12-10")
+    got = bands[bands["Date"] >= "2026-01-01"].reset_index(drop=True)
+    assert got["upper"].iloc[0] > hist["upper"].iloc[0]  # IPC nov (2,5%) > mediana REM (2,0%)
+
+
+def test_get_fx_bands_skips_missing_month(monkeypatch):
+    path = {k: v for k, v in REM_PATH.items() if k != "2026-02"}
+    monkeypatch.setattr(mdata, "get_rem_vintages", lambda: _vintages({"2025-12-10": path}))
+    monkeypatch.setattr(mdata, "get_ipc_bcra", lambda: _ipc({}))
+    mdata._fx_bands_for.clear()
+    try:
+        bands = mdata.get_fx_bands()
+    finally:
+        mdata._fx_bands_for.clear()
+
+    # abril (se mueve con febrero) queda afuera; mayo sigue desde marzo
+    assert bands.loc[bands["Date"].dt.year == 2026, "Date"].dt.month.unique().tolist() == [1, 2, 3, 5]
@@ -0,0 +1,85 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+import requests
+
+from services import http_cache
+
+URL = "https://example.org/serie.csv"
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch, fake_response):
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_DIR", tmp_path / "http")
+    monkeypatch.setattr(http_cache, "_STALE", {})
+    monkeypatch.setattr(http_cache, "_PARSED", type(http_cache._PARSED)())
+    state = {"body": b"a,b\n1,2\n", "etag": '"v1"', "requests": [], "down": False}
+
+    def fake_get(url, profile="default", headers=None, **kwargs):
+        state["requests"].append(dict(headers or {}))
+        if state["down"]:
+            raise requests.exceptions.ConnectionError("sin red")
+        if (headers or {}).get("If-None-Match") == state["etag"]:
+            return fake_response(304)
+        return fake_response(200, state["body"], {"ETag": state["etag"]})
+
+    monkeypatch.setattr(http_cache.http_client, "get", fake_get)
+    return state
+
+
+def test_revalidates_with_etag_and_reuses_disk_copy(server):
+    assert http_cache.fetch_static(URL) == (b"a,b\n1,2\n", '"v1"')
+    assert "If-None-Match" not in server["requests"][0]
+
+    assert http_cache.fetch_static(URL) == (b"a,b\n1,2\n", '"v1"')
+    assert server["requests"][1]["If-None-Match"] == '"v1"'
+    assert not list(http_cache.HTTP_CACHE_DIR.glob("*.tmp"))
+
+
+def test_body_meta_mismatch_is_not_trusted(server):
+    http_cache.fetch_static(URL)
+    body_path, _ = http_cache._paths(URL)
+    body_path.write_bytes(b"a,b\n9,9\n")  # body nuevo de otro proceso, meta viejo
+
+    assert http_cache._read_cached(URL) == (None, {})
+    http_cache.fetch_static(URL)
+    assert "If-None-Match" not in server["requests"][-1]  # GET completo, no 304 sobre un par mezclado
+    assert http_cache._read_cached(URL)[0] == b"a,b\n1,2\n"
+
+
+def test_network_error_serves_disk_copy_and_notes_it(server):
+    http_cache.fetch_static(URL)
+    server["down"] = True
+    assert http_cache.fetch_static(URL) == (b"a,b\n1,2\n", '"v1"')
+    assert "sin red" in http_cache.stale_error(URL)
+
+    http_cache._paths(URL)[0].unlink()
+    with pytest.raises(requests.exceptions.ConnectionError):
+        http_cache.fetch_static(URL)
+
+
+def test_load_static_reuses_parse_and_returns_copies(server):
+    parses = []
+
+    def parse(raw):
+        parses.append(raw)
+        return pd.read_csv(BytesIO(raw))
+
+    a = http_cache.load_static(URL, parse)
+    a.loc[0, "a"] = 99
+    b = http_cache.load_static(URL, parse)
+    assert len(parses) == 1
+    assert b.loc[0, "a"] == 1
+
+    server["body"], server["etag"] = b"a,b\n3,4\n", '"v2"'
+    assert http_cache.load_static(URL, parse).loc[0, "a"] == 3
+    assert len(parses) == 2
+
+
+def test_parsed_memo_is_bounded(server, monkeypatch):
+    monkeypatch.setattr(http_cache, "PARSED_MAX_ENTRIES", 2)
+    for k in range(4):
+        http_cache.load_static(f"{URL}?k={k}", lambda raw: raw)
+    assert len(http_cache._PARSED) == 2
+    assert [u for u, _ in http_cache._PARSED] == [f"{URL}?k=2", f"{URL}?k=3"]
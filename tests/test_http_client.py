@@ -0,0 +1,144 @@
+import pytest
+import requests
+
+from services import http_client
+
+
+class FakeSession:
+    """Session simulada: responde en orden lo que haya en replies (excepciones se lanzan)."""
+
+    def __init__(self, fake_response):
+        self.replies: list = []
+        self.calls: list[tuple[str, dict]] = []
+        self.response = fake_response
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        r = self.replies.pop(0) if self.replies else 200
+        if isinstance(r, Exception):
+            raise r
+        return self.response(status_code=r)
+
+
+@pytest.fixture
+def client(monkeypatch, fake_response):
+    sess = FakeSession(fake_response)
+    monkeypatch.setattr(http_client, "_SESSIONS", {})
+    monkeypatch.setattr(http_client, "_BREAKERS", {})
+    monkeypatch.setattr(http_client, "get_session", lambda profile="default": sess)
+    return sess
+
+
+# ------------------------------------------------------------
+# sesiones y perfiles
+# ------------------------------------------------------------
+def test_one_session_per_profile(monkeypatch):
+    monkeypatch.setattr(http_client, "_SESSIONS", {})
+    a = http_client.get_session("indec")
+    assert http_client.get_session("indec") is a
+    assert http_client.get_session("rss") is not a
+    assert a.headers["Accept-Encoding"] == "gzip, deflate"
+
+    adapter = a.get_adapter("https://www.indec.gob.ar/")
+    assert adapter.max_retries.total == http_client.PROFILES["indec"]["retries"]
+    assert http_client.get_session("bcra_api").get_adapter("https://x/").max_retries.total == 0
+
+
+def test_get_uses_profile_timeout(client):
+    http_client.get("https://api.bcra.gob.ar/x", profile="bcra_api", params={"a": 1})
+    http_client.get("https://example.com/y", profile="no-existe")
+    http_client.get("https://example.com/z", timeout=3)
+    (_, k1), (_, k2), (_, k3) = client.calls
+    assert k1 == {"timeout": http_client.PROFILES["bcra_api"]["timeout"], "params": {"a": 1}}
+    assert k2["timeout"] == http_client.PROFILES["default"]["timeout"]
+    assert k3["timeout"] == 3
+
+
+def test_get_bytes_raises_on_http_error(client):
+    client.replies.append(404)
+    with pytest.raises(requests.exceptions.HTTPError):
+        http_client.get_bytes("https://example.com/x")
+
+
+# ------------------------------------------------------------
+# circuit breaker por host
+# ------------------------------------------------------------
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(http_client, "time", c)
+    return c
+
+
+URL = "https://api.bcra.gob.ar/estadisticas"
+
+
+def _trip(client):
+    client.replies.extend([requests.exceptions.ConnectTimeout("t")] * http_client.BREAKER_FAILURES)
+    for _ in range(http_client.BREAKER_FAILURES):
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            http_client.get(URL)
+
+
+def test_breaker_opens_after_consecutive_failures(client, clock):
+    _trip(client)
+    assert not http_client.is_available(URL)
+    assert not http_client.is_available("API.bcra.gob.ar")
+    assert http_client.is_available("https://otro.host/x")
+
+    n = len(client.calls)
+    with pytest.raises(http_client.SourceUnavailable):
+        http_client.get(URL + "/otra")
+    assert len(client.calls) == n  # no tocó la red
+
+
+def test_success_resets_the_count(client, clock):
+    client.replies.extend([503, 503, 200, 503, 503])
+    for _ in range(5):
+        http_client.get(URL)
+    assert http_client.is_available(URL)
+    assert http_client._BREAKERS[http_client._host(URL)]["failures"] == 2
+
+
+def test_status_429_and_5xx_count_but_4xx_does_not(client, clock):
+    client.replies.extend([404, 429, 500])
+    for _ in range(3):
+        http_client.get(URL)
+    assert http_client._BREAKERS[http_client._host(URL)]["failures"] == 2
+
+
+def test_half_open_lets_one_probe_through(client, clock):
+    _trip(client)
+    clock.now += http_client.BREAKER_COOLDOWN
+
+    host = http_client._host(URL)
+    http_client._breaker_before(host)  # la prueba en curso
+    with pytest.raises(http_client.SourceUnavailable):
+        http_client.get(URL)  # una segunda llamada no pasa mientras se prueba
+
+    http_client._breaker_after(host, ok=False)  # la prueba falla: vuelve a abrir
+    assert not http_client.is_available(URL)
+
+    clock.now += http_client.BREAKER_COOLDOWN
+    assert http_client.get(URL).status_code == 200  # prueba ok: cierra
+    assert host not in http_client._BREAKERS
+
+
+def test_local_error_releases_probe_without_counting(client, clock):
+    _trip(client)
+    clock.now += http_client.BREAKER_COOLDOWN
+    client.replies.append(requests.exceptions.InvalidURL("url rota"))
+    with pytest.raises(requests.exceptions.InvalidURL):
+        http_client.get(URL)
+
+    b = http_client._BREAKERS[http_client._host(URL)]
+    assert b["failures"] == http_client.BREAKER_FAILURES and not b["probing"]
+    assert http_client.get(URL).status_code == 200  # la próxima puede probar
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import market_data as md
+
+
+def _frame(start, close, adj=None):
+    close = np.asarray(close, dtype="float64")
+    adj = close if adj is None else np.asarray(adj, dtype="float64")
+    return pd.DataFrame(
+        {
+            "Date": pd.date_range(start, periods=len(close)),
+            "Open": close,
+            "High": close,
+            "Low": close,
+            "Close": close,
+            "Adj Close": adj,
+            "Volume": np.ones(len(close)),
+        }
+    )
+
+
+# ------------------------------------------------------------
+# _field_wide: formatos de yf.download
+# ------------------------------------------------------------
+def test_field_wide_multiindex_and_flat():
+    idx = pd.DatetimeIndex(["2024-01-02 00:00", "2024-01-01 00:00", "2024-01-02 00:00"]).tz_localize("UTC")
+    cols = pd.MultiIndex.from_product([["Close", "Volume"], ["AAA", "BBB"]])
+    dl = pd.DataFrame(np.arange(12, dtype="float64").reshape(3, 4), index=idx, columns=cols)
+
+    close = md._field_wide(dl, "Close", ("BBB", "ZZZ", "AAA"))
+    assert list(close.columns) == ["BBB", "ZZZ", "AAA"]
+    assert close.index.tz is None and close.index.is_monotonic_increasing and close.index.is_unique
+    assert close.loc["2024-01-02", "AAA"] == 8.0  # fecha repetida: gana la última
+    assert close["ZZZ"].isna().all() and close.to_numpy().flags.f_contiguous
+
+    flat = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.date_range("2024-01-01", periods=2))
+    assert md._field_wide(flat, "Close", ("AAA",))["AAA"].tolist() == [1.0, 2.0]
+    assert md._field_wide(flat, "Adj Close", ("AAA",))["AAA"].isna().all()
+
+
+# ------------------------------------------------------------
+# hub_panel: registro único y extensión del panel vigente
+# ------------------------------------------------------------
+@pytest.fixture
+def hub(monkeypatch):
+    history = {"AAA": _frame("2024-01-01", [1, 2, 3]), "BBB": _frame("2024-01-02", [10, 20])}
+    syncs = []
+
+    def fake_sync(tickers):
+        syncs.append(tuple(tickers))
+        return {t: history[t] for t in tickers if t in history}
+
+    monkeypatch.setattr(md, "sync_yahoo_history", fake_sync)
+    monkeypatch.setattr(md, "_registry", ["AAA", "BBB"])
+    monkeypatch.setattr(md, "_extended", None)
+    md._hub_panel.clear()
+    yield history, syncs
+    md._hub_panel.clear()
+
+
+def test_hub_panel_one_sync_for_the_registry(hub):
+    _, syncs = hub
+    panel = md.hub_panel()
+    assert syncs == [("AAA", "BBB")]
+    assert list(panel["Close"].columns) == ["AAA", "BBB"]
+    assert panel["Close"].index.tolist() == list(pd.date_range("2024-01-01", periods=3))
+    assert np.isnan(panel["Close"].loc["2024-01-01", "BBB"])
+    assert md.hub_panel() is panel and len(syncs) == 1
+
+
+def test_registered_ticker_extends_current_panel(hub):
+    history, syncs = hub
+    base = md.hub_panel()
+    history["CCC"] = _frame("2024-01-03", [7])
+
+    s = md.hub_series("CCC")
+    assert syncs[-1] == ("CCC",)  # solo el nuevo
+    assert s.dropna().tolist() == [7.0]
+    assert list(base["Close"].columns) == ["AAA", "BBB"]  # el panel del swr no se toca
+
+    panel = md.hub_panel()
+    assert list(panel["Close"].columns) == ["AAA", "BBB", "CCC"]
+    assert md.hub_panel() is panel and len(syncs) == 2
+
+
+def test_hub_series_is_a_view_and_adjusted_falls_back(hub):
+    history, _ = hub
+    history["AAA"] = _frame("2024-01-01", [1, 2, 3], adj=[0.5, 1.0, 1.5])
+    history["BBB"] = _frame("2024-01-02", [10, 20], adj=[np.nan, np.nan])
+    panel = md.hub_panel()
+
+    s = md.hub_series("AAA")
+    assert np.shares_memory(s.to_numpy(), panel["Close"].to_numpy())
+    assert md.hub_series("AAA", adjusted=True).tolist() == [0.5, 1.0, 1.5]
+    assert md.hub_series("BBB", adjusted=True).dropna().tolist() == [10.0, 20.0]
+    assert md.hub_df("BBB", start="2024-01-03")["value"].tolist() == [20.0]
+
+
+def test_unknown_ticker_gets_an_empty_column(hub):
+    md.hub_panel()
+    assert md.hub_series("NOPE").isna().all()
+    assert "NOPE" in md.hub_panel()["Close"].columns
+
+
+# ------------------------------------------------------------
+# CCL YPF: una serie canónica por panel y recortes
+# ------------------------------------------------------------
+@pytest.fixture
+def ccl(monkeypatch):
+    frames = {
+        "YPFD.BA": _frame("2024-01-01", [1000, 1100, np.nan, 1300], adj=[900, 990, np.nan, 1170]),
+        "YPF": _frame("2024-01-01", [10, 10, 10, 0]),
+    }
+    state = {"panel": md._panel_from_frames(frames, md.CCL_TICKERS)}
+    monkeypatch.setattr(md, "hub_panel", lambda: state["panel"])
+    monkeypatch.setattr(md, "_ccl_memo", {})
+    return frames, state
+
+
+def test_ccl_ratio_drops_missing_and_non_finite(ccl):
+    s = md.get_ccl_ypf()
+    assert s.name == "CCL_YPF"
+    assert s.index.tolist() == list(pd.date_range("2024-01-01", periods=2))
+    assert s.tolist() == [100.0, 110.0]
+    assert md.get_ccl_ypf(adjusted=True).tolist() == [90.0, 99.0]
+
+
+def test_ccl_memo_per_panel_identity(ccl):
+    frames, state = ccl
+    s = md.get_ccl_ypf()
+    assert md.get_ccl_ypf() is s
+    assert md.get_ccl_ypf(adjusted=True) is not s
+
+    frames["YPF"] = _frame("2024-01-01", [20, 20, 20, 20])
+    state["panel"] = md._panel_from_frames(frames, md.CCL_TICKERS)  # refresco del hub
+    assert md.get_ccl_ypf().tolist() == [50.0, 55.0, 65.0]
+
+
+def test_ccl_slices_come_from_the_canonical_series(ccl):
+    frames, state = ccl
+    frames["YPF"] = _frame("2024-01-01", [10, 10, 10, 10])
+    state["panel"] = md._panel_from_frames(frames, md.CCL_TICKERS)
+    full = md.get_ccl_ypf()
+
+    hist = md.get_ccl_ypf_history(start="2024-01-02")
+    assert hist.tolist() == [110.0, 130.0]
+    assert np.shares_memory(hist.to_numpy(), full.to_numpy())
+
+    df = md.get_ccl_ypf_df_fast(period="2d")
+    assert list(df.columns) == ["Date", "value"] and df["value"].tolist() == [110.0, 130.0]
+    assert len(md.get_ccl_ypf_df_fast(period="max")) == 3
+    assert md.get_ccl_ypf_df(start="2024-01-04")["value"].tolist() == [130.0]
+
+
+def test_period_start():
+    last = pd.Timestamp("2024-06-30")
+    assert md._period_start("6mo", last) == pd.Timestamp("2023-12-30")
+    assert md._period_start("2Y", last) == pd.Timestamp("2022-06-30")
+    assert md._period_start("1wk", last) == pd.Timestamp("2024-06-23")
+    assert md._period_start("10d", last) == pd.Timestamp("2024-06-20")
+    assert md._period_start("max", last) is None
+
+
+def test_ccl_without_panel_is_empty(monkeypatch):
+    def down():
+        raise RuntimeError("yahoo caído")
+
+    monkeypatch.setattr(md, "hub_panel", down)
+    assert md.get_ccl_ypf().empty
+    assert md.get_ccl_ypf_df_fast().empty
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+
+from services import macro_data as mdata
+
+HEADER = "Codigo;Descripcion;Clasificador;Periodo;Indice_IPC;v_m_IPC;v_i_a_IPC;Region"
+
+
+def _csv() -> bytes:
+    rows = [HEADER]
+    # desordenado a propósito: el parser ordena por (Region, Codigo, Periodo)
+    for periodo in ("202403", "202401", "202402"):
+        for region in ("Nacional", "GBA"):
+            for codigo, desc in (("0", "Nivel general"), ("B", "Bienes"), ("01", "Alimentos")):
+                idx = f"{int(periodo[-2:]) * 100 + len(region)},5"
+                rows.append(f"{codigo};{desc};Nivel general y divisiones;{periodo};{idx};2,5;200,1;{region}")
+    return ("\n".join(rows) + "\n").encode("utf-8")
+
+
+@pytest.fixture
+def ipc():
+    return mdata._parse_ipc_indec_csv(_csv())
+
+
+def _mask(df, codigo, region):
+    return df[(df["Codigo"].astype(str) == codigo) & (df["Region"].astype(str) == region)].sort_values("Periodo")
+
+
+def test_parse_builds_contiguous_index(ipc):
+    assert ipc.attrs["ipc_rows"] == len(ipc) == 18
+    assert set(ipc.attrs["ipc_index"]) == {(c, r) for c in ("0", "B", "01") for r in ("Nacional", "GBA")}
+    # "01" no se convierte en 1 y el decimal con coma se parsea
+    assert ipc["Indice_IPC"].iloc[0] % 1 == 0.5
+
+
+@pytest.mark.parametrize("codigo,region", [("0", "Nacional"), (0, "Nacional"), ("01", "GBA"), ("B", " GBA ")])
+def test_fast_path_matches_mask(ipc, codigo, region):
+    out = mdata.ipc_select(ipc, codigo, region)
+    exp = _mask(ipc, str(codigo).strip(), region.strip())
+    assert len(out) == 3
+    pd.testing.assert_frame_equal(out, exp)
+    assert out["Periodo"].is_monotonic_increasing
+
+
+def test_unknown_key_is_empty(ipc):
+    out = mdata.ipc_select(ipc, "99")
+    assert out.empty
+    assert list(out.columns) == list(ipc.columns)
+
+
+def test_reordered_frame_falls_back_to_mask(ipc):
+    # attrs sobrevive a sort_values + reset_index: el rango guardado ya no vale
+    shuffled = ipc.sort_values(["Periodo", "Codigo"]).reset_index(drop=True)
+    assert shuffled.attrs.get("ipc_index")
+    out = mdata.ipc_select(shuffled, "B", "Nacional")
+    assert (out["Codigo"].astype(str) == "B").all()
+    assert (out["Region"].astype(str) == "Nacional").all()
+    assert out["Periodo"].is_monotonic_increasing
+    assert len(out) == 3
+
+
+def test_reversed_frame_falls_back_to_mask(ipc):
+    out = mdata.ipc_select(ipc.iloc[::-1], "0", "GBA")
+    pd.testing.assert_frame_equal(out, _mask(ipc, "0", "GBA"))
+
+
+def test_filtered_frame_falls_back_to_mask(ipc):
+    sub = ipc[ipc["Region"].astype(str) == "Nacional"]
+    out = mdata.ipc_select(sub, "01", "Nacional")
+    pd.testing.assert_frame_equal(out, _mask(ipc, "01", "Nacional"))
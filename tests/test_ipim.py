@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import macro_data as mdata
+
+
+def _csv(sep: str, values: list[str], encoding="utf-8") -> bytes:
+    lines = [sep.join(["periodo", "nivel_general_aperturas", "indice_ipim"])]
+    for k, v in enumerate(values):
+        per = (pd.Timestamp("2023-01-01") + pd.DateOffset(months=k)).strftime("%Y-%m-%d")
+        lines.append(sep.join([per, "Nivel general", v]))
+        lines.append(sep.join([per, "Productos nacionales", v]))
+    lines.append(sep.join(["2023-02-01", "Energía eléctrica", '"1.234,5"']))
+    return ("\n".join(lines) + "\n").encode(encoding)
+
+
+VALUES = [f"{100 + k}" for k in range(13)]
+
+
+def test_sniff_delimiter():
+    assert mdata._sniff_delimiter(b"a;b;c\n1,5;2;3\n") == ";"
+    assert mdata._sniff_delimiter(b"a,b,c\n1;2;3\n") == ","
+    assert mdata._sniff_delimiter(b"a\tb\n") == "\t"
+
+
+@pytest.mark.parametrize("sep,encoding", [(";", "utf-8"), (",", "utf-8"), ("\t", "latin1")])
+def test_parse_ipim_any_delimiter_and_encoding(sep, encoding):
+    out = mdata._parse_ipim_csv(_csv(sep, VALUES, encoding=encoding))
+    assert list(out.columns) == ["Periodo", "Apertura", "Indice", "v_m", "v_i_a"]
+    assert isinstance(out["Apertura"].dtype, pd.CategoricalDtype)
+    assert set(out["Apertura"].astype(str)) == {"nivel_general", "productos_nacionales", "energía_eléctrica"}
+
+    ng = out[out["Apertura"] == "nivel_general"]
+    assert ng["Periodo"].is_monotonic_increasing and len(ng) == 13
+    assert ng["v_m"].iloc[1] == pytest.approx(1.0)
+    assert np.isnan(ng["v_i_a"].iloc[11]) and ng["v_i_a"].iloc[12] == pytest.approx(12.0)
+
+
+def test_parse_ipim_comma_decimal_with_thousands():
+    out = mdata._parse_ipim_csv(_csv(";", VALUES))
+    assert out.loc[out["Apertura"] == "energía_eléctrica", "Indice"].tolist() == [1234.5]
+
+
+def test_parse_ipim_unexpected_columns():
+    out = mdata._parse_ipim_csv(b"fecha;valor\n2024-01-01;1\n")
+    assert out.empty and list(out.columns) == ["Periodo", "Apertura", "Indice", "v_m", "v_i_a"]
@@ -0,0 +1,58 @@
+from io import BytesIO
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from services import macro_data as mdata
+
+
+def _itcrm_xlsx() -> bytes:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = mdata.ITCRM_SHEET
+    ws.append(["Índice de Tipo de Cambio Real Multilateral diario"])
+    ws.append(["Período", "ITCRM", "Brasil", None, "China"])
+    ws.append(["03/01/2024", 100.0, 90.0, None, None])
+    ws.append([pd.Timestamp("2024-01-01"), 98.0, 88.0, None, 70.0])
+    ws.append(["02/01/2024", 99.0, "s/d", None, 71.0])
+    ws.append(["03/01/2024", 101.0, 91.0, None, None])  # repetida: gana la última
+    ws.append(["04/01/2024", None, None, None, None])  # fila sin datos
+    ws.append(["Fuente: BCRA", None, None, None, None])
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def wide():
+    return mdata._parse_itcrm_xlsx(_itcrm_xlsx())
+
+
+def test_itcrm_wide_matrix(wide):
+    assert list(wide.columns) == ["ITCRM", "Brasil", "China"]
+    assert wide.index.name == "Date"
+    assert wide.index.tolist() == list(pd.date_range("2024-01-01", "2024-01-03"))
+    assert wide.to_numpy().dtype == np.float64 and wide.to_numpy().flags.f_contiguous
+    assert wide.loc["2024-01-03", "ITCRM"] == 101.0
+    assert np.isnan(wide.loc["2024-01-02", "Brasil"])
+
+
+def test_itcrm_attrs(wide):
+    assert wide.attrs["cols"] == {"ITCRM": 0, "Brasil": 1, "China": 2}
+    assert wide.attrs["last"] == {
+        "ITCRM": pd.Timestamp("2024-01-03"),
+        "Brasil": pd.Timestamp("2024-01-03"),
+        "China": pd.Timestamp("2024-01-02"),
+    }
+
+
+def test_itcrm_views_do_not_copy(wide):
+    views = mdata.itcrm_views(wide, ["China", "ITCRM", "Uruguay"])
+    assert list(views) == ["China", "ITCRM"]
+    assert views["ITCRM"].tolist() == [98.0, 99.0, 101.0]
+    assert np.shares_memory(views["China"].to_numpy(), wide.to_numpy())
+
+    plain = pd.DataFrame({"a": [1.0, 2.0]}, index=pd.DatetimeIndex(["2024-01-01", "2024-01-02"], name="Date"))
+    assert mdata.itcrm_views(plain, ["a"])["a"].tolist() == [1.0, 2.0]  # sin attrs
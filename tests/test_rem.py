@@ -0,0 +1,76 @@
+from io import BytesIO
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from services import macro_data as mdata
+
+IPC, REF = mdata.REM_IPC_VARIABLE, mdata.REM_IPC_REFERENCIA
+
+
+def _rem_xlsx(rows) -> bytes:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = mdata.REM_SHEET
+    ws.append(["Relevamiento de Expectativas de Mercado (REM)"])
+    ws.append(["Tipo", "Fecha de pronóstico", "Variable", "Referencia", "Período", "Mediana", "Promedio", "Desvío"])
+    for r in rows:
+        ws.append(["Mensual", *r, 0.1])
+    buf = BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+ROWS = [
+    (pd.Timestamp("2025-12-05"), IPC, REF, pd.Timestamp("2025-11-30"), 2.0, 2.05),
+    (pd.Timestamp("2025-12-05"), IPC, REF, pd.Timestamp("2025-12-31"), 2.1, "-"),
+    (pd.Timestamp("2025-12-05"), IPC, "var. % i.a.", "Próx. 12 meses", 22, 23),
+    (pd.Timestamp("2025-12-05"), "Tipo de cambio nominal", "$/US$", pd.Timestamp("2025-12-31"), 1500, 1510),
+    (pd.Timestamp("2026-01-08"), IPC, REF, pd.Timestamp("2025-12-31"), 2.3, 2.3),
+    (pd.Timestamp("2026-01-08"), IPC, REF, pd.Timestamp("2026-01-31"), 2.2, 2.25),
+    (None, IPC, REF, pd.Timestamp("2026-01-31"), 9.9, 9.9),
+]
+
+
+@pytest.fixture
+def vintages():
+    return mdata._parse_rem_vintages_xlsx(_rem_xlsx(ROWS))
+
+
+def test_parse_keeps_only_wanted_variables_and_every_edition(vintages):
+    assert set(vintages["Variable"].astype(str)) == {IPC}
+    assert vintages["Fecha de pronóstico"].drop_duplicates().tolist() == [
+        pd.Timestamp("2025-12-05"),
+        pd.Timestamp("2026-01-08"),
+    ]
+    assert len(vintages) == 5  # sin la fila sin fecha de pronóstico
+
+
+def test_parse_dtypes(vintages):
+    assert vintages["Mediana"].dtype == "float64"
+    assert vintages["Promedio"].dtype == "float64"
+    assert isinstance(vintages["Variable"].dtype, pd.CategoricalDtype)
+    twelve = vintages[vintages["Referencia"] == "var. % i.a."]
+    assert twelve["Date"].isna().all() and twelve["Mediana"].iloc[0] == 22.0
+    assert vintages["Promedio"].isna().sum() == 1  # "-"
+
+
+def test_parse_without_header_fails():
+    wb = openpyxl.Workbook()
+    wb.active.title = mdata.REM_SHEET
+    wb.active.append(["nada", "que", "ver"])
+    buf = BytesIO()
+    wb.save(buf)
+    with pytest.raises(ValueError):
+        mdata._parse_rem_vintages_xlsx(buf.getvalue())
+
+
+def test_rem_ipc_vintage_last_and_given_edition(vintages):
+    last = mdata.rem_ipc_vintage(vintages)
+    assert last["Fecha de pronóstico"].unique().tolist() == [pd.Timestamp("2026-01-08")]
+    assert last["v_m_REM"].tolist() == [2.3, 2.2]
+
+    dec = mdata.rem_ipc_vintage(vintages, fecha="2025-12-05", n=1)
+    assert dec["Date"].tolist() == [pd.Timestamp("2025-12-31")] and dec["v_m_REM"].tolist() == [2.1]
+    assert mdata.rem_ipc_vintage(vintages.iloc[0:0]).empty
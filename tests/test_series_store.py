@@ -0,0 +1,53 @@
+import pandas as pd
+
+from services import series_store
+from services.series_store import last_date, load_series, merge_series, save_series, series_changed
+
+
+def _frame(start, values):
+    return pd.DataFrame({"Date": pd.date_range(start, periods=len(values), freq="D"), "value": values})
+
+
+def test_save_load_roundtrip(store_dir):
+    df = _frame("2024-01-01", [1.0, 2.0, 3.0])
+    assert save_series("ns", "a/b:c", df)
+    out = load_series("ns", "a/b:c")
+    pd.testing.assert_frame_equal(out, df, check_dtype=False)
+    assert last_date(out) == pd.Timestamp("2024-01-03")
+    assert not list(store_dir.rglob("*.tmp"))
+
+
+def test_missing_or_broken_file_is_none(store_dir):
+    assert load_series("ns", "nada") is None
+    path = series_store._store_path("ns", "roto")
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"\x00no es una serie")
+    assert load_series("ns", "roto") is None
+
+
+def test_save_error_returns_false_and_cleans_tmp(store_dir, monkeypatch):
+    def boom(*args, **kwargs):
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(series_store.os, "replace", boom)
+    assert save_series("ns", "a", _frame("2024-01-01", [1.0])) is False
+    assert load_series("ns", "a") is None
+    assert not list(store_dir.rglob("*.tmp"))
+
+
+def test_merge_series_new_wins_on_overlap():
+    old = _frame("2024-01-01", [1.0, 2.0, 3.0])
+    new = _frame("2024-01-03", [30.0, 4.0])
+    out = merge_series(old, new)
+    assert out["value"].tolist() == [1.0, 2.0, 30.0, 4.0]
+    assert merge_series(None, new).equals(new.reset_index(drop=True))
+    assert merge_series(old, new.iloc[0:0])["value"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_series_changed():
+    old = _frame("2024-01-01", [1.0, 2.0])
+    assert not series_changed(old, old.assign(Date=old["Date"].astype("datetime64[us]")))
+    assert series_changed(old, old.assign(value=[1.0, 2.5]))
+    assert series_changed(old, _frame("2024-01-01", [1.0, 2.0, 3.0]))
+    assert series_changed(None, old)
+    assert not series_changed(None, old.iloc[0:0])
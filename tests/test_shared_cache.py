@@ -0,0 +1,117 @@
+import requests
+import pytest
+
+from services import http_cache, shared_cache
+from services import macro_data as mdata
+
+
+# ------------------------------------------------------------
+# get_or_compute / shared_cached
+# ------------------------------------------------------------
+def test_disabled_is_passthrough(monkeypatch):
+    monkeypatch.setattr(shared_cache, "SHARED_CACHE_PATH", None)
+    calls = []
+
+    @shared_cache.shared_cached("t", ttl=60)
+    def f(x):
+        calls.append(x)
+        return x * 2
+
+    assert f(2) == 4 and f(2) == 4
+    assert calls == [2, 2]
+
+
+def test_computes_once_per_key(shared_db):
+    calls = []
+
+    @shared_db.shared_cached("t", ttl=60)
+    def f(x, y=0):
+        calls.append((x, y))
+        return {"x": x, "y": y}
+
+    assert f(1) == {"x": 1, "y": 0}
+    assert f(1) == {"x": 1, "y": 0}
+    assert f(1, y=2) == {"x": 1, "y": 2}
+    assert calls == [(1, 0), (1, 2)]
+
+
+def test_expired_and_exceptions_are_not_served(shared_db):
+    shared_db.put("k", "viejo", ttl=-1)
+    assert shared_db.get("k") is None
+
+    def boom():
+        raise RuntimeError("sin red")
+
+    with pytest.raises(RuntimeError):
+        shared_db.get_or_compute("k", 60, boom)
+    assert shared_db.get("k") is None
+    assert shared_db.get_or_compute("k", 60, lambda: "nuevo") == "nuevo"
+    assert shared_db.get("k") == "nuevo"
+
+
+# ------------------------------------------------------------
+# fetch_static: la copia stale no se comparte
+# ------------------------------------------------------------
+URL = "https://example.org/ipc.csv"
+
+
+@pytest.fixture
+def static(tmp_path, monkeypatch, shared_db, fake_response):
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_DIR", tmp_path / "http")
+    monkeypatch.setattr(http_cache, "_STALE", {})
+    state = {"fail": False, "calls": 0}
+
+    def fake_get(url, profile="default", headers=None, **kwargs):
+        state["calls"] += 1
+        if state["fail"]:
+            raise requests.exceptions.ConnectionError("sin red")
+        return fake_response(200, b"a;b\n1;2\n", {"ETag": '"v1"'})
+
+    monkeypatch.setattr(http_cache.http_client, "get", fake_get)
+    return state
+
+
+def test_stale_copy_is_not_stored_in_shared_cache(static, shared_db):
+    # primera réplica: baja y deja la copia en disco
+    assert http_cache._fetch_static_http(URL) == (b"a;b\n1;2\n", '"v1"')
+
+    static["fail"] = True
+    assert http_cache.fetch_static(URL) == (b"a;b\n1;2\n", '"v1"')
+    assert http_cache.stale_error(URL).startswith("ConnectionError")
+    assert shared_db.get(f"static:{URL}") is None
+
+    # vuelve la red: se revalida (no queda pegada la copia stale) y se limpia la nota
+    static["fail"] = False
+    calls = static["calls"]
+    http_cache.fetch_static(URL)
+    assert static["calls"] == calls + 1
+    assert http_cache.stale_error(URL) is None
+    assert shared_db.get(f"static:{URL}") == (b"a;b\n1;2\n", '"v1"')
+
+
+def test_shared_hit_clears_local_stale_note(static, shared_db):
+    http_cache._STALE[URL] = "ConnectionError: de antes"
+    shared_db.put(f"static:{URL}", (b"x", "v2"), ttl=60)  # otra réplica ya lo bajó
+    assert http_cache.fetch_static(URL) == (b"x", "v2")
+    assert static["calls"] == 0
+    assert http_cache.stale_error(URL) is None
+
+
+# ------------------------------------------------------------
+# BCRA: se comparte la serie armada, nunca una descarga incompleta
+# ------------------------------------------------------------
+def test_bcra_shares_only_complete_series(shared_db, monkeypatch):
+    results = [([{"fecha": "2024-01-01", "valor": 1}], [1000], "timeout"), ([{"fecha": "2024-01-01", "valor": 1}], [], None)]
+    calls = []
+
+    def fake_detalle(url, parallel, desde=None):
+        calls.append(desde)
+        return results[min(len(calls) - 1, len(results) - 1)]
+
+    monkeypatch.setattr(mdata, "_get_monetaria_detalle", fake_detalle)
+    url = mdata.BCRA_MONETARIAS_URL.format(id_variable=1)
+
+    assert mdata._monetaria_detalle(url, True)[1] == [1000]  # parcial: se devuelve, no se guarda
+    assert mdata._monetaria_detalle(url, True)[1] == []
+    assert mdata._monetaria_detalle(url, True)[1] == []  # completa: desde el cache compartido
+    assert len(calls) == 2
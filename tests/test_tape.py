@@ -0,0 +1,83 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import market_data as md
+
+TICKERS = ("AAA", "BBB")
+
+
+@pytest.fixture
+def tape(monkeypatch):
+    state = {"calls": [], "last": 10.0, "fail": False}
+
+    def fake_download(tickers, **kwargs):
+        state["calls"].append((tickers, kwargs))
+        if state["fail"]:
+            raise RuntimeError("sin red")
+        idx = pd.date_range("2024-01-01", periods=3, name="Date")
+        close = pd.DataFrame({"AAA": [8.0, 9.0, state["last"]], "BBB": [1.0, np.nan, 2.0]}, index=idx)
+        adj = close.assign(AAA=np.nan)
+        return {"Close": md._as_block(close, tickers), "Adj Close": md._as_block(adj, tickers)}
+
+    def no_hub():
+        raise AssertionError("el tape no debe esperar al hub")
+
+    monkeypatch.setattr(md, "_download_panel", fake_download)
+    monkeypatch.setattr(md, "hub_panel", no_hub)
+    monkeypatch.setattr(md, "TAPE_REFRESH", 0.05)
+    monkeypatch.setattr(md, "TAPE_IDLE", 0.3)
+    monkeypatch.setattr(md, "_tape", {})
+    monkeypatch.setattr(md, "_tape_thread", None)
+    yield state
+    monkeypatch.setattr(md, "TAPE_IDLE", 0)
+    time.sleep(0.1)
+
+
+def _wait(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_first_read_uses_small_download(tape):
+    snap = md.get_tape_snapshot(TICKERS)
+    assert snap == {"AAA": (10.0, 9.0), "BBB": (2.0, 1.0)}  # sin Adj Close => Close
+    assert tape["calls"][0] == (TICKERS, {"period": md.TAPE_PERIOD})
+
+
+def test_background_refresh_without_reads_triggering_it(tape):
+    md.get_tape_snapshot(TICKERS)
+    tape["last"] = 11.0
+    assert _wait(lambda: md.get_tape_snapshot(TICKERS)["AAA"] == (11.0, 9.0))
+
+
+def test_failed_refresh_keeps_last_good(tape):
+    md.get_tape_snapshot(TICKERS)
+    tape["fail"] = True
+    n = len(tape["calls"])
+    assert _wait(lambda: len(tape["calls"]) > n + 1)
+    assert md.get_tape_snapshot(TICKERS)["AAA"] == (10.0, 9.0)
+
+
+def test_thread_stops_when_idle_and_restarts_on_read(tape):
+    md.get_tape_snapshot(TICKERS)
+    assert md._tape_thread is not None
+    assert _wait(lambda: md._tape_thread is None)
+
+    n = len(tape["calls"])
+    time.sleep(0.15)
+    assert len(tape["calls"]) == n  # sin lectores no se consulta Yahoo
+
+    md.get_tape_snapshot(TICKERS)
+    assert md._tape_thread is not None
+
+
+def test_cold_failure_returns_empty_snapshot(tape):
+    tape["fail"] = True
+    assert md.get_tape_snapshot(TICKERS) == {"AAA": (None, None), "BBB": (None, None)}
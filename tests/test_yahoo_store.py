@@ -0,0 +1,191 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services import market_data as md
+from services import series_store
+from services.series_store import load_series
+
+
+def _ohlc(dates, close, adj=None):
+    close = np.asarray(close, dtype="float64")
+    adj = close if adj is None else np.asarray(adj, dtype="float64")
+    return pd.DataFrame(
+        {
+            "Date": pd.to_datetime(dates),
+            "Open": close,
+            "High": close,
+            "Low": close,
+            "Close": close,
+            "Adj Close": adj,
+            "Volume": np.ones(len(close)),
+        }
+    )
+
+
+def _days(start, n):
+    return _ohlc(pd.date_range(start, periods=n), np.arange(1, n + 1))
+
+
+# ------------------------------------------------------------
+# _yahoo_is_revised
+# ------------------------------------------------------------
+def test_is_revised_false_when_overlap_matches():
+    old = _ohlc(pd.date_range("2024-01-01", periods=5), [1, 2, 3, 4, 5])
+    new = _ohlc(pd.date_range("2024-01-03", periods=5), [3, 4, 5, 6, 7])
+    assert not md._yahoo_is_revised(old, new)
+
+
+def test_is_revised_ignores_last_stored_bar():
+    # la última barra guardada pudo ser intradiaria
+    old = _ohlc(pd.date_range("2024-01-01", periods=5), [1, 2, 3, 4, 5])
+    new = _ohlc(pd.date_range("2024-01-03", periods=4), [3, 4, 5.5, 6])
+    assert not md._yahoo_is_revised(old, new)
+
+
+def test_is_revised_detects_split_in_close():
+    old = _ohlc(pd.date_range("2024-01-01", periods=5), [10, 20, 30, 40, 50])
+    new = _ohlc(pd.date_range("2024-01-03", periods=4), [3, 4, 5, 6])
+    assert md._yahoo_is_revised(old, new)
+
+
+def test_is_revised_detects_dividend_in_adj_close():
+    dates = pd.date_range("2024-01-01", periods=5)
+    old = _ohlc(dates, [1, 2, 3, 4, 5])
+    new = _ohlc(dates[2:], [3, 4, 5], adj=[2.9, 3.9, 4.9])
+    assert md._yahoo_is_revised(old, new)
+
+
+def test_is_revised_empty_download():
+    old = _ohlc(pd.date_range("2024-01-01", periods=3), [1, 2, 3])
+    assert not md._yahoo_is_revised(old, old.iloc[0:0])
+
+
+# ------------------------------------------------------------
+# sync_yahoo_history (FakeSource como yf.download)
+# ------------------------------------------------------------
+@pytest.fixture
+def yahoo(source, monkeypatch):
+    def fake_download(tickers, **kwargs):
+        got = source.window(tickers, kwargs.get("start"))
+        if not any(len(df) for df in got.values()):
+            raise md._YahooEmpty("vacío")
+        idx = {t: df.set_index("Date") for t, df in got.items()}
+        return {
+            f: md._as_block(pd.concat({t: d[f] for t, d in idx.items()}, axis=1, sort=True), tickers)
+            for f in md.YAHOO_OHLC
+        }
+
+    saves = []
+    real_save = md.save_series
+
+    def spy_save(ns, key, df):
+        saves.append(key)
+        return real_save(ns, key, df)
+
+    monkeypatch.setattr(md, "_download_panel", fake_download)
+    monkeypatch.setattr(md, "save_series", spy_save)
+    monkeypatch.setattr(md, "_yahoo_mem", {})
+    monkeypatch.setattr(md, "_yahoo_stale", {})
+    source.saves = saves
+    return source
+
+
+def test_batches_by_last_date_isolates_laggards():
+    last = {
+        "A": pd.Timestamp("2024-03-29"),
+        "B": pd.Timestamp("2024-03-28"),  # feriado distinto: mismo lote
+        "OLD": pd.Timestamp("2023-06-30"),
+    }
+    out = series_store.batches_by_last_date(last, pd.Timedelta(days=7))
+    assert out == [(pd.Timestamp("2024-03-28"), ["A", "B"]), (pd.Timestamp("2023-06-30"), ["OLD"])]
+
+
+def test_full_then_incremental_in_one_batch(yahoo):
+    yahoo.history.update(AAA=_days("2024-01-01", 30), BBB=_days("2024-01-01", 29))
+    md.sync_yahoo_history(("AAA", "BBB"))
+    assert yahoo.calls == [(["AAA", "BBB"], None)]
+    assert len(load_series(md.YAHOO_STORE_NS, "AAA")) == 30
+
+    yahoo.history.update(AAA=_days("2024-01-01", 31), BBB=_days("2024-01-01", 31))
+    frames = md.sync_yahoo_history(("AAA", "BBB"))
+    keys, since = yahoo.calls[-1]
+    assert keys == ["AAA", "BBB"] and len(yahoo.calls) == 2
+    assert pd.Timestamp(since) == pd.Timestamp("2024-01-29") - md.YAHOO_SYNC_OVERLAP
+    assert len(frames["AAA"]) == len(frames["BBB"]) == 31
+
+
+def test_laggard_ticker_does_not_widen_the_window(yahoo):
+    # LAG operó por última vez 10 días antes: otro batch, pero no discontinuado
+    yahoo.history.update(AAA=_days("2024-01-01", 60), LAG=_days("2024-01-01", 50))
+    md.sync_yahoo_history(("AAA", "LAG"))
+
+    md.sync_yahoo_history(("AAA", "LAG"))
+    windows = {tuple(k): pd.Timestamp(s) for k, s in yahoo.calls[1:]}
+    assert windows == {
+        ("AAA",): pd.Timestamp("2024-02-29") - md.YAHOO_SYNC_OVERLAP,
+        ("LAG",): pd.Timestamp("2024-02-19") - md.YAHOO_SYNC_OVERLAP,
+    }
+    assert md._yahoo_stale == {}
+
+
+def test_dead_and_unknown_tickers_are_not_requested_again(yahoo):
+    yahoo.history.update(AAA=_days("2024-01-01", 30), DEAD=_days("2023-01-01", 30))
+    frames = md.sync_yahoo_history(("AAA", "DEAD", "NOPE"))
+    # NOPE: sin barras; DEAD: última barra un año atrás del resto
+    assert set(md._yahoo_stale) == {"DEAD", "NOPE"}
+    assert len(frames["DEAD"]) == 30  # se sigue sirviendo lo que hay
+
+    n = len(yahoo.calls)
+    frames = md.sync_yahoo_history(("AAA", "DEAD", "NOPE"))
+    assert [k for k, _ in yahoo.calls[n:]] == [["AAA"]]
+    assert len(frames["DEAD"]) == 30
+
+
+def test_general_empty_response_does_not_give_up(yahoo):
+    yahoo.history.update(AAA=_days("2024-01-01", 30))
+    md.sync_yahoo_history(("AAA",))
+    yahoo.history.clear()  # Yahoo sin datos para nadie (rate limit)
+    md.sync_yahoo_history(("AAA",))
+    assert md._yahoo_stale == {}
+
+
+def test_gives_up_only_for_yahoo_stale_retry(yahoo):
+    md._yahoo_stale["NOPE"] = time.monotonic() - md.YAHOO_STALE_RETRY - 1
+    yahoo.history.update(AAA=_days("2024-01-01", 30))
+    md.sync_yahoo_history(("AAA", "NOPE"))
+    assert yahoo.calls[0] == (["AAA", "NOPE"], None)
+
+
+def test_unchanged_overlap_does_not_rewrite_files(yahoo):
+    yahoo.history.update(AAA=_days("2024-01-01", 30))
+    md.sync_yahoo_history(("AAA",))
+    md.sync_yahoo_history(("AAA",))
+    assert yahoo.saves == ["AAA"]
+
+    yahoo.history["AAA"] = _days("2024-01-01", 31)
+    md.sync_yahoo_history(("AAA",))
+    assert yahoo.saves == ["AAA", "AAA"]
+
+
+def test_split_refetches_full_history(yahoo):
+    yahoo.history.update(AAA=_days("2024-01-01", 30))
+    md.sync_yahoo_history(("AAA",))
+
+    h = yahoo.history["AAA"]
+    yahoo.history["AAA"] = h.assign(Close=h["Close"] / 2, **{"Adj Close": h["Close"] / 2})
+    frames = md.sync_yahoo_history(("AAA",))
+    assert yahoo.calls[-1] == (["AAA"], None)
+    assert frames["AAA"]["Close"].iloc[0] == 0.5
+
+
+def test_serves_store_when_yahoo_fails(yahoo):
+    yahoo.history.update(AAA=_days("2024-01-01", 30))
+    md.sync_yahoo_history(("AAA",))
+
+    yahoo.fail = True
+    assert len(md.sync_yahoo_history(("AAA",))["AAA"]) == 30
+    with pytest.raises(Exception):
+        md.sync_yahoo_history(("ZZZ",))